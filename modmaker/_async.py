@@ -0,0 +1,115 @@
+"""
+Event loop management for async commands
+
+Commands written as coroutine functions (or classes with an async
+``__call__``) are run by CliCore under a single event loop managed here.
+SIGINT cancels the running command instead of killing the interpreter, and
+a semaphore sized by the global ``--concurrency`` option is exposed so
+commands can bound their concurrent I/O::
+
+    from modmaker._async import get_semaphore
+
+    async def check(self, repo):
+        async with get_semaphore():
+            ...
+
+asyncio itself is only imported once an async command runs, so it stays off
+the startup path of ``modmaker --version`` and ``modmaker -h``.
+"""
+
+import contextvars
+import logging
+import signal
+import threading
+
+from modmaker._exceptions import UsageError
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 10
+
+_SEMAPHORE = contextvars.ContextVar("modmaker_semaphore", default=None)
+
+
+def get_semaphore():
+    """Return the semaphore limiting concurrency of the running async command.
+
+    Returns:
+        asyncio.Semaphore: Semaphore sized by ``--concurrency``
+
+    Raises:
+        RuntimeError: If no async command is running
+    """
+    semaphore = _SEMAPHORE.get()
+    if semaphore is None:
+        raise RuntimeError("No modmaker async command is running")
+    return semaphore
+
+
+async def _with_semaphore(coro, concurrency):
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    _SEMAPHORE.set(asyncio.Semaphore(concurrency))
+    return await coro
+
+
+def _cancel_pending(loop):
+    """Cancel and await every task still pending on the loop"""
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+def run_coroutine(coro, concurrency=None):
+    """Run a command coroutine to completion on a managed event loop.
+
+    Args:
+        coro (coroutine): Coroutine returned by the command
+        concurrency (int, optional): Size of the exposed semaphore. Defaults to DEFAULT_CONCURRENCY.
+
+    Returns:
+        Any: Result of the coroutine
+
+    Raises:
+        KeyboardInterrupt: If the command was cancelled by SIGINT
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    if concurrency is None:
+        concurrency = DEFAULT_CONCURRENCY
+    if concurrency < 1:
+        raise UsageError("--concurrency must be at least 1")
+    loop = asyncio.new_event_loop()
+    handle_sigint = threading.current_thread() is threading.main_thread()
+    previous_handler = signal.getsignal(signal.SIGINT) if handle_sigint else None
+    try:
+        asyncio.set_event_loop(loop)
+        task = loop.create_task(_with_semaphore(coro, concurrency))
+        if handle_sigint:
+            try:
+                loop.add_signal_handler(signal.SIGINT, task.cancel)
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops do not support signal handlers
+                handle_sigint = False
+        try:
+            return loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            LOG.debug("Async command cancelled")
+            raise KeyboardInterrupt from None
+    finally:
+        try:
+            _cancel_pending(loop)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            if hasattr(loop, "shutdown_default_executor"):
+                loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            if handle_sigint:
+                loop.remove_signal_handler(signal.SIGINT)
+                if previous_handler is not None:
+                    signal.signal(signal.SIGINT, previous_handler)
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,167 @@
+"""
+On-disk cache helpers for modmaker
+
+Generated artifacts (completion scripts, rendered help, plugin indexes) are
+stored under a per-user cache directory and keyed so they can be regenerated
+when the command line they describe changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+LOG = logging.getLogger(__name__)
+
+CACHE_ENV_VAR = "MODMAKER_CACHE_DIR"
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules that add arguments to every command line (fan-out options, for
+# example), so spec keys change with them as well as with the commands
+SPEC_SOURCES = tuple(os.path.join(_PACKAGE_DIR, name) for name in ("_cli_core.py", "_fanout.py"))
+
+
+def cache_dir():
+    """Return the modmaker cache directory.
+
+    ``MODMAKER_CACHE_DIR`` takes precedence, then ``$XDG_CACHE_HOME/modmaker``
+    and finally ``~/.cache/modmaker``. The directory is not created.
+
+    Returns:
+        str: Path of the cache directory
+    """
+    path = os.environ.get(CACHE_ENV_VAR)
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "modmaker")
+
+
+def cache_path(*parts):
+    """Return a path inside the cache directory.
+
+    Args:
+        *parts (str): Path components relative to the cache directory
+
+    Returns:
+        str: Joined path
+    """
+    return os.path.join(cache_dir(), *parts)
+
+
+def write_text_atomic(path, text):
+    """Write a text file so readers never see a partially written file.
+
+    Args:
+        path (str): Destination path, parent directories are created
+        text (str): File content
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path, default=None):
+    """Read a JSON cache file.
+
+    Args:
+        path (str): File path
+        default (Any, optional): Value returned if the file is missing or invalid. Defaults to None.
+
+    Returns:
+        Any: Decoded content or ``default``
+    """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    """Write a JSON cache file atomically.
+
+    Args:
+        path (str): File path
+        data (Any): JSON serializable content
+    """
+    write_text_atomic(path, json.dumps(data, sort_keys=True))
+
+
+def module_package_paths(module_package):
+    """Return the source directories or files of a command package.
+
+    Args:
+        module_package: Package (or module) holding the command classes
+
+    Returns:
+        list: Paths whose content defines the package's commands
+    """
+    paths = list(getattr(module_package, "__path__", []) or [])
+    if not paths and getattr(module_package, "__file__", None):
+        paths = [module_package.__file__]
+    return paths
+
+
+def _enclosing_file(path):
+    """Return the archive file a path inside a zip archive belongs to.
+
+    Args:
+        path (str): Path that does not exist on disk
+
+    Returns:
+        str: Closest existing parent that is a file, or a path that does not exist
+    """
+    parent = os.path.dirname(path)
+    while parent and parent != path:
+        if os.path.isfile(parent):
+            return parent
+        if os.path.isdir(parent):
+            break
+        path, parent = parent, os.path.dirname(parent)
+    return path
+
+
+def spec_cache_key(paths, *parts):
+    """Compute a cheap cache key for an argument spec.
+
+    The key changes whenever a Python source file under ``paths`` is added,
+    removed or modified, or when any of ``parts`` (program name, version...)
+    changes. Only stat data is used, so no command module has to be imported.
+    Paths inside a zip archive (a zipapp) are keyed by the archive itself.
+
+    Args:
+        paths (list): Directories or files defining the commands
+        *parts (str): Extra values that influence the spec
+
+    Returns:
+        str: Hex digest identifying the spec
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(f"{part}\0".encode())
+    for path in sorted(paths):
+        if os.path.isdir(path):
+            names = sorted(n for n in os.listdir(path) if n.endswith(".py"))
+            files = [os.path.join(path, n) for n in names]
+        elif os.path.exists(path):
+            files = [path]
+        else:
+            files = [_enclosing_file(path)]
+        for file_path in files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            digest.update(f"{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+    return digest.hexdigest()
@@ -3,24 +3,52 @@ Modmake CLI module
 """
 
 import argparse
+import shutil
 import signal
 import sys
 import os
 
-import requests
-from importlib.metadata import version as get_distribution_version
-
 # Try package imports
 try:
+    from modmaker._async import DEFAULT_CONCURRENCY
     from modmaker._cli_core import CliCore
+    from modmaker._completion import refresh_completions
+    from modmaker._fanout import POOLS, FanOutResults
+    from modmaker._help import HELP_FLAGS, VERSION_FLAGS, cached_help, help_key
     from modmaker._common_utils import exit_with_code
-    from modmaker._logger import init_modmaker_cli_logger
+    from modmaker._exceptions import ModmakerError
+    from modmaker._logger import (
+        LOG_FORMATS,
+        init_modmaker_cli_logger,
+        set_log_format,
+        start_log_buffer,
+        start_queued_logging,
+        stop_log_buffer,
+        stop_queued_logging,
+    )
+    from modmaker._update import check_for_update, update_check_enabled
+    from modmaker._version import __version__
     import modmaker._cli_modules as _cli_modules
 except ImportError:
     # Try relative imports for direct use
+    from ._async import DEFAULT_CONCURRENCY
     from ._cli_core import CliCore
+    from ._completion import refresh_completions
+    from ._fanout import POOLS, FanOutResults
+    from ._help import HELP_FLAGS, VERSION_FLAGS, cached_help, help_key
     from ._common_utils import exit_with_code
-    from ._logger import init_modmaker_cli_logger
+    from ._exceptions import ModmakerError
+    from ._logger import (
+        LOG_FORMATS,
+        init_modmaker_cli_logger,
+        set_log_format,
+        start_log_buffer,
+        start_queued_logging,
+        stop_log_buffer,
+        stop_queued_logging,
+    )
+    from ._update import check_for_update, update_check_enabled
+    from ._version import __version__
     from . import _cli_modules
 
 LOG = init_modmaker_cli_logger(loglevel="ERROR")
@@ -38,6 +66,7 @@ class SetVerbosity(argparse.Action):
 
 NAME = "modmaker"
 DESCRIPTION = "Python project skeleton generator"
+PLUGIN_GROUP = "modmaker.commands"
 GLOBAL_ARGS = [
     [
         ["-q", "--quiet"],
@@ -57,15 +86,123 @@ GLOBAL_ARGS = [
             "dest": "_debug",
         },
     ],
+    [
+        ["--concurrency"],
+        {
+            "type": int,
+            "metavar": "N",
+            "help": "maximum concurrent operations of async commands (default: {})".format(
+                DEFAULT_CONCURRENCY
+            ),
+            "dest": "_concurrency",
+        },
+    ],
+    [
+        ["-j", "--jobs"],
+        {
+            "type": int,
+            "default": 1,
+            "metavar": "N",
+            "help": "number of parallel workers for commands run on many targets",
+            "dest": "_jobs",
+        },
+    ],
+    [
+        ["--log-buffer"],
+        {
+            "type": int,
+            "metavar": "N",
+            "help": "keep the last N log records of each project in memory and write "
+            "them only if that project fails",
+            "dest": "_log_buffer",
+        },
+    ],
+    [
+        ["--log-format"],
+        {
+            "choices": LOG_FORMATS,
+            "default": "text",
+            "help": "text for people, json for one event object per line (default: text)",
+            "dest": "_log_format",
+        },
+    ],
+    [
+        ["--profile"],
+        {
+            "metavar": "FILE",
+            "help": "write wall and CPU time of each phase and file as JSON to FILE (- for stdout)",
+            "dest": "_profile",
+        },
+    ],
+    [
+        ["--profile-top"],
+        {
+            "type": int,
+            "metavar": "N",
+            "help": "with --profile, also print the N slowest files",
+            "dest": "_profile_top",
+        },
+    ],
+    [
+        ["--memory-report"],
+        {
+            "metavar": "FILE",
+            "help": "trace allocations and write peak memory per project and the top "
+            "allocation sites as JSON to FILE (- for stdout)",
+            "dest": "_memory_report",
+        },
+    ],
+    [
+        ["--trace"],
+        {
+            "metavar": "FILE",
+            "help": "write a timeline of phases and files per worker as Chrome trace-event "
+            "JSON to FILE, for Perfetto or chrome://tracing (- for stdout)",
+            "dest": "_trace",
+        },
+    ],
+    [
+        ["--metrics-file"],
+        {
+            "metavar": "FILE",
+            "help": "write Prometheus metrics of the run to FILE when it ends",
+            "dest": "_metrics_file",
+        },
+    ],
+    [
+        ["--metrics-port"],
+        {
+            "type": int,
+            "metavar": "PORT",
+            "help": "serve Prometheus metrics on http://127.0.0.1:PORT/metrics while "
+            "modmaker runs, for example in the shell",
+            "dest": "_metrics_port",
+        },
+    ],
+    [
+        ["--pool"],
+        {
+            "choices": POOLS,
+            "default": "thread",
+            "help": "worker pool used with --jobs (default: thread)",
+            "dest": "_pool",
+        },
+    ],
 ]
 
 
-def _welcome():
-    """Display welcome banner"""
-    LOG.info("{}\n".format(BANNER))
+def _welcome(quiet=False, banner=True):
+    """Display welcome banner and start the background update check
+    
+    Args:
+        quiet (bool): Whether --quiet was given; skips the update check
+        banner (bool): Whether to log the banner, off for JSON output
+    """
+    if banner:
+        LOG.info("{}\n".format(BANNER))
     try:
-        # check_for_update()
-        pass
+        if update_check_enabled(quiet):
+            check_for_update(NAME, get_installed_version(), get_pip_version)
     except Exception:  # pylint: disable=broad-except
         LOG.debug("Unexpected error", exc_info=True)
 
@@ -85,6 +222,26 @@ def _setup_logging(args, exit_func=exit_with_code):
     return log_level
 
 
+def _get_log_format(args):
+    """Determine the log format from command line arguments
+    
+    Read before parsing, so records logged during start-up are formatted too.
+    
+    Args:
+        args (list): Command line arguments
+        
+    Returns:
+        str: Log format, ``text`` or ``json``
+    """
+    log_format = "text"
+    for index, arg in enumerate(args):
+        if arg == "--log-format" and index + 1 < len(args):
+            log_format = args[index + 1]
+        elif arg.startswith("--log-format="):
+            log_format = arg.partition("=")[2]
+    return log_format
+
+
 def _print_tracebacks(log_level):
     """Determine if tracebacks should be printed based on log level
     
@@ -138,20 +295,198 @@ def get_pip_version(url):
     Returns:
         str: Current version on PyPI
     """
+    # requests is slow to import and only needed for the update check
+    import requests  # pylint: disable=import-outside-toplevel
+
     return requests.get(url, timeout=5.0).json()["info"]["version"]
 
 
 def get_installed_version():
     """
     Returns the installed version of the package
-    
+
+    The version is baked into ``_version.py`` when the package is built, so
+    no installed distribution metadata has to be scanned at startup.
+
     Returns:
-        str: Installed version or message if not installed via pip
+        str: Installed version
+    """
+    return __version__
+
+
+def _refresh_completions(cli):
+    """Regenerate installed completion scripts if the argument spec changed
+    
+    Args:
+        cli (CliCore): CLI instance
     """
     try:
-        return get_distribution_version(NAME)
+        refresh_completions(cli)
     except Exception:  # pylint: disable=broad-except
-        return "[local source] no pip module installed"
+        LOG.debug("Unable to refresh completion scripts", exc_info=True)
+
+
+def _build_cli(cli_core_class, version):
+    """Build the CLI with all commands
+    
+    Args:
+        cli_core_class: CLI core class to use
+        version (str): Installed version
+        
+    Returns:
+        CliCore: CLI instance
+    """
+    return cli_core_class(
+        NAME,
+        _cli_modules,
+        DESCRIPTION,
+        version,
+        GLOBAL_ARGS,
+        plugin_group=PLUGIN_GROUP,
+        spec_paths=[os.path.abspath(__file__)],
+    )
+
+
+def _top_level_help(cli_core_class, version):
+    """Return the top-level help, served from the cache while the spec is unchanged
+    
+    Args:
+        cli_core_class: CLI core class used when the help has to be rendered
+        version (str): Installed version
+        
+    Returns:
+        str: Help text
+    """
+    # argparse wraps help to the terminal width, so the width is part of the
+    # key. Help texts also come from the command docstrings, so their parser
+    # is part of it along with the global args defined here
+    here = os.path.abspath(__file__)
+    key = help_key(
+        NAME,
+        _cli_modules,
+        version,
+        PLUGIN_GROUP,
+        paths=[here, os.path.join(os.path.dirname(here), "_docstrings.py")],
+        parts=[DESCRIPTION, shutil.get_terminal_size().columns],
+    )
+    return cached_help(NAME, key, lambda: _build_cli(cli_core_class, version).parser.format_help())
+
+
+def _start_profile(parsed_args):
+    """Start collecting the --profile report if it was requested
+    
+    Args:
+        parsed_args (argparse.Namespace): Parsed arguments
+        
+    Returns:
+        callable: Writes the report when the run ends, or None
+    """
+    path = getattr(parsed_args, "_profile", None)
+    if not isinstance(path, str):
+        return None
+    # Only loaded when profiling
+    from modmaker._instrument import add_observer, remove_observer  # pylint: disable=import-outside-toplevel
+    from modmaker._profile import Profiler, write_report  # pylint: disable=import-outside-toplevel
+
+    profiler = Profiler()
+    add_observer(profiler)
+    top = getattr(parsed_args, "_profile_top", None)
+
+    def finish():
+        remove_observer(profiler)
+        write_report(profiler.report(), path, top if isinstance(top, int) else None)
+
+    return finish
+
+
+def _start_memory_report(parsed_args):
+    """Start tracing allocations for the --memory-report report if it was requested
+    
+    Args:
+        parsed_args (argparse.Namespace): Parsed arguments
+        
+    Returns:
+        callable: Writes the report when the run ends, or None
+    """
+    path = getattr(parsed_args, "_memory_report", None)
+    if not isinstance(path, str):
+        return None
+    # tracemalloc is only loaded, and tracing only started, when requested
+    from modmaker._instrument import add_observer, remove_observer  # pylint: disable=import-outside-toplevel
+    from modmaker._memory import MemoryProfiler, write_report  # pylint: disable=import-outside-toplevel
+
+    profiler = MemoryProfiler()
+    add_observer(profiler)
+
+    def finish():
+        remove_observer(profiler)
+        try:
+            write_report(profiler.report(), path)
+        finally:
+            profiler.stop()
+
+    return finish
+
+
+def _start_trace(parsed_args):
+    """Start recording the --trace timeline if it was requested
+    
+    Args:
+        parsed_args (argparse.Namespace): Parsed arguments
+        
+    Returns:
+        callable: Writes the trace when the run ends, or None
+    """
+    path = getattr(parsed_args, "_trace", None)
+    if not isinstance(path, str):
+        return None
+    from modmaker._instrument import add_observer, remove_observer  # pylint: disable=import-outside-toplevel
+    from modmaker._trace import TraceRecorder, write_trace  # pylint: disable=import-outside-toplevel
+
+    recorder = TraceRecorder()
+    add_observer(recorder)
+
+    def finish():
+        remove_observer(recorder)
+        write_trace(recorder.trace(), path)
+
+    return finish
+
+
+def _start_metrics(parsed_args):
+    """Start collecting Prometheus metrics if a metrics file or port was given
+    
+    Args:
+        parsed_args (argparse.Namespace): Parsed arguments
+        
+    Returns:
+        callable: Stops serving and writes the metrics file when the run ends, or None
+    """
+    path = getattr(parsed_args, "_metrics_file", None)
+    port = getattr(parsed_args, "_metrics_port", None)
+    path = path if isinstance(path, str) else None
+    port = port if isinstance(port, int) else None
+    if path is None and port is None:
+        return None
+    from modmaker._instrument import add_observer, remove_observer  # pylint: disable=import-outside-toplevel
+    from modmaker._metrics import MetricsCollector, serve, write_textfile  # pylint: disable=import-outside-toplevel
+
+    collector = MetricsCollector()
+    add_observer(collector)
+    server = None
+    if port is not None:
+        server = serve(collector, port)
+        LOG.info("Serving metrics on http://127.0.0.1:%d/metrics", server.server_address[1])
+
+    def finish():
+        remove_observer(collector)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if path is not None:
+            write_textfile(collector, path)
+
+    return finish
 
 
 def main(cli_core_class=CliCore, exit_func=exit_with_code):
@@ -167,13 +502,62 @@ def main(cli_core_class=CliCore, exit_func=exit_with_code):
     args = sys.argv[1:]
     if not args:
         args.append("-h")
+    log_format = _get_log_format(args)
+    json_output = log_format == "json"
+    # Called when the run ends, to write reports of it
+    finishers = []
     try:
-        _welcome()
+        if log_format in LOG_FORMATS:
+            # Unknown formats are reported by the parser
+            set_log_format(LOG, log_format)
         version = get_installed_version()
-        cli = cli_core_class(NAME, _cli_modules, DESCRIPTION, version, GLOBAL_ARGS)
+        # Fast paths: answer --version and top-level -h without building the
+        # CLI or starting the update check
+        if args[0] in VERSION_FLAGS:
+            print(version)
+            return
+        if args[0] in HELP_FLAGS:
+            sys.stdout.write(_top_level_help(cli_core_class, version))
+            return
+        _welcome(quiet=log_level == "ERROR" or json_output, banner=not json_output)
+        cli = _build_cli(cli_core_class, version)
+        _refresh_completions(cli)
         cli.parse(args)
-        cli.run()
+        jobs = getattr(cli.parsed_args, "_jobs", 1)
+        if isinstance(jobs, int) and jobs > 1:
+            # Parallel workers hand records to one writer thread
+            start_queued_logging(LOG)
+        log_buffer = getattr(cli.parsed_args, "_log_buffer", None)
+        if isinstance(log_buffer, int) and log_buffer > 0:
+            start_log_buffer(LOG, log_buffer)
+        finishers = [
+            finish
+            for finish in (
+                _start_profile(cli.parsed_args),
+                _start_memory_report(cli.parsed_args),
+                _start_trace(cli.parsed_args),
+                _start_metrics(cli.parsed_args),
+            )
+            if finish
+        ]
+        result = cli.run()
+        if isinstance(result, FanOutResults) and result.exit_code:
+            exit_func(result.exit_code)
 
+    except KeyboardInterrupt:
+        LOG.error("Interrupted")
+        exit_func(1)
+    except ModmakerError as err:
+        LOG.error(str(err), exc_info=_print_tracebacks(log_level))
+        exit_func(err.exit_code)
     except Exception as err:  # pylint: disable=broad-except
         LOG.error(str(err), exc_info=_print_tracebacks(log_level))
         exit_func(1)
+    finally:
+        for finish in finishers:
+            try:
+                finish()
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.error("Unable to write report: %s", err)
+        stop_log_buffer(LOG)
+        stop_queued_logging(LOG)
@@ -12,15 +12,76 @@ import logging
 import sys
 import types
 
+from modmaker._async import run_coroutine
+from modmaker._cache import SPEC_SOURCES, module_package_paths, spec_cache_key
+from modmaker._docstrings import parse_docstring
+from modmaker._exceptions import UsageError
+from modmaker._fanout import dispatch, dispatch_async, get_fan_out_param, read_targets, report
+from modmaker._instrument import phase
+from modmaker._plugins import load_plugin, load_plugin_index
+
 LOG = logging.getLogger(__name__)
 
 
+def _wants_cli(func):
+    """Check if a command declares the private ``_cli`` parameter"""
+    return "_cli" in inspect.signature(func).parameters
+
+
+def _call_command(func, kwargs, cli):
+    """Call a command, passing the CLI to commands that ask for it.
+
+    Commands that declare a ``_cli`` parameter receive the running
+    ``CliCore``; the parameter is private so it never becomes an argument.
+
+    Args:
+        func: Command class or bound method
+        kwargs (dict): Parsed command arguments
+        cli (CliCore): The running CLI
+
+    Returns:
+        Any: Result of the command
+    """
+    if _wants_cli(func):
+        kwargs = dict(kwargs, _cli=cli)
+    return func(**kwargs)
+
+
+def command_callable(command, subcommand=""):
+    """Return the callable that runs a command.
+
+    Args:
+        command: Command class
+        subcommand (str, optional): Subcommand name. Defaults to "".
+
+    Returns:
+        Callable: Bound subcommand method, command instance or the class itself
+    """
+    if subcommand:
+        return getattr(command(), subcommand)
+    if CliCore._has_call(command):
+        return command()
+    return command
+
+
 class CliCore:
     """Core CLI class that handles command parsing and execution"""
     
     USAGE = "{prog}{global_opts}{command}{command_opts}{subcommand}{subcommand_opts}"
+    PARAM_TYPES = {"str": str, "int": int, "bool": bool}
+    # (command, subcommand) pairs implemented as coroutines, set per instance
+    _async_commands = frozenset()
 
-    def __init__(self, prog_name, module_package, description, version=None, args=None):
+    def __init__(
+        self,
+        prog_name,
+        module_package,
+        description,
+        version=None,
+        args=None,
+        plugin_group=None,
+        spec_paths=None,
+    ):
         """Initialize the CLI core.
         
         Args:
@@ -29,26 +90,131 @@ class CliCore:
             description (str): Program description
             version (str, optional): Version string. Defaults to None.
             args (list, optional): List of global args. Defaults to None.
+            plugin_group (str, optional): Entry-point group of third-party commands. Defaults to None.
+            spec_paths (list, optional): Files defining the global args, part of ``spec_key``. Defaults to None.
         """
         self.name = prog_name
         self.module_package = module_package
-        self._modules = self._get_plugin_modules()
+        self.version = version
+        self.spec_paths = list(spec_paths or [])
+        with phase("plugin_discovery"):
+            self._modules = self._get_plugin_modules()
+            self._plugin_key, self._plugins = self._get_entry_point_plugins(plugin_group)
+        self._async_commands = set()
         self.args = {"global": args if args is not None else [], "commands": {}}
-        self._build_args()
+        with phase("build_args"):
+            self._build_args()
         self.command_parser = None
         self.subcommand_parsers = {}
-        self.parser = self._build_parser(description, version)
+        with phase("build_parser"):
+            self.parser = self._build_parser(description, version)
         self.parsed_args = []
 
+    @property
+    def spec_key(self):
+        """Cache key of the argument spec, computed from stat data only.
+
+        Returns:
+            str: Key that changes when the command modules, the global args,
+                the modules generating arguments or the plugins change
+        """
+        return spec_cache_key(
+            module_package_paths(self.module_package) + list(SPEC_SOURCES) + self.spec_paths,
+            self.name,
+            self.version,
+            self._plugin_key,
+        )
+
     def _build_args(self):
         """Build command and subcommand arguments"""
         for name, module in self._modules.items():
-            params = self._get_params(module)
-            self.args["commands"][name] = {"args": params, "subcommands": {}}
-            for method_name, method_function in self._get_class_methods(module):
-                if not method_name.startswith("_"):
-                    params = self._get_params(method_function)
-                    self.args["commands"][name]["subcommands"][method_name] = params
+            self._build_command_args(name, module)
+
+    def _build_command_args(self, name, module):
+        """Build the arguments of one command and its subcommands.
+        
+        Args:
+            name (str): Command name
+            module: Command class
+        """
+        entry = self._get_command_entry(module)
+        params = self._get_params(entry)
+        self.args["commands"][name] = {"args": params, "subcommands": {}}
+        if inspect.iscoroutinefunction(entry):
+            self._async_commands.add((name, ""))
+        for method_name, method_function in self._get_class_methods(module):
+            if not method_name.startswith("_"):
+                params = self._get_params(method_function)
+                self.args["commands"][name]["subcommands"][method_name] = params
+                if inspect.iscoroutinefunction(method_function):
+                    self._async_commands.add((name, method_name))
+
+    @staticmethod
+    def _has_call(module):
+        """Check if a command class defines ``__call__``.
+        
+        Args:
+            module: Command class
+            
+        Returns:
+            bool: True if the command runs by calling an instance
+        """
+        return isinstance(module, type) and inspect.isfunction(
+            getattr(module, "__call__", None)
+        )
+
+    @staticmethod
+    def _get_command_entry(module):
+        """Return the callable defining the arguments of a command.
+        
+        Classes defining ``__call__`` are instantiated without arguments and
+        then called; other classes take their arguments in ``__init__``.
+        
+        Args:
+            module: Command class
+            
+        Returns:
+            Callable: ``__call__`` function or the class itself
+        """
+        return module.__call__ if CliCore._has_call(module) else module
+
+    def _get_entry_point_plugins(self, plugin_group):
+        """Read the cached index of entry-point plugins without importing them.
+        
+        Built-in commands take precedence over plugins of the same name.
+        
+        Args:
+            plugin_group (str): Entry-point group, or None to disable plugins
+            
+        Returns:
+            tuple: (index key, dict of command name -> PluginEntry)
+        """
+        if not plugin_group:
+            return None, {}
+        key, entries = load_plugin_index(plugin_group)
+        return key, {e.name: e for e in entries if e.name not in self._modules}
+
+    def load_plugin(self, name):
+        """Import an entry-point plugin and register its command.
+        
+        Args:
+            name (str): Command name of the plugin
+            
+        Returns:
+            type: The command class
+        """
+        entry = self._plugins.pop(name)
+        LOG.debug("Loading plugin %s from %s", name, entry.value)
+        module = load_plugin(entry)
+        self._modules[name] = module
+        self._build_command_args(name, module)
+        self._add_command_parser(name)
+        return module
+
+    def load_plugins(self):
+        """Import all entry-point plugins, for consumers that need the full spec"""
+        for name in list(self._plugins):
+            self.load_plugin(name)
 
     @staticmethod
     def _get_class_methods(module):
@@ -67,6 +233,9 @@ class CliCore:
     def _get_params(item):
         """Extract parameters from a function or class.
         
+        The docstring is parsed once per item, so the cost is linear in the
+        number of parameters.
+        
         Args:
             item: Function or class to inspect
             
@@ -74,14 +243,17 @@ class CliCore:
             list: List of parameter definitions
         """
         params = []
+        param_docs = CliCore._get_param_docs(item)
+        fan_out_param = get_fan_out_param(item)
         for param in inspect.signature(item).parameters.values():
             if param.name == "self" or param.name.startswith("_"):
                 continue
+            param_doc = param_docs.get(param.name)
             required = param.default == param.empty
             default = param.default if not required else None
-            val_type = param.annotation if param.annotation in [str, int, bool] else str
+            val_type = CliCore._get_param_type(param, param_doc)
             action = "store_true" if val_type == bool else "store"
-            param_help = CliCore._get_param_help(item, param.name)
+            param_help = param_doc.help if param_doc else ""
             name = param.name.lower()
             kwargs = {"action": action, "help": param_help}
             if not required:
@@ -91,35 +263,73 @@ class CliCore:
                 )
             if action == "store":
                 kwargs.update({"type": val_type})
+            if param.name == fan_out_param:
+                kwargs.update({"nargs": "*"} if required else {"action": "append"})
             params.append(
                 [[name] if required else [f"-{name[0]}", f"--{name}"], kwargs]
             )
+            if param.name == fan_out_param:
+                option = param.name.lower().replace("_", "-")
+                params.append(
+                    [
+                        [f"--{option}-file"],
+                        {
+                            "action": "store",
+                            "help": f"read {option} values from FILE, one per line ('-' for stdin)",
+                            "dest": "_fan_out_file",
+                            "metavar": "FILE",
+                        },
+                    ]
+                )
         return params
 
     @staticmethod
-    def _get_param_help(item, param):
-        """Extract help text for a parameter from docstring.
+    def _get_param_type(param, param_doc):
+        """Determine the argument type from the annotation or the docstring.
+        
+        Args:
+            param (inspect.Parameter): Parameter to inspect
+            param_doc (ParamDoc): Parsed documentation of the parameter
+            
+        Returns:
+            type: One of str, int or bool
+        """
+        if param.annotation in CliCore.PARAM_TYPES.values():
+            return param.annotation
+        if param.annotation == param.empty and param_doc and param_doc.type:
+            return CliCore.PARAM_TYPES.get(param_doc.type, str)
+        return str
+
+    @staticmethod
+    def _get_param_docs(item):
+        """Return the parsed parameter documentation of a function or class.
         
         Args:
             item: Function or class
-            param (str): Parameter name
             
         Returns:
-            str: Help text for the parameter
+            Mapping: Parameter name -> ParamDoc
         """
-        help_str = ""
         docstring = (
             item.__doc__
             if isinstance(item, types.FunctionType)
             else item.__init__.__doc__
         )
-        if docstring is None:
-            return help_str
-        for line in docstring.split("\n"):
-            if line.strip().startswith(f":param {param}:"):
-                help_str = line.strip()[len(f":param {param}:") :].strip()
-                break
-        return help_str
+        return parse_docstring(docstring).params
+
+    @staticmethod
+    def _get_param_help(item, param):
+        """Extract help text for a parameter from docstring.
+        
+        Args:
+            item: Function or class
+            param (str): Parameter name
+            
+        Returns:
+            str: Help text for the parameter
+        """
+        param_doc = CliCore._get_param_docs(item).get(param)
+        return param_doc.help if param_doc else ""
 
     @staticmethod
     def _get_help(item):
@@ -131,13 +341,7 @@ class CliCore:
         Returns:
             str: Help text extracted from docstring
         """
-        help_str = ""
-        if item.__doc__ is None:
-            return help_str
-        for line in item.__doc__.split("\n"):
-            if not line.strip().startswith(":"):
-                help_str += line.strip()
-        return help_str.strip()
+        return "".join(parse_docstring(item.__doc__).description)
 
     def _get_command_help(self, commands):
         """Build help text for a set of commands.
@@ -231,6 +435,8 @@ class CliCore:
         self._add_arguments(self.args["global"], parser)
 
         description = self._get_command_help(self._modules)
+        for name, entry in self._plugins.items():
+            description += f"\n{name} - plugin command from {entry.distribution or entry.value}"
         command_parser = self._add_sub(
             parser=parser,
             title="commands",
@@ -241,42 +447,50 @@ class CliCore:
         )
         self.command_parser = command_parser
         for mod in self._modules:
-            usage = self._build_usage({"command": mod})
-            description = self._get_help(self._modules[mod])
-            mod_parser = self._add_subparser(
-                usage,
-                description,
-                mod,
-                command_parser,
-                self.args["commands"][mod]["args"],
+            self._add_command_parser(mod)
+        return parser
+
+    def _add_command_parser(self, mod):
+        """Add the parser of one command, and its subcommands, to the command parser.
+        
+        Args:
+            mod (str): Command name
+        """
+        usage = self._build_usage({"command": mod})
+        description = self._get_help(self._modules[mod])
+        mod_parser = self._add_subparser(
+            usage,
+            description,
+            mod,
+            self.command_parser,
+            self.args["commands"][mod]["args"],
+        )
+        self.subcommand_parsers[mod] = mod_parser
+        # add subcommand parser if subcommands exist
+        subcommands = self.args["commands"][mod]["subcommands"]
+        if subcommands:
+            class_methods = {
+                m[0]: m[1] for m in self._get_class_methods(self._modules[mod])
+            }
+            description = self._get_command_help(class_methods)
+            subcommand_parser = self._add_sub(
+                parser=mod_parser,
+                title="subcommands",
+                description=description,
+                required=True,
+                metavar="",
+                dest="_subcommand",
             )
-            self.subcommand_parsers[mod] = mod_parser
-            # add subcommand parser if subcommands exist
-            subcommands = self.args["commands"][mod]["subcommands"]
-            if subcommands:
-                class_methods = {
-                    m[0]: m[1] for m in self._get_class_methods(self._modules[mod])
-                }
-                description = self._get_command_help(class_methods)
-                subcommand_parser = self._add_sub(
-                    parser=mod_parser,
-                    title="subcommands",
-                    description=description,
-                    required=True,
-                    metavar="",
-                    dest="_subcommand",
+            for subcommand_name, subcommand_args in subcommands.items():
+                usage = self._build_usage({"subcommand": subcommand_name})
+                description = self._get_help(class_methods[subcommand_name])
+                self._add_subparser(
+                    usage,
+                    description,
+                    subcommand_name,
+                    subcommand_parser,
+                    subcommand_args,
                 )
-                for subcommand_name, subcommand_args in subcommands.items():
-                    usage = self._build_usage({"subcommand": subcommand_name})
-                    description = self._get_help(class_methods[subcommand_name])
-                    self._add_subparser(
-                        usage,
-                        description,
-                        subcommand_name,
-                        subcommand_parser,
-                        subcommand_args,
-                    )
-        return parser
 
     def _build_usage(self, args=None):
         """Build usage string for help text.
@@ -332,6 +546,33 @@ class CliCore:
         """
         return getattr(importlib.import_module(module_name), class_name)
 
+    def _command_token(self, args):
+        """Return the argument in command position, skipping global options.
+
+        Args:
+            args (list): Command line arguments
+
+        Returns:
+            str: First argument that is neither an option nor an option's
+                value, or None
+        """
+        takes_value = {
+            flag
+            for flags, kwargs in self.args["global"]
+            if kwargs.get("action", "store") in ("store", "append") and kwargs.get("nargs") != 0
+            for flag in flags
+        }
+        remaining = iter(args)
+        for arg in remaining:
+            if arg == "--":
+                return next(remaining, None)
+            if arg.startswith("-"):
+                if arg in takes_value:
+                    next(remaining, None)
+                continue
+            return arg
+        return None
+
     def parse(self, args=None):
         """Parse command line arguments.
         
@@ -343,6 +584,9 @@ class CliCore:
         """
         if not args:
             args = []
+        command = self._command_token(args)
+        if command in self._plugins:
+            self.load_plugin(command)
         self.parsed_args = self.parser.parse_args(args)
         return self.parsed_args
 
@@ -352,12 +596,67 @@ class CliCore:
         Returns:
             Any: Result of command execution
         """
-        args = self.parsed_args.__dict__
-        command = self._modules[args["_command"]]
+        parsed = self.parsed_args.__dict__
+        command = self._modules[parsed["_command"]]
         subcommand = ""
-        if "_subcommand" in args:
-            subcommand = args["_subcommand"]
-        args = {k: v for k, v in args.items() if not k.startswith("_")}
-        if not subcommand:
-            return command(**args)
-        return getattr(command(), subcommand)(**args)
\ No newline at end of file
+        if "_subcommand" in parsed:
+            subcommand = parsed["_subcommand"]
+        concurrency = parsed.get("_concurrency")
+        is_async = (parsed["_command"], subcommand) in self._async_commands
+        args = {k: v for k, v in parsed.items() if not k.startswith("_")}
+        entry = getattr(command, subcommand) if subcommand else self._get_command_entry(command)
+        fan_out_param = get_fan_out_param(entry)
+        if fan_out_param:
+            return self._run_fan_out(command, subcommand, fan_out_param, args, parsed, is_async)
+        func = command_callable(command, subcommand)
+        if is_async:
+            return run_coroutine(_call_command(func, args, self), concurrency)
+        return _call_command(func, args, self)
+
+    def _run_fan_out(self, command, subcommand, param, args, parsed, is_async):
+        """Run a command once per target of its fan-out parameter.
+        
+        Args:
+            command: Command class
+            subcommand (str): Subcommand name
+            param (str): Fan-out parameter name
+            args (dict): Parsed command arguments
+            parsed (dict): All parsed arguments, including global options
+            is_async (bool): True if the command is a coroutine function
+            
+        Returns:
+            FanOutResults: Results in target order
+        """
+        targets = list(args.pop(param) or [])
+        if parsed.get("_fan_out_file"):
+            targets += read_targets(parsed["_fan_out_file"])
+        if not targets:
+            raise UsageError(f"No {param} given")
+        jobs = parsed.get("_jobs") or 1
+        # One command instance serves every target
+        func = command_callable(command, subcommand)
+
+        def call(target):
+            return _call_command(func, dict(args, **{param: target}), self)
+
+        def process_payload(target):
+            return (command.__module__, command.__qualname__, subcommand, param, args, target)
+
+        if is_async:
+            results = dispatch_async(
+                call,
+                targets,
+                lambda coro: run_coroutine(coro, parsed.get("_concurrency")),
+                jobs,
+            )
+        else:
+            results = dispatch(
+                call,
+                targets,
+                jobs,
+                parsed.get("_pool") or "thread",
+                # Pool processes have no CliCore to pass to commands asking for it
+                None if _wants_cli(func) else process_payload,
+            )
+        report(results)
+        return results
@@ -4,3 +4,6 @@ CLI modules for modmaker
 
 from modmaker._cli_modules.option import Option
 from modmaker._cli_modules.create import Create
+from modmaker._cli_modules.shell import Shell
+from modmaker._cli_modules.completion import Completion
+from modmaker._cli_modules.doctor import Doctor
@@ -0,0 +1,33 @@
+"""
+Print or install static shell completion scripts
+"""
+
+import logging
+
+from modmaker._completion import SHELLS, install_completion, render_completion
+from modmaker._exceptions import UsageError
+
+LOG = logging.getLogger(__name__)
+
+
+class Completion:
+    """
+    Generate a shell completion script (bash, zsh or fish)
+    """
+
+    CLINAME = "completion"
+
+    def __init__(self, shell: str, install: bool = False, _cli=None):
+        """
+        :param shell: Shell to generate the script for: bash, zsh or fish
+        :param install: Store the script in the cache directory and keep it up to date
+        """
+        self.description = "Generate a shell completion script"
+        if shell not in SHELLS:
+            raise UsageError(f"Unsupported shell '{shell}', expected one of: {', '.join(SHELLS)}")
+        if install:
+            path = install_completion(_cli, shell)
+            LOG.info("Completion script installed, add this to your shell profile:")
+            print(f"source {path}")
+        else:
+            print(render_completion(_cli, shell), end="")
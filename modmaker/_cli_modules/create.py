@@ -5,13 +5,22 @@ Create a new Python project skeleton
 import logging
 import os
 import sys
-import shutil
+import time
 from pathlib import Path
 
-from modmaker._common_utils import ensure_directory, copy_directory_contents, exit_with_code
+from modmaker._common_utils import ensure_directory
+from modmaker._exceptions import ProjectError, ProjectExistsError, TemplateError
+from modmaker._fanout import fan_out
+from modmaker._instrument import file_done, observing, phase
+from modmaker._logger import buffered_records, log_event, progress_level
+from modmaker._templates import TEMPLATE_CACHE
 
 LOG = logging.getLogger(__name__)
 
+# Template files whose variables are replaced
+RENDERED_SUFFIXES = ('.py', '.md', '.toml', '.txt')
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "cli")
+
 
 class Create:
     """
@@ -22,54 +31,81 @@ class Create:
 
     def __init__(self):
         self.description = "Create a new Python project skeleton"
+        # Benchmarks and embedders may point this at other templates
+        self.template_dir = TEMPLATE_DIR
         LOG.info("Initializing project creation...")
 
+    @fan_out("name")
     def project(self, name: str):
         """
         Create a new project
         
-        :param name: The name of the project to create
+        :param name: The name of the project to create, repeat to create several
+        """
+        # With --log-buffer, this project's records are only written if it fails
+        with buffered_records(name), phase("create_project", project=name):
+            return self._create_project(name)
+
+    def _create_project(self, name):
         """
-        LOG.info(f"Creating new project: {name}")
+        Generate one project in the current directory
         
+        Args:
+            name (str): Name of the project
+            
+        Returns:
+            bool: True once the project is created
+
+        Raises:
+            ProjectExistsError: If the project directory already exists
+            TemplateError: If the templates are missing
+            ProjectError: If the project files could not be written
+        """
         # Create project directory
         current_dir = os.getcwd()
         project_dir = os.path.join(current_dir, name)
+        log_event(LOG, logging.INFO, "project_started", "Creating new project: %s", name,
+                  path=project_dir)
         
         if os.path.exists(project_dir):
-            LOG.error(f"Directory {project_dir} already exists")
-            exit_with_code(1, f"Directory {project_dir} already exists")
+            raise ProjectExistsError(name, f"Directory {project_dir} already exists")
         
         # Create project structure
         ensure_directory(project_dir)
         
-        # Get template directory
-        template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "cli")
+        # Templates to generate from
+        template_dir = self.template_dir
         
-        if not os.path.exists(template_dir):
-            LOG.error(f"Template directory not found: {template_dir}")
-            exit_with_code(1, f"Template directory not found: {template_dir}")
+        with phase("discover", project=name):
+            if not TEMPLATE_CACHE.exists(template_dir):
+                raise TemplateError(f"Template directory not found: {template_dir}")
+            try:
+                tree = TEMPLATE_CACHE.load(template_dir)
+            except OSError as e:
+                raise ProjectError(name, f"Failed to read templates: {e}") from e
         
         # Copy basic structure
-        success = self._copy_template(template_dir, project_dir, name)
+        success = self._copy_template(tree, project_dir, name)
         if not success:
-            exit_with_code(1, "Failed to create project structure")
+            raise ProjectError(name, "Failed to create project structure")
             
         # Create CLI structure
-        success = self._create_cli_structure(project_dir, name)
+        with phase("create_cli_structure", project=name):
+            success = self._create_cli_structure(project_dir, name)
         if not success:
-            exit_with_code(1, "Failed to create CLI structure")
+            raise ProjectError(name, "Failed to create CLI structure")
             
-        LOG.info(f"Project {name} created successfully")
+        log_event(LOG, logging.INFO, "project_done", "Project %s created successfully", name,
+                  path=project_dir)
         print(f"Project {name} created successfully")
         return True
         
-    def _copy_template(self, template_dir, project_dir, project_name):
+    def _copy_template(self, tree, project_dir, project_name):
         """
         Copy template files to the project directory
         
         Args:
-            template_dir (str): Source template directory
+            tree (TemplateTree): Template loaded by the template cache
             project_dir (str): Destination project directory
             project_name (str): Name of the project
             
@@ -77,42 +113,57 @@ class Create:
             bool: True if successful, False otherwise
         """
         try:
-            # Handle special files/dirs first
-            # Copy and rename project directory template
-            src_project_dir = os.path.join(template_dir, "{{PROJECT_NAME}}")
-            dst_project_dir = os.path.join(project_dir, project_name)
-            
-            if os.path.exists(src_project_dir):
-                os.makedirs(dst_project_dir, exist_ok=True)
-                copy_directory_contents(src_project_dir, dst_project_dir)
-            
-            # Copy other files (excluding the project dir template)
-            for item in os.listdir(template_dir):
-                if item == "{{PROJECT_NAME}}":
-                    continue
-                    
-                src_item = os.path.join(template_dir, item)
-                dst_item = os.path.join(project_dir, item)
-                
-                if os.path.isdir(src_item):
-                    shutil.copytree(src_item, dst_item, dirs_exist_ok=True)
-                else:
-                    shutil.copy2(src_item, dst_item)
-            
-            # Replace template variables in all files
-            self._replace_variables(project_dir, {
-                "{{PROJECT_NAME}}": project_name,
-                "{{AUTHOR}}": "Your Name",
-                "{{EMAIL}}": "your.email@example.com",
-                "{{LICENSE}}": "Apache-2.0",
-                "{{PYTHON_VERSION}}": "3.8"
-            })
+            # Template variables are replaced in memory, so each file is written once
+            with phase("replace_variables", project=project_name):
+                rendered = self._render(tree, project_dir, project_name, {
+                    "{{PROJECT_NAME}}": project_name,
+                    "{{AUTHOR}}": "Your Name",
+                    "{{EMAIL}}": "your.email@example.com",
+                    "{{LICENSE}}": "Apache-2.0",
+                    "{{PYTHON_VERSION}}": "3.8"
+                })
+            # Checked once: per-file records are only built in verbose mode
+            verbose = LOG.isEnabledFor(logging.DEBUG)
+            profiled = observing()
+            # Write the template tree, renaming the project dir template. The
+            # directories come first in the tree, so files need no makedirs
+            with phase("copy", project=project_name):
+                for relpath in tree.dirs:
+                    ensure_directory(os.path.join(project_dir, self._target_path(relpath, project_name)))
+                for template_file in tree.files:
+                    started = time.perf_counter() if profiled else 0.0
+                    data = rendered.get(template_file.relpath, template_file.data)
+                    dst_item = os.path.join(project_dir, self._target_path(template_file.relpath, project_name))
+                    with open(dst_item, 'wb') as f:
+                        f.write(data)
+                    os.chmod(dst_item, template_file.mode)
+                    if verbose:
+                        LOG.debug("Wrote %s", dst_item)
+                    if profiled:
+                        file_done(dst_item, started, written=len(data))
             
             return True
         except Exception as e:
-            LOG.error(f"Error copying template: {str(e)}")
+            LOG.error("Error copying template: %s", e)
             return False
             
+    @staticmethod
+    def _target_path(relpath, project_name):
+        """
+        Map a template-relative path to its path in the generated project
+        
+        Args:
+            relpath (str): Path relative to the template directory
+            project_name (str): Name of the project
+            
+        Returns:
+            str: Path relative to the project directory
+        """
+        head, sep, tail = relpath.partition(os.sep)
+        if head == "{{PROJECT_NAME}}":
+            return project_name + sep + tail
+        return relpath
+            
     def _create_license_file(self, project_dir):
         """
         Create a license file with Apache 2.0 license
@@ -155,7 +206,7 @@ class Create:
             
             return True
         except Exception as e:
-            LOG.error(f"Error creating CLI structure: {str(e)}")
+            LOG.error("Error creating CLI structure: %s", e)
             return False
             
     def _create_file(self, project_dir, project_name, relative_path, content):
@@ -168,35 +219,54 @@ class Create:
             relative_path (str): Path relative to the project module
             content (str): File content
         """
+        started = time.perf_counter()
         file_path = os.path.join(project_dir, project_name, relative_path)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
         with open(file_path, 'w') as f:
             f.write(content)
+            written = f.tell()
+        file_done(file_path, started, written=written)
+        log_event(LOG, progress_level(), "file_rendered", "Rendered %s", file_path, path=file_path)
             
-    def _replace_variables(self, directory, variables):
+    def _render(self, tree, project_dir, project_name, variables):
         """
-        Replace template variables in all files in the directory
+        Replace template variables in the text files of a template tree
         
         Args:
-            directory (str): Directory to process
+            tree (TemplateTree): Loaded template tree
+            project_dir (str): Project directory the files will be written to
+            project_name (str): Name of the project
             variables (dict): Variables to replace
-        """
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith(('.py', '.md', '.toml', '.txt')):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'r') as f:
-                            content = f.read()
-                            
-                        for var, value in variables.items():
-                            content = content.replace(var, value)
-                            
-                        with open(file_path, 'w') as f:
-                            f.write(content)
-                    except Exception as e:
-                        LOG.error(f"Error processing file {file_path}: {str(e)}")
+            
+        Returns:
+            dict: Rendered content of each text file, by template-relative path
+        """
+        file_level = progress_level()
+        verbose = LOG.isEnabledFor(file_level)
+        profiled = observing()
+        rendered = {}
+        for template_file in tree.files:
+            if not template_file.relpath.endswith(RENDERED_SUFFIXES):
+                continue
+            started = time.perf_counter() if profiled else 0.0
+            file_path = os.path.join(project_dir, self._target_path(template_file.relpath, project_name))
+            try:
+                content = template_file.data.decode("utf-8")
+            except UnicodeDecodeError as e:
+                LOG.error("Error processing file %s: %s", file_path, e)
+                continue
+            if "\r" in content:
+                # Like reading in text mode, which the files were rendered with before
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
+            for var, value in variables.items():
+                content = content.replace(var, value)
+            rendered[template_file.relpath] = content.encode("utf-8")
+            if profiled:
+                file_done(file_path, started, read=len(template_file.data))
+            if verbose:
+                log_event(LOG, file_level, "file_rendered", "Rendered %s", file_path, path=file_path)
+        return rendered
                         
     def _get_cli_content(self, project_name):
         """
@@ -0,0 +1,66 @@
+"""
+Diagnose a slow modmaker start-up
+"""
+
+import logging
+import os
+import platform
+import sys
+
+from modmaker import _diagnostics
+from modmaker._cache import cache_dir
+
+LOG = logging.getLogger(__name__)
+
+
+class Doctor:
+    """
+    Report on the modmaker installation and where its start-up time goes
+    """
+
+    CLINAME = "doctor"
+
+    def __init__(
+        self,
+        timings: bool = False,
+        repeat: int = 3,
+        margin: int = _diagnostics.DEFAULT_MARGIN,
+        save_baseline: bool = False,
+        baseline: str = None,
+    ):
+        """
+        :param timings: Measure import, plugin discovery, argument introspection and parser build times
+        :param repeat: Runs per measurement; the fastest counts
+        :param margin: Percentage slowdown against the baseline reported as a regression
+        :param save_baseline: Store the measured timings as the baseline of later runs
+        :param baseline: Baseline file to compare with or save to, instead of the cached one
+        """
+        self.description = "Diagnose a slow modmaker start-up"
+        # Imported here: the CLI module imports the command modules
+        from modmaker._cli import NAME, _build_cli, get_installed_version  # pylint: disable=import-outside-toplevel
+
+        print(f"modmaker {get_installed_version()} on Python {platform.python_version()}")
+        print(f"executable: {sys.executable}")
+        print(f"cache: {cache_dir()}")
+        if not timings:
+            return
+        from modmaker._cli_core import CliCore  # pylint: disable=import-outside-toplevel
+        from modmaker._plugins import ENTRY_POINT_GROUP, discover_plugins  # pylint: disable=import-outside-toplevel
+
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(_diagnostics.__file__)))
+        LOG.info("Measuring %s start-up, %d run(s) per measurement...", NAME, repeat)
+        results = _diagnostics.measure_imports(package_root, repeat)
+        results.update(
+            _diagnostics.measure_cli(
+                lambda: _build_cli(CliCore, get_installed_version()),
+                lambda: discover_plugins(ENTRY_POINT_GROUP),
+                repeat,
+            )
+        )
+        rows = _diagnostics.compare(results, _diagnostics.load_baseline(baseline), margin)
+        print(_diagnostics.format_table(rows), end="")
+        regressed = [row.name for row in rows if row.regressed]
+        if regressed:
+            LOG.warning("Slower than the baseline: %s", ", ".join(regressed))
+        if save_baseline:
+            LOG.info("Baseline saved to %s", _diagnostics.save_baseline(results, baseline))
@@ -0,0 +1,165 @@
+"""
+Interactive modmaker shell
+
+The shell reuses the already built CliCore (and therefore its parsed argument
+spec and imported command modules) for every command it runs. Templates are
+kept in memory by the template cache, so only changed files are re-read
+between commands.
+"""
+
+import cmd
+import logging
+import os
+import shlex
+
+from modmaker._completion import option_flags
+
+LOG = logging.getLogger(__name__)
+
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".modmaker_history")
+HISTORY_LENGTH = 1000
+
+
+def complete_line(spec, line, text, exclude=("shell",)):
+    """Return completions for the word being typed, driven by the argument spec.
+
+    Args:
+        spec (dict): Argument spec as stored in ``CliCore.args``
+        line (str): Input line up to the word being completed
+        text (str): The word being completed
+        exclude (tuple, optional): Command names never offered. Defaults to ("shell",).
+
+    Returns:
+        list: Sorted candidate words starting with ``text``
+    """
+    try:
+        words = shlex.split(line)
+    except ValueError:
+        words = line.split()
+    commands = {k: v for k, v in spec["commands"].items() if k not in exclude}
+    position = next((i for i, word in enumerate(words) if word in commands), None)
+    if position is None:
+        candidates = list(commands) + option_flags(spec["global"])
+    else:
+        command = commands[words[position]]
+        subcommand = next(
+            (w for w in words[position + 1 :] if w in command["subcommands"]), None
+        )
+        if subcommand is None:
+            candidates = list(command["subcommands"]) + option_flags(command["args"])
+        else:
+            candidates = option_flags(command["subcommands"][subcommand])
+    return sorted(c for c in candidates if c.startswith(text))
+
+
+def _readline():
+    """Import readline on first use; it is not needed unless the shell runs"""
+    try:
+        import readline  # pylint: disable=import-outside-toplevel
+    except ImportError:  # pragma: no cover - readline is not available on Windows
+        return None
+    return readline
+
+
+class ModmakerShell(cmd.Cmd):
+    """Read-eval-print loop running modmaker commands on a warm CliCore"""
+
+    intro = "modmaker shell - type a command (for example 'create project NAME'), 'help' or 'exit'"
+    prompt = "modmaker> "
+
+    def __init__(self, cli, history_file=HISTORY_FILE, **kwargs):
+        super().__init__(**kwargs)
+        self.cli = cli
+        self.history_file = history_file
+
+    def preloop(self):
+        self.cli.load_plugins()
+        readline = _readline()
+        if readline is None or not self.use_rawinput:
+            return
+        readline.set_completer_delims(" \t\n")
+        readline.set_history_length(HISTORY_LENGTH)
+        if self.history_file and os.path.exists(self.history_file):
+            try:
+                readline.read_history_file(self.history_file)
+            except OSError:
+                LOG.debug("Unable to read shell history", exc_info=True)
+
+    def postloop(self):
+        readline = _readline()
+        if readline is None or not self.use_rawinput or not self.history_file:
+            return
+        try:
+            readline.write_history_file(self.history_file)
+        except OSError:
+            LOG.debug("Unable to write shell history", exc_info=True)
+
+    def emptyline(self):
+        """Do nothing on an empty line instead of repeating the last command"""
+
+    def default(self, line):
+        try:
+            args = shlex.split(line)
+        except ValueError as err:
+            LOG.error(str(err))
+            return
+        self.execute(args)
+
+    def execute(self, args):
+        """Parse and run one command line on the shared CliCore.
+
+        Args:
+            args (list): Command line arguments, without the program name
+
+        Returns:
+            Any: Result of the command, or None if it failed
+        """
+        if args and args[0] == "shell":
+            LOG.error("Already in the modmaker shell")
+            return None
+        logger = logging.getLogger("modmaker")
+        log_level = logger.level
+        try:
+            self.cli.parse(args)
+            return self.cli.run()
+        except SystemExit:
+            # argparse errors, --help and exit_with_code must not end the shell
+            return None
+        except Exception as err:  # pylint: disable=broad-except
+            LOG.error(str(err), exc_info=logger.isEnabledFor(logging.DEBUG))
+            return None
+        finally:
+            logger.setLevel(log_level)
+
+    def do_help(self, arg):
+        """Show help for modmaker or one of its commands"""
+        self.execute(shlex.split(arg) + ["-h"])
+
+    def do_exit(self, arg):
+        """Leave the shell"""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):  # pylint: disable=invalid-name
+        """Leave the shell on end of input"""
+        self.stdout.write("\n")
+        return True
+
+    def completenames(self, text, line="", begidx=0, endidx=0):
+        return complete_line(self.cli.args, line[:begidx], text)
+
+    def completedefault(self, text, line, begidx, endidx):
+        return complete_line(self.cli.args, line[:begidx], text)
+
+
+class Shell:
+    """
+    Interactive shell that keeps modmaker and its templates loaded
+    """
+
+    CLINAME = "shell"
+
+    def __init__(self, _cli=None):
+        self.description = "Interactive modmaker shell"
+        ModmakerShell(_cli).cmdloop()
@@ -6,14 +6,21 @@ import logging
 import sys
 import os
 import shutil
+from collections import namedtuple
 from pathlib import Path
 
 LOG = logging.getLogger(__name__)
 
+# One entry of a scanned tree; size, mode and mtime_ns are 0 for directories
+TreeEntry = namedtuple("TreeEntry", ["relpath", "is_dir", "size", "mode", "mtime_ns"])
+
 
 def exit_with_code(code, msg=""):
     """Exit the application with a specific code and optional message
     
+    Only for the CLI entry point: library code raises a ``ModmakerError``,
+    which ``_cli.main`` turns into an exit code.
+    
     Args:
         code (int): Exit code
         msg (str, optional): Optional error message. Defaults to "".
@@ -40,9 +47,62 @@ def ensure_directory(path):
         return False
 
 
+def scan_tree(root, matcher=None):
+    """Walk a tree once with ``os.scandir`` and return the plan of its entries.
+
+    Entry types come from the directory listing, which needs no ``stat``
+    call on most platforms, and every file is stat'ed exactly once. Ignored
+    directories are pruned without being listed. Symbolic links are
+    followed, as ``shutil.copytree`` does, except links back to a directory
+    being walked, which are listed but not entered.
+
+    Args:
+        root (str): Root directory
+        matcher (IgnoreMatcher, optional): Rules of the paths to skip. Defaults to None.
+
+    Returns:
+        list: TreeEntry per directory and file, each directory before its
+            contents and the entries of a directory sorted by name
+    """
+    plan = []
+    # Directories to walk, with the real paths of the directories above them
+    pending = [("", (os.path.realpath(root),))]
+    while pending:
+        rel_dir, real_dirs = pending.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as listing:
+            entries = sorted(listing, key=lambda entry: entry.name)
+        subdirs = []
+        for entry in entries:
+            relpath = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            is_dir = entry.is_dir()
+            if matcher is not None and matcher.ignored(relpath, is_dir):
+                continue
+            if is_dir:
+                plan.append(TreeEntry(relpath, True, 0, 0, 0))
+                # Only links need resolving; other paths stay real below a real parent
+                if entry.is_symlink():
+                    real_dir = os.path.realpath(entry.path)
+                else:
+                    real_dir = os.path.join(real_dirs[-1], entry.name)
+                if real_dir not in real_dirs:
+                    subdirs.append((relpath, real_dirs + (real_dir,)))
+            else:
+                stat = entry.stat()
+                plan.append(
+                    TreeEntry(relpath, False, stat.st_size, stat.st_mode & 0o7777, stat.st_mtime_ns)
+                )
+        # Depth first, in name order
+        pending.extend(reversed(subdirs))
+    return plan
+
+
 def copy_directory_contents(src, dest):
     """Copy all contents from source directory to destination
     
+    The source is scanned once; files are copied with ``shutil.copyfile``,
+    which uses the platform's fast copy, and get their mode and modification
+    time from the scan, like ``shutil.copy2``, without being stat'ed again.
+    
     Args:
         src (str): Source directory path
         dest (str): Destination directory path
@@ -51,18 +111,16 @@ def copy_directory_contents(src, dest):
         bool: True if copy was successful, False otherwise
     """
     try:
-        if not os.path.exists(dest):
-            os.makedirs(dest)
-            
-        for item in os.listdir(src):
-            src_item = os.path.join(src, item)
-            dest_item = os.path.join(dest, item)
-            
-            if os.path.isdir(src_item):
-                shutil.copytree(src_item, dest_item, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src_item, dest_item)
+        os.makedirs(dest, exist_ok=True)
+        for entry in scan_tree(src):
+            dest_item = os.path.join(dest, entry.relpath)
+            if entry.is_dir:
+                os.makedirs(dest_item, exist_ok=True)
+                continue
+            shutil.copyfile(os.path.join(src, entry.relpath), dest_item)
+            os.chmod(dest_item, entry.mode)
+            os.utime(dest_item, ns=(entry.mtime_ns, entry.mtime_ns))
         return True
     except Exception as e:
         LOG.error(f"Failed to copy directory contents: {str(e)}")
-        return False
\ No newline at end of file
+        return False
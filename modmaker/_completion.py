@@ -0,0 +1,255 @@
+"""
+Static shell completion scripts for modmaker
+
+The scripts are generated from ``CliCore.args`` and contain every command,
+subcommand and flag, so pressing TAB never starts a Python interpreter.
+Installed scripts are stored in the cache directory and regenerated when the
+argument spec's cache key changes.
+"""
+
+import logging
+import os
+import re
+
+from modmaker._cache import cache_path, write_text_atomic
+from modmaker._exceptions import UsageError
+
+LOG = logging.getLogger(__name__)
+
+SHELLS = ("bash", "zsh", "fish")
+KEY_HEADER = "# spec-key: "
+HELP_FLAGS = ["-h", "--help"]
+_SAFE_WORD = re.compile(r"[A-Za-z0-9_.:+=-]+")
+
+
+def option_flags(params):
+    """Return all option strings from a list of argument definitions.
+
+    Args:
+        params (list): Argument definitions as stored in ``CliCore.args``
+
+    Returns:
+        list: Option strings such as ``-n`` and ``--name``
+    """
+    return [flag for flags, _ in params for flag in flags if flag.startswith("-")]
+
+
+def completion_table(cli):
+    """Map each ``command:subcommand`` state to the words completed in it.
+
+    Args:
+        cli (CliCore): CLI whose argument spec is used
+
+    Returns:
+        dict: State to candidate words, ``":"`` being the top level
+    """
+    top = list(cli.args["commands"]) + HELP_FLAGS
+    if cli.version:
+        top += ["-v", "--version"]
+    table = {":": top + option_flags(cli.args["global"])}
+    for name, command in cli.args["commands"].items():
+        table[f"{name}:"] = list(command["subcommands"]) + HELP_FLAGS + option_flags(command["args"])
+        for subcommand, params in command["subcommands"].items():
+            table[f"{name}:{subcommand}"] = HELP_FLAGS + option_flags(params)
+    return {
+        state: [word for word in words if _SAFE_WORD.fullmatch(word)]
+        for state, words in table.items()
+    }
+
+
+def _function_name(prog):
+    return "_" + re.sub(r"\W", "_", prog) + "_complete"
+
+
+def _subcommand_pairs(cli):
+    return [
+        f"{name}:{subcommand}"
+        for name, command in cli.args["commands"].items()
+        for subcommand in command["subcommands"]
+    ]
+
+
+def _render_bash(cli, key):
+    func = _function_name(cli.name)
+    commands = "|".join(cli.args["commands"]) or "''"
+    pairs = "|".join(_subcommand_pairs(cli)) or "''"
+    cases = "\n".join(
+        f'        "{state}") candidates="{" ".join(words)}" ;;'
+        for state, words in completion_table(cli).items()
+    )
+    return f"""# {cli.name} completion for bash, generated by '{cli.name} completion bash'
+{KEY_HEADER}{key}
+{func}() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}" command="" subcommand="" candidates="" w i
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        w="${{COMP_WORDS[i]}}"
+        if [[ -z "$command" ]]; then
+            case "$w" in
+                {commands}) command="$w" ;;
+            esac
+        elif [[ -z "$subcommand" ]]; then
+            case "$command:$w" in
+                {pairs}) subcommand="$w" ;;
+            esac
+        fi
+    done
+    case "$command:$subcommand" in
+{cases}
+    esac
+    COMPREPLY=($(compgen -W "$candidates" -- "$cur"))
+}}
+complete -F {func} {cli.name}
+"""
+
+
+def _render_zsh(cli, key):
+    func = _function_name(cli.name)
+    commands = "|".join(cli.args["commands"]) or "''"
+    pairs = "|".join(_subcommand_pairs(cli)) or "''"
+    cases = "\n".join(
+        f'        ("{state}") candidates=({" ".join(words)}) ;;'
+        for state, words in completion_table(cli).items()
+    )
+    return f"""#compdef {cli.name}
+# {cli.name} completion for zsh, generated by '{cli.name} completion zsh'
+{KEY_HEADER}{key}
+{func}() {{
+    local command="" subcommand="" w
+    local -a candidates
+    for w in "${{(@)words[2,CURRENT-1]}}"; do
+        if [[ -z $command ]]; then
+            case $w in
+                ({commands}) command=$w ;;
+            esac
+        elif [[ -z $subcommand ]]; then
+            case "$command:$w" in
+                ({pairs}) subcommand=$w ;;
+            esac
+        fi
+    done
+    case "$command:$subcommand" in
+{cases}
+    esac
+    compadd -- "${{candidates[@]}}"
+}}
+compdef {func} {cli.name}
+"""
+
+
+def _render_fish(cli, key):
+    func = _function_name(cli.name)
+    commands = " ".join(cli.args["commands"])
+    pairs = " ".join(_subcommand_pairs(cli))
+    command_case = f"                case {commands}\n                    set command $w\n" if commands else ""
+    pair_case = f"                case {pairs}\n                    set subcommand $w\n" if pairs else ""
+    cases = "\n".join(
+        f'        case "{state}"\n            printf "%s\\n" {" ".join(words)}'
+        for state, words in completion_table(cli).items()
+    )
+    return f"""# {cli.name} completion for fish, generated by '{cli.name} completion fish'
+{KEY_HEADER}{key}
+function {func}_state
+    set -l command ""
+    set -l subcommand ""
+    for w in (commandline -opc)[2..-1]
+        if test -z "$command"
+            switch $w
+{command_case}            end
+        else if test -z "$subcommand"
+            switch "$command:$w"
+{pair_case}            end
+        end
+    end
+    echo "$command:$subcommand"
+end
+function {func}
+    switch ({func}_state)
+{cases}
+    end
+end
+complete -c {cli.name} -f -a "({func})"
+"""
+
+
+_RENDERERS = {"bash": _render_bash, "zsh": _render_zsh, "fish": _render_fish}
+
+
+def render_completion(cli, shell):
+    """Render a self-contained completion script.
+
+    Args:
+        cli (CliCore): CLI whose argument spec is used
+        shell (str): One of ``bash``, ``zsh`` or ``fish``
+
+    Returns:
+        str: Completion script
+    """
+    if shell not in _RENDERERS:
+        raise UsageError(f"Unsupported shell '{shell}', expected one of: {', '.join(SHELLS)}")
+    cli.load_plugins()
+    return _RENDERERS[shell](cli, cli.spec_key)
+
+
+def installed_path(prog, shell):
+    """Return where the completion script for a shell is installed.
+
+    Args:
+        prog (str): Program name
+        shell (str): Shell name
+
+    Returns:
+        str: Path inside the cache directory
+    """
+    return cache_path("completion", f"{prog}.{shell}")
+
+
+def install_completion(cli, shell):
+    """Write the completion script for a shell to the cache directory.
+
+    Args:
+        cli (CliCore): CLI whose argument spec is used
+        shell (str): Shell name
+
+    Returns:
+        str: Path of the installed script
+    """
+    path = installed_path(cli.name, shell)
+    write_text_atomic(path, render_completion(cli, shell))
+    return path
+
+
+def _installed_key(path):
+    try:
+        with open(path, "r") as f:
+            for _ in range(4):
+                line = f.readline()
+                if line.startswith(KEY_HEADER):
+                    return line[len(KEY_HEADER) :].strip()
+    except OSError:
+        pass
+    return None
+
+
+def refresh_completions(cli):
+    """Regenerate installed completion scripts whose spec key is stale.
+
+    Only shells that were installed with ``completion SHELL --install`` are
+    refreshed; when none are installed this costs one ``stat`` per shell.
+
+    Args:
+        cli (CliCore): CLI whose argument spec is used
+
+    Returns:
+        list: Shells whose script was regenerated
+    """
+    installed = [s for s in SHELLS if os.path.exists(installed_path(cli.name, s))]
+    if not installed:
+        return []
+    key = cli.spec_key
+    refreshed = []
+    for shell in installed:
+        if _installed_key(installed_path(cli.name, shell)) != key:
+            LOG.debug("Regenerating %s completion script", shell)
+            install_completion(cli, shell)
+            refreshed.append(shell)
+    return refreshed
@@ -0,0 +1,223 @@
+"""
+Start-up diagnostics for ``modmaker doctor --timings``
+
+Measures where start-up time goes on this host: module imports, read from
+``python -X importtime`` in a fresh interpreter, and the steps of building
+the CLI, timed in process through the ``_instrument`` phases of CliCore.
+Results can be stored as a baseline and later runs compared against it.
+"""
+
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+from modmaker._cache import cache_path, read_json, write_json
+
+# Modules whose cumulative import time is reported on their own
+IMPORT_MODULES = ("modmaker._cli", "modmaker._cli_core", "modmaker._logger", "modmaker._cli_modules")
+METADATA_MODULE = "importlib.metadata"
+# Phases reported by CliCore.__init__ -> measurement name
+CLI_PHASES = {
+    "plugin_discovery": "plugin discovery (cached index)",
+    "build_args": "_build_args introspection",
+    "build_parser": "parser build",
+}
+DEFAULT_MARGIN = 25
+# Differences below this are noise, whatever the relative change
+NOISE_MS = 1.0
+
+Comparison = namedtuple("Comparison", ["name", "ms", "baseline", "regressed"])
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output.
+
+    Args:
+        stderr (str): Standard error of the interpreter
+
+    Returns:
+        list: (module, depth, cumulative microseconds) tuples in import order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), (len(name) - len(name.lstrip()) - 1) // 2, int(cumulative)))
+    return entries
+
+
+def _is_third_party(name):
+    top_level = name.partition(".")[0]
+    stdlib = getattr(sys, "stdlib_module_names", None)
+    if stdlib is None:  # pragma: no cover - Python < 3.10
+        return False
+    return top_level != "modmaker" and top_level not in stdlib and not top_level.startswith("_")
+
+
+def import_times(entries):
+    """Summarize the import times of the modmaker start-up path.
+
+    Args:
+        entries (list): Entries returned by ``parse_importtime``
+
+    Returns:
+        dict: Measurement name -> milliseconds
+    """
+    cumulative = {name: us for name, _, us in entries}
+    results = {}
+    for module in IMPORT_MODULES + (METADATA_MODULE,):
+        if module in cumulative:
+            results[f"import {module}"] = cumulative[module] / 1000.0
+    # Top-level third-party packages; their submodules are in the cumulative time
+    for name, _, us in entries:
+        if "." not in name and _is_third_party(name):
+            results[f"import {name} (third-party)"] = us / 1000.0
+    return results
+
+
+def measure_imports(package_root, repeat=1):
+    """Time the start-up imports in fresh interpreters.
+
+    ``importlib.metadata`` is imported after ``modmaker._cli``, as plugin
+    discovery would, so its own cost is measured separately.
+
+    Args:
+        package_root (str): Directory or archive holding the modmaker package
+        repeat (int, optional): Interpreters to start; the fastest run counts. Defaults to 1.
+
+    Returns:
+        dict: Measurement name -> milliseconds
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    command = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        f"import modmaker._cli; import {METADATA_MODULE}",
+    ]
+    best = {}
+    for _ in range(max(1, repeat)):
+        result = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+        for name, ms in import_times(parse_importtime(result.stderr)).items():
+            best[name] = min(ms, best.get(name, ms))
+    return best
+
+
+def measure_cli(build_cli, discover, repeat=1):
+    """Time plugin discovery and the steps of building the CLI, in process.
+
+    Args:
+        build_cli (Callable): Builds a CliCore
+        discover (Callable): Scans the installed distributions for plugins
+        repeat (int, optional): Runs; the fastest counts. Defaults to 1.
+
+    Returns:
+        dict: Measurement name -> milliseconds
+    """
+    from modmaker._instrument import add_observer, remove_observer  # pylint: disable=import-outside-toplevel
+    from modmaker._profile import Profiler  # pylint: disable=import-outside-toplevel
+
+    best = {}
+
+    def keep(name, ms):
+        best[name] = min(ms, best.get(name, ms))
+
+    for _ in range(max(1, repeat)):
+        profiler = Profiler()
+        add_observer(profiler)
+        try:
+            started = time.perf_counter()
+            build_cli()
+            keep("build CLI (total)", (time.perf_counter() - started) * 1000)
+        finally:
+            remove_observer(profiler)
+        phases = {entry["name"]: entry["wall"] for entry in profiler.report()["phases"]}
+        for name, label in CLI_PHASES.items():
+            if name in phases:
+                keep(label, phases[name] * 1000)
+        started = time.perf_counter()
+        discover()
+        keep("plugin scan (uncached)", (time.perf_counter() - started) * 1000)
+    return best
+
+
+def baseline_path():
+    """Return the default baseline file, in the modmaker cache directory"""
+    return cache_path("doctor", "baseline.json")
+
+
+def load_baseline(path=None):
+    """Read stored measurements.
+
+    Args:
+        path (str, optional): Baseline file. Defaults to the cached baseline.
+
+    Returns:
+        dict: Measurement name -> milliseconds, empty without a baseline
+    """
+    return read_json(path or baseline_path(), default={}).get("results", {})
+
+
+def save_baseline(results, path=None):
+    """Store measurements as the baseline of later runs.
+
+    Args:
+        results (dict): Measurement name -> milliseconds
+        path (str, optional): Baseline file. Defaults to the cached baseline.
+
+    Returns:
+        str: Path written
+    """
+    path = path or baseline_path()
+    write_json(path, {"python": platform.python_version(), "results": results})
+    return path
+
+
+def compare(results, baseline, margin=DEFAULT_MARGIN):
+    """Compare measurements with a baseline.
+
+    A measurement regressed when it is more than ``margin`` percent, and
+    more than ``NOISE_MS``, slower than its baseline.
+
+    Args:
+        results (dict): Measurement name -> milliseconds
+        baseline (dict): Baseline measurements
+        margin (int, optional): Allowed slowdown in percent. Defaults to 25.
+
+    Returns:
+        list: Comparison for every measurement, in result order
+    """
+    rows = []
+    for name, ms in results.items():
+        base = baseline.get(name)
+        regressed = base is not None and ms > base * (1 + margin / 100.0) and ms - base > NOISE_MS
+        rows.append(Comparison(name, ms, base, regressed))
+    return rows
+
+
+def format_table(rows):
+    """Format comparisons as a text table.
+
+    Args:
+        rows (list): Comparisons returned by ``compare``
+
+    Returns:
+        str: Table with one line per measurement
+    """
+    width = max([len("measurement")] + [len(row.name) for row in rows])
+    lines = [f"{'measurement':<{width}}  {'ms':>9}  {'baseline':>9}  {'change':>8}"]
+    for row in rows:
+        if row.baseline is None:
+            baseline, change = "-", ""
+        else:
+            baseline = f"{row.baseline:.2f}"
+            change = f"{(row.ms - row.baseline) / row.baseline * 100:+.0f}%" if row.baseline else ""
+        flag = "  REGRESSION" if row.regressed else ""
+        lines.append(f"{row.name:<{width}}  {row.ms:>9.2f}  {baseline:>9}  {change:>8}{flag}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,160 @@
+"""
+Docstring parsing for CLI help text
+
+Docstrings are parsed once into a ``Docstring`` holding the summary, the free
+text description and the help and type of every documented parameter.
+Sphinx (``:param x:``), Google (``Args:``) and NumPy (``Parameters``
+followed by dashes) styles are understood.
+"""
+
+import functools
+import inspect
+import re
+import types
+from collections import namedtuple
+
+ParamDoc = namedtuple("ParamDoc", ["help", "type"])
+Docstring = namedtuple("Docstring", ["summary", "description", "params"])
+
+EMPTY_DOCSTRING = Docstring("", (), types.MappingProxyType({}))
+
+PARAM_SECTIONS = {
+    "args",
+    "arguments",
+    "parameters",
+    "params",
+    "keyword args",
+    "keyword arguments",
+    "other parameters",
+}
+SECTIONS = PARAM_SECTIONS | {
+    "attributes",
+    "example",
+    "examples",
+    "methods",
+    "note",
+    "notes",
+    "raises",
+    "references",
+    "return",
+    "returns",
+    "see also",
+    "todo",
+    "warning",
+    "warnings",
+    "yield",
+    "yields",
+}
+
+_SPHINX_PARAM = re.compile(r":param\s+(?:(?P<type>[^:]+?)\s+)?(?P<name>\*{0,2}\w+)\s*:(?P<help>.*)")
+_SPHINX_TYPE = re.compile(r":type\s+(?P<name>\*{0,2}\w+)\s*:(?P<type>.*)")
+_GOOGLE_PARAM = re.compile(r"(?P<name>\*{0,2}\w+)\s*(?:\((?P<type>[^)]*)\))?\s*:(?P<help>.*)")
+_NUMPY_PARAM = re.compile(r"(?P<name>\*{0,2}\w+)\s*(?::(?P<type>.*))?")
+_UNDERLINE = re.compile(r"-{3,}")
+
+
+def _clean_type(type_str):
+    """Normalize a documented type such as ``str, optional`` to ``str``"""
+    if not type_str:
+        return None
+    return type_str.split(",")[0].strip() or None
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_docstring(docstring):
+    """Parse a docstring once into summary, description and parameters.
+
+    Args:
+        docstring (str): Raw docstring, may be None
+
+    Returns:
+        Docstring: Parsed docstring; ``params`` maps names to ``ParamDoc``
+    """
+    if not docstring:
+        return EMPTY_DOCSTRING
+    lines = inspect.cleandoc(docstring).splitlines()
+    description = []
+    helps = {}
+    param_types = {}
+
+    section = None  # name of the Google/NumPy section being read
+    section_indent = 0
+    numpy = False
+    entry_indent = None
+    field_indent = None  # indent of the current Sphinx field, if any
+    current = None  # parameter receiving continuation lines
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+        following = lines[index + 1].strip() if index + 1 < len(lines) else ""
+        index += 1
+
+        if not stripped:
+            continue
+
+        # NumPy section header: a title underlined with dashes
+        if _UNDERLINE.fullmatch(following) and stripped.lower() in SECTIONS:
+            section, section_indent, numpy = stripped.lower(), indent, True
+            entry_indent, field_indent, current = None, None, None
+            index += 1
+            continue
+
+        # Google section header: "Args:"
+        if stripped.endswith(":") and stripped[:-1].strip().lower() in SECTIONS:
+            section, section_indent, numpy = stripped[:-1].strip().lower(), indent, False
+            entry_indent, field_indent, current = None, None, None
+            continue
+
+        if section is not None and (numpy or indent > section_indent):
+            if section not in PARAM_SECTIONS:
+                continue
+            if entry_indent is None:
+                entry_indent = indent
+            if indent == entry_indent:
+                match = (_NUMPY_PARAM if numpy else _GOOGLE_PARAM).fullmatch(stripped)
+                if match:
+                    current = match.group("name").lstrip("*")
+                    helps[current] = [] if numpy else [match.group("help").strip()]
+                    param_types[current] = _clean_type(match.group("type"))
+                    continue
+            if current is not None:
+                helps[current].append(stripped)
+            continue
+        section = None
+
+        # Sphinx fields: ":param x:", ":type x:", ":returns:" ...
+        if stripped.startswith(":"):
+            field_indent, current = indent, None
+            match = _SPHINX_PARAM.fullmatch(stripped)
+            if match:
+                current = match.group("name").lstrip("*")
+                helps[current] = [match.group("help").strip()]
+                if match.group("type"):
+                    param_types[current] = _clean_type(match.group("type"))
+                continue
+            match = _SPHINX_TYPE.fullmatch(stripped)
+            if match:
+                param_types[match.group("name").lstrip("*")] = _clean_type(match.group("type"))
+            continue
+        if field_indent is not None and indent > field_indent:
+            if current is not None:
+                helps[current].append(stripped)
+            continue
+        field_indent, current = None, None
+
+        description.append(stripped)
+
+    params = {
+        name: ParamDoc(" ".join(part for part in parts if part), param_types.get(name))
+        for name, parts in helps.items()
+    }
+    for name, type_str in param_types.items():
+        params.setdefault(name, ParamDoc("", type_str))
+    return Docstring(
+        description[0] if description else "",
+        tuple(description),
+        types.MappingProxyType(params),
+    )
@@ -0,0 +1,51 @@
+"""
+Exceptions raised by modmaker
+
+Library code raises these instead of exiting, so one failing project does
+not end a process that generates many. ``_cli.main`` turns them into an
+error message and the exit code of the exception.
+"""
+
+
+class ModmakerError(Exception):
+    """Base class of the errors reported to the user
+
+    Args:
+        message (str): Error message
+        exit_code (int, optional): Exit code overriding the class default. Defaults to None.
+    """
+
+    exit_code = 1
+
+    def __init__(self, message, exit_code=None):
+        super().__init__(message)
+        if exit_code is not None:
+            self.exit_code = exit_code
+
+
+class UsageError(ModmakerError, ValueError):
+    """An option or argument value is invalid"""
+
+    # Same exit code as argparse errors
+    exit_code = 2
+
+
+class TemplateError(ModmakerError):
+    """The project templates are missing or cannot be read"""
+
+
+class ProjectError(ModmakerError):
+    """A project could not be generated
+
+    Args:
+        project (str): Name of the project
+        message (str): Error message
+    """
+
+    def __init__(self, project, message, exit_code=None):
+        super().__init__(message, exit_code)
+        self.project = project
+
+
+class ProjectExistsError(ProjectError):
+    """The directory of a new project already exists"""
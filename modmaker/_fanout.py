@@ -0,0 +1,250 @@
+"""
+Fan-out of one command over many targets
+
+A command parameter declared with ``fan_out`` accepts several values, and
+values read from a file, on the command line::
+
+    class Create:
+        @fan_out("name")
+        def project(self, name: str):
+            ...
+
+    modmaker --jobs 8 create project alpha beta --name-file more.txt
+
+CliCore then calls the command once per target on a thread or process pool,
+all inside a single modmaker process, and aggregates the results in order.
+The pools and asyncio are imported when a fan-out actually runs.
+"""
+
+import importlib
+import logging
+import sys
+from collections import namedtuple
+
+from modmaker._exceptions import ModmakerError, UsageError
+from modmaker._instrument import phase
+from modmaker._logger import log_event
+
+LOG = logging.getLogger(__name__)
+
+FAN_OUT_ATTR = "_modmaker_fan_out"
+POOLS = ("thread", "process")
+
+FanOutResult = namedtuple("FanOutResult", ["target", "exit_code", "value", "error"])
+
+
+def fan_out(param):
+    """Declare the parameter a command can be fanned out over.
+
+    Args:
+        param (str): Name of the parameter receiving one target per call
+
+    Returns:
+        Callable: Decorator marking the command function
+    """
+
+    def decorator(func):
+        setattr(func, FAN_OUT_ATTR, param)
+        return func
+
+    return decorator
+
+
+def get_fan_out_param(func):
+    """Return the fan-out parameter declared on a command function, if any.
+
+    Args:
+        func: Command function or class
+
+    Returns:
+        str: Parameter name, or None
+    """
+    return getattr(func, "__dict__", {}).get(FAN_OUT_ATTR)
+
+
+class FanOutResults(list):
+    """Ordered results of a fanned-out command"""
+
+    @property
+    def failed(self):
+        """list: Results of the targets that failed"""
+        return [result for result in self if result.exit_code]
+
+    @property
+    def exit_code(self):
+        """int: Highest exit code of all targets, 0 if all succeeded"""
+        return max((result.exit_code for result in self), default=0)
+
+
+def read_targets(path):
+    """Read fan-out targets from a file, one per line.
+
+    Blank lines and lines starting with ``#`` are ignored.
+
+    Args:
+        path (str): File to read, ``-`` for standard input
+
+    Returns:
+        list: Targets in file order
+    """
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _exit_result(target, err):
+    """Translate a SystemExit raised by a command into a result"""
+    if err.code is None or isinstance(err.code, int):
+        return FanOutResult(target, err.code or 0, None, None)
+    return FanOutResult(target, 1, None, str(err.code))
+
+
+def _call_target(call, target):
+    """Call a command for one target, capturing failures as exit codes.
+
+    Args:
+        call (Callable): Function taking the target
+        target (str): Target value
+
+    Returns:
+        FanOutResult: Outcome of the call
+    """
+    try:
+        with phase("target", target=target):
+            return FanOutResult(target, 0, call(target), None)
+    except ModmakerError as err:
+        return FanOutResult(target, err.exit_code, None, str(err))
+    except SystemExit as err:
+        return _exit_result(target, err)
+    except Exception as err:  # pylint: disable=broad-except
+        LOG.debug("Target %s failed", target, exc_info=True)
+        return FanOutResult(target, 1, None, str(err))
+
+
+# Command callables of this pool process, by (module, class, subcommand)
+_PROCESS_COMMANDS = {}
+
+
+def _process_call(payload):
+    """Run one target in a pool process; the command is imported by reference
+
+    The command is instantiated once per process and called like on the other
+    pools. Commands asking for the running CLI are not sent to process pools.
+    """
+    module_name, class_name, subcommand, param, kwargs, target = payload
+    # pylint: disable=import-outside-toplevel
+    from modmaker._cli_core import _call_command, command_callable
+
+    key = (module_name, class_name, subcommand)
+    func = _PROCESS_COMMANDS.get(key)
+    if func is None:
+        command = getattr(importlib.import_module(module_name), class_name)
+        func = _PROCESS_COMMANDS[key] = command_callable(command, subcommand)
+
+    def call(value):
+        return _call_command(func, dict(kwargs, **{param: value}), None)
+
+    return _call_target(call, target)
+
+
+async def _call_target_async(call, target):
+    try:
+        return FanOutResult(target, 0, await call(target), None)
+    except ModmakerError as err:
+        return FanOutResult(target, err.exit_code, None, str(err))
+    except SystemExit as err:
+        return _exit_result(target, err)
+    except Exception as err:  # pylint: disable=broad-except
+        LOG.debug("Target %s failed", target, exc_info=True)
+        return FanOutResult(target, 1, None, str(err))
+
+
+async def _gather_async(call, targets, jobs):
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    limit = asyncio.Semaphore(jobs)
+
+    async def limited(target):
+        async with limit:
+            return await _call_target_async(call, target)
+
+    return await asyncio.gather(*(limited(target) for target in targets))
+
+
+def dispatch(call, targets, jobs=1, pool="thread", process_payload=None):
+    """Call a command once per target and collect the results in order.
+
+    Args:
+        call (Callable): Function running the command for one target
+        targets (list): Target values
+        jobs (int, optional): Number of workers. Defaults to 1.
+        pool (str, optional): ``thread`` or ``process``. Defaults to "thread".
+        process_payload (Callable, optional): Builds the picklable payload of a target
+            for process pools. Defaults to None.
+
+    Returns:
+        FanOutResults: One result per target, in target order
+    """
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+    )
+
+    jobs = max(1, jobs or 1)
+    if pool not in POOLS:
+        raise UsageError(f"Unknown pool '{pool}', expected one of: {', '.join(POOLS)}")
+    LOG.debug("Dispatching %d targets on %d %s worker(s)", len(targets), jobs, pool)
+    # Observers see every target queued here, and each one leave the queue
+    # as its "target" phase starts (only in this process: not on process pools)
+    with phase("fan_out", targets=len(targets), jobs=jobs, pool=pool):
+        if jobs == 1 or len(targets) < 2:
+            return FanOutResults(_call_target(call, target) for target in targets)
+        if pool == "process":
+            if process_payload is None:
+                raise UsageError("This command cannot run on a process pool")
+            chunksize = max(1, len(targets) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                payloads = [process_payload(target) for target in targets]
+                return FanOutResults(executor.map(_process_call, payloads, chunksize=chunksize))
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            return FanOutResults(executor.map(lambda target: _call_target(call, target), targets))
+
+
+def dispatch_async(call, targets, run, jobs=1):
+    """Run an async command for the targets concurrently on one event loop.
+
+    Args:
+        call (Callable): Coroutine function running the command for one target
+        targets (list): Target values
+        run (Callable): Runs a coroutine to completion on the managed loop
+        jobs (int, optional): Maximum number of targets in flight. Defaults to 1.
+
+    Returns:
+        FanOutResults: One result per target, in target order
+    """
+    jobs = max(1, jobs or 1)
+    with phase("fan_out", targets=len(targets), jobs=jobs, pool="async"):
+        return FanOutResults(run(_gather_async(call, targets, jobs)))
+
+
+def report(results):
+    """Log a summary of a fanned-out run.
+
+    Failures are always logged; the count of successful targets only when
+    there is more than one, so a single target logs as it did before.
+
+    Args:
+        results (FanOutResults): Results to summarize
+    """
+    for result in results.failed:
+        log_event(LOG, logging.ERROR, "target_failed", "%s failed (exit code %s)%s",
+                  result.target, result.exit_code, f": {result.error}" if result.error else "",
+                  target=result.target, exit_code=result.exit_code, error=result.error)
+    if len(results) < 2:
+        return
+    succeeded = len(results) - len(results.failed)
+    log_event(LOG, logging.INFO, "targets_done", "%d of %d targets succeeded",
+              succeeded, len(results), succeeded=succeeded, total=len(results))
@@ -0,0 +1,76 @@
+"""
+Pre-rendered top-level help for modmaker
+
+Building ``CliCore`` imports and introspects every command and builds the
+whole parser tree, which is wasted work when all that is asked for is the
+top-level ``-h`` output. The rendered help is cached on disk and served
+directly while the argument spec's cache key is unchanged.
+"""
+
+import logging
+
+from modmaker._cache import (
+    SPEC_SOURCES,
+    cache_path,
+    module_package_paths,
+    read_json,
+    spec_cache_key,
+    write_json,
+)
+from modmaker._plugins import load_plugin_index
+
+LOG = logging.getLogger(__name__)
+
+HELP_FLAGS = ("-h", "--help")
+VERSION_FLAGS = ("-v", "--version")
+
+
+def help_key(prog_name, module_package, version=None, plugin_group=None, paths=(), parts=()):
+    """Compute the cache key of the top-level help without building the CLI.
+
+    With ``paths`` set to the ``spec_paths`` of a ``CliCore`` and no
+    ``parts``, this is the same key as its ``spec_key``.
+
+    Args:
+        prog_name (str): Program name
+        module_package: Package containing the command classes
+        version (str, optional): Program version. Defaults to None.
+        plugin_group (str, optional): Entry-point group of plugins. Defaults to None.
+        paths (tuple, optional): Extra files the help depends on. Defaults to ().
+        parts (tuple, optional): Extra values the help depends on. Defaults to ().
+
+    Returns:
+        str: Hex digest identifying the help text
+    """
+    plugin_key = load_plugin_index(plugin_group)[0] if plugin_group else None
+    return spec_cache_key(
+        module_package_paths(module_package) + list(SPEC_SOURCES) + list(paths),
+        prog_name,
+        version,
+        plugin_key,
+        *parts,
+    )
+
+
+def cached_help(prog_name, key, render):
+    """Return the top-level help, rendering and caching it when the key changed.
+
+    Args:
+        prog_name (str): Program name
+        key (str): Current help cache key
+        render (Callable): Renders the help text when the cache is stale
+
+    Returns:
+        str: Help text
+    """
+    path = cache_path("help", f"{prog_name}.json")
+    cached = read_json(path, default={})
+    if cached.get("key") == key and isinstance(cached.get("help"), str):
+        return cached["help"]
+    LOG.debug("Help cache for %s is stale, rendering it", prog_name)
+    text = render()
+    try:
+        write_json(path, {"key": key, "help": text})
+    except OSError:
+        LOG.debug("Unable to write help cache", exc_info=True)
+    return text
@@ -0,0 +1,213 @@
+"""
+Ignore rules for template trees (``.modmakerignore``)
+
+A ``.modmakerignore`` file at the root of a template lists the paths that
+are not part of the template, with gitignore semantics:
+
+- blank lines and lines starting with ``#`` are skipped, ``\\#`` and ``\\!``
+  escape a leading ``#`` or ``!``;
+- ``*`` and ``?`` match within one path component, ``[a-z]`` matches a
+  character class and ``**`` matches any number of directories;
+- a pattern containing a ``/`` other than a trailing one is relative to the
+  template root, any other pattern matches at every depth;
+- a trailing ``/`` only matches directories;
+- ``!`` re-includes a path excluded by an earlier pattern, and the last
+  matching pattern wins.
+
+The rules are compiled once into regular expressions and applied while the
+tree is walked: an excluded directory is pruned, so nothing below it is
+listed, stat'ed or read. As with git, a file inside an excluded directory
+cannot be re-included. Editor and interpreter leftovers are always
+ignored, unless re-included with ``!``.
+"""
+
+import functools
+import os
+import re
+
+IGNORE_FILE = ".modmakerignore"
+DEFAULT_PATTERNS = (
+    IGNORE_FILE,
+    ".DS_Store",
+    "Thumbs.db",
+    "__pycache__/",
+    "*.py[cod]",
+    "*.swp",
+    "*~",
+    ".#*",
+)
+
+
+def _translate_class(pattern, index):
+    """Translate the ``[...]`` class starting at ``index``.
+
+    Returns:
+        tuple: Regular expression and the index after the class, or None if
+            the class is not closed
+    """
+    end = index + 1
+    if end < len(pattern) and pattern[end] in "!^":
+        end += 1
+    if end < len(pattern) and pattern[end] == "]":
+        end += 1
+    end = pattern.find("]", end)
+    if end < 0:
+        return None
+    body = pattern[index + 1:end]
+    if body[:1] in ("!", "^"):
+        body = "^" + body[1:]
+    return "[" + body.replace("\\", "\\\\") + "]", end + 1
+
+
+def translate(pattern):
+    """Translate one gitignore pattern into a regular expression.
+
+    Args:
+        pattern (str): Pattern without negation or trailing ``/``
+
+    Returns:
+        str: Expression matching whole paths relative to the root, with
+            ``/`` separators
+    """
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    parts = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**", index) and (index == 0 or pattern[index - 1] == "/"):
+            if index + 2 == len(pattern):
+                parts.append(".*")
+                index += 2
+                continue
+            if pattern[index + 2] == "/":
+                parts.append("(?:.*/)?")
+                index += 3
+                continue
+        if char == "*":
+            parts.append("[^/]*")
+            while index + 1 < len(pattern) and pattern[index + 1] == "*":
+                index += 1
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            translated = _translate_class(pattern, index)
+            if translated is not None:
+                expression, index = translated
+                parts.append(expression)
+                continue
+            parts.append(re.escape(char))
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return ("" if anchored else "(?:.*/)?") + "".join(parts)
+
+
+def parse_patterns(lines):
+    """Parse gitignore lines into rules.
+
+    Args:
+        lines (Iterable): Lines of an ignore file
+
+    Returns:
+        list: ``(expression, negated, directories_only)`` tuples, in file order
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n")
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line[:2] in ("\\#", "\\!"):
+            line = line[1:]
+        directories_only = line.endswith("/")
+        line = line.rstrip("/")
+        if line:
+            rules.append((translate(line), negated, directories_only))
+    return rules
+
+
+class IgnoreMatcher:
+    """Compiled ignore rules of one template tree"""
+
+    def __init__(self, rules):
+        self._rules = [
+            (re.compile(expression, re.DOTALL), negated, directories_only)
+            for expression, negated, directories_only in rules
+        ]
+        # Without negations the order does not matter: one alternation per
+        # kind of path answers in a single call
+        self._combined = not any(negated for _, negated, _ in rules)
+        if self._combined:
+            self._files = self._combine([expr for expr, _, dirs_only in rules if not dirs_only])
+            self._dirs = self._combine([expr for expr, _, _ in rules])
+
+    @staticmethod
+    def _combine(expressions):
+        if not expressions:
+            return None
+        return re.compile("|".join(f"(?:{expression})" for expression in expressions), re.DOTALL)
+
+    def ignored(self, relpath, is_dir=False):
+        """Check if a path is excluded by the rules.
+
+        Parent directories are not checked: walks prune excluded directories
+        before reaching the paths below them.
+
+        Args:
+            relpath (str): Path relative to the template root
+            is_dir (bool, optional): Whether the path is a directory. Defaults to False.
+
+        Returns:
+            bool: True if the path is excluded
+        """
+        if os.sep != "/":
+            relpath = relpath.replace(os.sep, "/")
+        if self._combined:
+            combined = self._dirs if is_dir else self._files
+            return bool(combined and combined.fullmatch(relpath))
+        for expression, negated, directories_only in reversed(self._rules):
+            if directories_only and not is_dir:
+                continue
+            if expression.fullmatch(relpath):
+                return not negated
+        return False
+
+
+@functools.lru_cache(maxsize=32)
+def _compile(path, mtime_ns, size):  # pylint: disable=unused-argument
+    """Compile the default rules and an ignore file; cached by its stat data"""
+    lines = list(DEFAULT_PATTERNS)
+    if path is not None:
+        with open(path, "r", encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+    return IgnoreMatcher(parse_patterns(lines))
+
+
+def load_matcher(template_dir):
+    """Return the ignore rules of a template tree.
+
+    The ``.modmakerignore`` file is compiled again only when it changes.
+
+    Args:
+        template_dir (str): Root directory of the template
+
+    Returns:
+        IgnoreMatcher: Default rules followed by those of the ignore file, if any
+    """
+    path = os.path.join(template_dir, IGNORE_FILE)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return _compile(None, 0, 0)
+    return _compile(path, stat.st_mtime_ns, stat.st_size)
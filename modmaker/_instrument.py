@@ -0,0 +1,140 @@
+"""
+Phase and file instrumentation
+
+Library code marks its phases and the files it writes; observers such as
+the ``--profile`` report subscribe to them::
+
+    with phase("copy", project=name):
+        ...
+        file_done(path, start, written=len(data))
+
+Without observers ``phase`` returns a shared no-op context manager and the
+``observing()`` check lets hot loops skip per-file bookkeeping entirely.
+"""
+
+import contextlib
+import threading
+import time
+from collections import namedtuple
+
+# ``error`` names the exception that ended the phase, None if it succeeded
+PhaseRecord = namedtuple(
+    "PhaseRecord", ["name", "start", "wall", "cpu", "thread", "attrs", "error"], defaults=(None,)
+)
+FileRecord = namedtuple("FileRecord", ["path", "phase", "start", "wall", "read", "written"])
+
+_NULL_PHASE = contextlib.nullcontext()
+_OBSERVERS = []
+_LOCK = threading.Lock()
+_CURRENT = threading.local()
+
+
+class Observer:
+    """Base class of instrumentation observers; every hook is optional"""
+
+    def phase_started(self, name, attrs):
+        """Called when a phase starts, on the thread running it"""
+
+    def phase_finished(self, record):
+        """Called with the PhaseRecord of a finished phase"""
+
+    def file_finished(self, record):
+        """Called with the FileRecord of a file read or written"""
+
+
+def add_observer(observer):
+    """Subscribe an observer to phases and files.
+
+    Args:
+        observer (Observer): Observer to add
+    """
+    global _OBSERVERS  # pylint: disable=global-statement
+    with _LOCK:
+        # Copy on write: emitters iterate over the list without the lock
+        _OBSERVERS = _OBSERVERS + [observer]
+
+
+def remove_observer(observer):
+    """Unsubscribe an observer; unknown observers are ignored.
+
+    Args:
+        observer (Observer): Observer to remove
+    """
+    global _OBSERVERS  # pylint: disable=global-statement
+    with _LOCK:
+        _OBSERVERS = [obs for obs in _OBSERVERS if obs is not observer]
+
+
+def observing():
+    """Return True if any observer is subscribed.
+
+    Returns:
+        bool: Whether phases and files are being recorded
+    """
+    return bool(_OBSERVERS)
+
+
+@contextlib.contextmanager
+def _observed_phase(name, attrs, observers):
+    for observer in observers:
+        observer.phase_started(name, attrs)
+    parent = getattr(_CURRENT, "phase", None)
+    _CURRENT.phase = name
+    start = time.time()
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    error = None
+    try:
+        yield
+    except BaseException as err:
+        error = type(err).__name__
+        raise
+    finally:
+        record = PhaseRecord(
+            name,
+            start,
+            time.perf_counter() - wall,
+            time.thread_time() - cpu,
+            threading.get_ident(),
+            attrs,
+            error,
+        )
+        _CURRENT.phase = parent
+        for observer in observers:
+            observer.phase_finished(record)
+
+
+def phase(name, **attrs):
+    """Time a phase of the work, in wall and CPU time of the running thread.
+
+    Args:
+        name (str): Phase name, such as ``copy``
+        **attrs: Details passed on to observers, such as the project
+
+    Returns:
+        contextlib.AbstractContextManager: Context manager around the phase
+    """
+    observers = _OBSERVERS
+    if not observers:
+        return _NULL_PHASE
+    return _observed_phase(name, attrs, observers)
+
+
+def file_done(path, started, read=0, written=0):
+    """Record a file read or written in the current phase.
+
+    Args:
+        path (str): File path
+        started (float): ``time.perf_counter()`` when work on the file began
+        read (int, optional): Bytes read. Defaults to 0.
+        written (int, optional): Bytes written. Defaults to 0.
+    """
+    observers = _OBSERVERS
+    if not observers:
+        return
+    wall = time.perf_counter() - started
+    record = FileRecord(
+        path, getattr(_CURRENT, "phase", None), time.time() - wall, wall, read, written
+    )
+    for observer in observers:
+        observer.file_finished(record)
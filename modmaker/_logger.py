@@ -2,7 +2,27 @@
 Logging utilities for PyGen
 """
 
+import atexit
+import collections
+import contextlib
+import contextvars
 import logging
+import os
+import threading
+
+from modmaker._exceptions import UsageError
+
+# Loggers in queued mode -> (queue handler, listener, handlers behind the queue)
+_QUEUED = {}
+_QUEUED_LOCK = threading.Lock()
+# Loggers with a project buffer -> ProjectBufferHandler
+_BUFFERED = {}
+# Project whose records are being buffered in the current thread or task
+_PROJECT = contextvars.ContextVar("modmaker_log_project", default=None)
+# Loggers whose handlers write JSON events
+_JSON_FORMAT = set()
+
+LOG_FORMATS = ("text", "json")
 
 
 class PrintMsg:
@@ -24,31 +44,370 @@ class PrintMsg:
     NAMETAG = "{1}{0}{2}".format("modmaker", name_color, rst_color)
 
 
+# Colored prefixes by level number, computed once
+LEVEL_PREFIXES = {
+    logging.CRITICAL: PrintMsg.CRITICAL,
+    logging.ERROR: PrintMsg.ERROR,
+    logging.WARNING: PrintMsg.WARNING,
+    logging.INFO: PrintMsg.INFO,
+    logging.DEBUG: PrintMsg.DEBUG,
+}
+
+
+def _color_loglevel(record):
+    """Return the colored prefix of a record, a ``nametag`` attribute taking precedence"""
+    nametag = getattr(record, "nametag", None)
+    if nametag is not None:
+        return nametag
+    prefix = LEVEL_PREFIXES.get(record.levelno)
+    if prefix is None:
+        prefix = getattr(PrintMsg, record.levelname, "")
+    return prefix
+
+
 class AppFilter(logging.Filter):
     def filter(self, record):
-        if "nametag" in dir(record):
-            record.color_loglevel = record.nametag
-        else:
-            record.color_loglevel = getattr(PrintMsg, record.levelname)
+        record.color_loglevel = _color_loglevel(record)
         return True
 
 
-def init_modmaker_cli_logger(loglevel=None):
+class CliFormatter(logging.Formatter):
+    """Formats records as ``<colored level prefix><message>``
+
+    Equivalent to ``Formatter("%(color_loglevel)s%(message)s")`` behind an
+    ``AppFilter``, without the filter call, the %-style template or the
+    attribute copies of the generic formatter.
+    """
+
+    def format(self, record):
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            message = (message if message[-1:] == "\n" else message + "\n") + record.exc_text
+        if record.stack_info:
+            message = (message if message[-1:] == "\n" else message + "\n") + self.formatStack(
+                record.stack_info
+            )
+        return _color_loglevel(record) + message
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one compact JSON object per line
+
+    Records logged with ``log_event`` carry their event name and fields;
+    other records are reported as ``log`` events::
+
+        {"ts":1700000000.12,"level":"info","event":"project_started","msg":"...","project":"demo"}
+    """
+
+    def __init__(self):
+        super().__init__()
+        import json  # pylint: disable=import-outside-toplevel
+
+        # One shared encoder: no per-call option parsing or circular checks
+        self._encode = json.JSONEncoder(
+            separators=(",", ":"), ensure_ascii=False, check_circular=False, default=str
+        ).encode
+
+    def format(self, record):
+        event = {
+            "ts": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "event": getattr(record, "event", "log"),
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "event_fields", None)
+        if fields:
+            event.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            event["exc"] = record.exc_text
+        return self._encode(event)
+
+
+def set_log_format(log, log_format):
+    """Format the records of a logger as colored text or JSON events.
+
+    Args:
+        log (logging.Logger): Logger whose handlers are switched
+        log_format (str): One of ``LOG_FORMATS``
+
+    Raises:
+        UsageError: For an unknown format
+    """
+    if log_format not in LOG_FORMATS:
+        raise UsageError(f"Unknown log format '{log_format}', expected one of: {', '.join(LOG_FORMATS)}")
+    formatter = JsonFormatter() if log_format == "json" else CliFormatter()
+    for handler in log.handlers:
+        handler.setFormatter(formatter)
+    if log_format == "json":
+        _JSON_FORMAT.add(log)
+    else:
+        _JSON_FORMAT.discard(log)
+
+
+def progress_level():
+    """Return the level of per-file progress events.
+
+    Progress is debug output on a terminal, but part of the event stream
+    that machine consumers read when JSON output is on.
+
+    Returns:
+        int: ``logging.INFO`` with JSON output, ``logging.DEBUG`` otherwise
+    """
+    return logging.INFO if _JSON_FORMAT else logging.DEBUG
+
+
+def log_event(log, level, event, msg, *args, **fields):
+    """Log a record that is also a structured event.
+
+    The message is written as usual in text mode; with JSON output the
+    event name and fields become keys of the JSON object. Events logged
+    inside ``buffered_records`` get the project as a ``project`` field.
+
+    Args:
+        log (logging.Logger): Logger to log to
+        level (int): Log level
+        event (str): Event name, such as ``project_started``
+        msg (str): Message, %-style with ``args``
+        *args: Message arguments
+        **fields: JSON-serializable event fields
+    """
+    if not log.isEnabledFor(level):
+        return
+    project = _PROJECT.get()
+    if project is not None:
+        fields.setdefault("project", project)
+    log.log(level, msg, *args, extra={"event": event, "event_fields": fields})
+
+
+def _make_queue_handler(queue):
+    """Create the handler used by worker threads in queued mode"""
+    from logging.handlers import QueueHandler  # pylint: disable=import-outside-toplevel
+
+    class CliQueueHandler(QueueHandler):
+        """Enqueues records; colors and tracebacks are formatted by the listener"""
+
+        def prepare(self, record):
+            # Merge the arguments now, they may change once the worker moves on
+            record.msg = record.getMessage()
+            record.args = None
+            return record
+
+    return CliQueueHandler(queue)
+
+
+def start_queued_logging(log):
+    """Move the handlers of a logger behind a queue drained by one listener thread.
+
+    Worker threads then only enqueue records, instead of contending for the
+    stream handler lock while a slow terminal or pipe is written.
+
+    Args:
+        log (logging.Logger): Logger to switch to queued mode
+
+    Returns:
+        bool: True if queued mode was started, False if it was already on
+    """
+    import queue  # pylint: disable=import-outside-toplevel
+    from logging.handlers import QueueListener  # pylint: disable=import-outside-toplevel
+
+    with _QUEUED_LOCK:
+        if log in _QUEUED:
+            return False
+        records = queue.SimpleQueue()
+        handlers = list(log.handlers)
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        queue_handler = _make_queue_handler(records)
+        for handler in handlers:
+            log.removeHandler(handler)
+        log.addHandler(queue_handler)
+        _QUEUED[log] = (queue_handler, listener, handlers)
+        listener.start()
+    return True
+
+
+def stop_queued_logging(log):
+    """Write all pending records and put the handlers back on the logger.
+
+    Args:
+        log (logging.Logger): Logger in queued mode
+
+    Returns:
+        bool: True if queued mode was stopped, False if it was not on
+    """
+    with _QUEUED_LOCK:
+        state = _QUEUED.pop(log, None)
+    if state is None:
+        return False
+    queue_handler, listener, handlers = state
+    # stop() enqueues a sentinel behind the pending records and joins the thread
+    listener.stop()
+    log.removeHandler(queue_handler)
+    for handler in handlers:
+        log.addHandler(handler)
+    return True
+
+
+def _stop_all_queued_logging():
+    for log in list(_QUEUED):
+        stop_queued_logging(log)
+
+
+def _restore_handlers_in_child():
+    """Forked processes have no listener thread: write directly again"""
+    global _QUEUED_LOCK  # pylint: disable=global-statement
+    _QUEUED_LOCK = threading.Lock()
+    for log, (queue_handler, _, handlers) in list(_QUEUED.items()):
+        if queue_handler in log.handlers:
+            log.removeHandler(queue_handler)
+            for handler in handlers:
+                log.addHandler(handler)
+        # The queue may also sit behind a project buffer
+        for buffer_handler in _BUFFERED.values():
+            if queue_handler in buffer_handler.targets:
+                buffer_handler.targets.remove(queue_handler)
+                buffer_handler.targets.extend(handlers)
+    _QUEUED.clear()
+
+
+atexit.register(_stop_all_queued_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restore_handlers_in_child)
+
+
+class ProjectBufferHandler(logging.Handler):
+    """Keeps the last records of each project in memory
+
+    Records logged inside ``buffered_records(project)`` are held in a ring of
+    ``capacity`` records and only written, to the handlers the buffer was put
+    in front of, if that project fails. Other records are written directly.
+    """
+
+    def __init__(self, targets, capacity):
+        super().__init__()
+        self.targets = list(targets)
+        self.capacity = capacity
+        self._buffers = {}
+
+    def handle(self, record):
+        # Appending to a deque is thread-safe: no handler lock on the hot path
+        if self.filter(record):
+            self.emit(record)
+        return record
+
+    def emit(self, record):
+        project = _PROJECT.get()
+        if project is None:
+            self._forward(record)
+            return
+        buffer = self._buffers.get(project)
+        if buffer is None:
+            buffer = self._buffers.setdefault(project, collections.deque(maxlen=self.capacity))
+        buffer.append(record)
+
+    def _forward(self, record):
+        for target in self.targets:
+            if record.levelno >= target.level:
+                target.handle(record)
+
+    def flush_project(self, project):
+        """Write the buffered records of a project and forget them"""
+        for record in self._buffers.pop(project, ()):
+            self._forward(record)
+
+    def discard_project(self, project):
+        """Forget the buffered records of a project"""
+        self._buffers.pop(project, None)
+
+
+def start_log_buffer(log, capacity):
+    """Buffer the records of each project in front of the logger's handlers.
+
+    Args:
+        log (logging.Logger): Logger whose handlers receive flushed records
+        capacity (int): Records kept per project
+
+    Returns:
+        bool: True if buffering was started, False if it was already on
+    """
+    if log in _BUFFERED:
+        return False
+    handlers = list(log.handlers)
+    buffer_handler = ProjectBufferHandler(handlers, capacity)
+    for handler in handlers:
+        log.removeHandler(handler)
+    log.addHandler(buffer_handler)
+    _BUFFERED[log] = buffer_handler
+    return True
+
+
+def stop_log_buffer(log):
+    """Put the logger's handlers back, dropping records still buffered.
+
+    Args:
+        log (logging.Logger): Logger with a project buffer
+
+    Returns:
+        bool: True if buffering was stopped, False if it was not on
+    """
+    buffer_handler = _BUFFERED.pop(log, None)
+    if buffer_handler is None:
+        return False
+    log.removeHandler(buffer_handler)
+    for handler in buffer_handler.targets:
+        log.addHandler(handler)
+    return True
+
+
+@contextlib.contextmanager
+def buffered_records(project):
+    """Buffer the records logged while generating a project.
+
+    Without ``start_log_buffer`` records are written as usual. With it, the
+    project's records are written only if the block raises an exception or
+    exits with a non-zero code; otherwise they are dropped.
+
+    Args:
+        project (str): Project the records belong to
+    """
+    token = _PROJECT.set(project)
+    failed = True
+    try:
+        yield
+        failed = False
+    except SystemExit as err:
+        failed = err.code not in (None, 0)
+        raise
+    finally:
+        _PROJECT.reset(token)
+        for buffer_handler in list(_BUFFERED.values()):
+            if failed:
+                buffer_handler.flush_project(project)
+            else:
+                buffer_handler.discard_project(project)
+
+
+def init_modmaker_cli_logger(loglevel=None, queued=False):
     """Initialize the PyGen CLI logger with color formatting
     
     Args:
         loglevel (str, optional): Log level (DEBUG, INFO, etc). Defaults to None.
+        queued (bool, optional): Write records from a listener thread, see
+            start_queued_logging. Defaults to False.
         
     Returns:
         logging.Logger: Configured logger instance
     """
     log = logging.getLogger(__package__)
     cli_handler = logging.StreamHandler()
-    formatter = logging.Formatter("%(color_loglevel)s%(message)s")
-    cli_handler.setFormatter(formatter)
-    cli_handler.addFilter(AppFilter())
+    cli_handler.setFormatter(CliFormatter())
     log.addHandler(cli_handler)
     if loglevel:
         loglevel = getattr(logging, loglevel.upper(), 20)
         log.setLevel(loglevel)
+    if queued:
+        start_queued_logging(log)
     return log
@@ -0,0 +1,176 @@
+"""
+Memory usage report (``--memory-report``)
+
+Traces allocations with ``tracemalloc`` while the run is observed and takes
+a snapshot at every phase boundary reported through ``_instrument``. The
+difference between the snapshots at the start and end of a phase is what
+the phase allocated. Nothing is traced unless the report is requested.
+"""
+
+import json
+import sys
+import threading
+import tracemalloc
+
+from modmaker._instrument import Observer
+
+# Frames kept per allocation; one is enough to name the allocating line
+TRACE_FRAMES = 1
+TOP_SITES = 10
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def peak_rss():
+    """Return the peak resident set size of the process.
+
+    Returns:
+        int: Peak RSS in bytes, or None where ``resource`` is unavailable
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+class MemoryProfiler(Observer):
+    """Collects allocations per phase and peak memory per project
+
+    Allocations are the memory a phase still holds when it ends. A project is
+    measured from the start of the first phase carrying its ``project``
+    attribute: its traced peak, and how far that peak rose above the memory
+    held when the project started. ``tracemalloc`` keeps a single peak for
+    the whole process, so the peaks of projects generated in parallel
+    (``--jobs``) are reported as unavailable (None).
+    """
+
+    def __init__(self, top=TOP_SITES):
+        self.top = top
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phases = {}
+        self._projects = {}
+        self._sites = {}
+        # Projects being measured: id of their state -> [baseline, overlapped]
+        self._measuring = {}
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(TRACE_FRAMES)
+
+    def stop(self):
+        """Stop tracing, if this profiler started it"""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+
+    def _start_project(self, project, depth):
+        """Start measuring the peak of a project on this thread"""
+        with self._lock:
+            overlapped = bool(self._measuring) or not hasattr(tracemalloc, "reset_peak")
+            if overlapped:
+                for state in self._measuring.values():
+                    state[1] = True
+            else:
+                tracemalloc.reset_peak()
+            state = [tracemalloc.get_traced_memory()[0], overlapped]
+            self._measuring[id(state)] = state
+        self._local.project = (project, depth, state)
+
+    def _finish_project(self):
+        """Record the peak of the project measured on this thread"""
+        project, _, state = self._local.project
+        self._local.project = None
+        _, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            del self._measuring[id(state)]
+            baseline, overlapped = state
+            self._projects[project] = (None, None) if overlapped else (peak, peak - baseline)
+
+    def phase_started(self, name, attrs):
+        stack = getattr(self._local, "snapshots", None)
+        if stack is None:
+            stack = self._local.snapshots = []
+        if "project" in attrs and getattr(self._local, "project", None) is None:
+            self._start_project(attrs["project"], len(stack))
+        stack.append(_snapshot())
+
+    def phase_finished(self, record):
+        stack = getattr(self._local, "snapshots", None)
+        if not stack:
+            return
+        before = stack.pop()
+        measured = getattr(self._local, "project", None)
+        if measured is not None and measured[1] == len(stack):
+            # Read the peak before the snapshot allocates
+            self._finish_project()
+        after = _snapshot()
+        stats = after.compare_to(before, "lineno")
+        allocated = sum(stat.size_diff for stat in stats)
+        with self._lock:
+            totals = self._phases.setdefault(record.name, [0, 0])
+            totals[0] += 1
+            totals[1] += allocated
+            # Nested phases would count an allocation once per level: only
+            # the outermost phases attribute sites
+            if stack:
+                return
+            for stat in stats:
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    site = f"{frame.filename}:{frame.lineno}"
+                    size, count = self._sites.get(site, (0, 0))
+                    self._sites[site] = (size + stat.size_diff, count + max(stat.count_diff, 0))
+
+    def report(self):
+        """Return the memory report collected so far.
+
+        Returns:
+            dict: JSON-serializable report
+        """
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        with self._lock:
+            sites = sorted(self._sites.items(), key=lambda item: item[1][0], reverse=True)
+            return {
+                "peak_rss": peak_rss(),
+                "traced_current": current,
+                "traced_peak": peak,
+                "projects": [
+                    {"name": name, "traced_peak": project_peak, "peak_growth": growth}
+                    for name, (project_peak, growth) in self._projects.items()
+                ],
+                "phases": [
+                    {"name": name, "calls": calls, "allocated": allocated}
+                    for name, (calls, allocated) in self._phases.items()
+                ],
+                "top_sites": [
+                    {"site": site, "size": size, "count": count}
+                    for site, (size, count) in sites[: self.top]
+                ],
+            }
+
+
+def write_report(report, path):
+    """Write a memory report as JSON.
+
+    Args:
+        report (dict): Report returned by ``MemoryProfiler.report``
+        path (str): File to write, ``-`` for standard output
+    """
+    text = json.dumps(report, indent=2) + "\n"
+    if path == "-":
+        sys.stdout.write(text)
+    else:
+        with open(path, "w") as f:
+            f.write(text)
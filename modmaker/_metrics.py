@@ -0,0 +1,232 @@
+"""
+Prometheus metrics (``--metrics-file`` and ``--metrics-port``)
+
+Counts projects, files and bytes, and the latency of every phase, from the
+phases and files reported through ``_instrument``. The metrics are written
+in the Prometheus text exposition format, to a file at the end of a batch
+run (for the node exporter textfile collector) or served over HTTP while a
+long-running session such as ``modmaker shell`` is open. Only the standard
+library is used, and nothing is loaded unless metrics are requested.
+"""
+
+import os
+import threading
+
+from modmaker._cache import write_text_atomic
+from modmaker._instrument import Observer
+
+PREFIX = "modmaker"
+PROJECT_PHASE = "create_project"
+# Latency buckets in seconds, as the Prometheus client libraries use
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    """Cumulative bucket counts, sum and count of observed values"""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            cumulative += count
+            yield f"{name}_bucket", labels + (("le", _number(bound)),), cumulative
+        yield f"{name}_bucket", labels + (("le", "+Inf"),), self.count
+        yield f"{name}_sum", labels, self.total
+        yield f"{name}_count", labels, self.count
+
+
+class MetricsCollector(Observer):
+    """Aggregates run metrics from phases and files
+
+    Queue depth counts fan-out targets that are waiting for a worker: they
+    join the queue when their ``fan_out`` phase starts and leave it when
+    their own ``target`` phase starts. Targets run on a process pool, and
+    the phases inside them, are not seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._projects = {"created": 0, "failed": 0}
+        self._files = {}
+        self._bytes = {"read": 0, "written": 0}
+        self._phases = {}
+        self._file_seconds = {}
+        self._in_progress = 0
+        self._queued = 0
+        self._fan_outs = 0
+
+    def phase_started(self, name, attrs):
+        with self._lock:
+            if name == PROJECT_PHASE:
+                self._in_progress += 1
+            elif name == "fan_out":
+                self._fan_outs += 1
+                self._queued += attrs.get("targets", 0)
+            elif name == "target":
+                self._queued = max(0, self._queued - 1)
+
+    def phase_finished(self, record):
+        with self._lock:
+            self._phases.setdefault(record.name, _Histogram()).observe(record.wall)
+            if record.name == PROJECT_PHASE:
+                self._in_progress = max(0, self._in_progress - 1)
+                self._projects["failed" if record.error else "created"] += 1
+            elif record.name == "fan_out":
+                self._fan_outs = max(0, self._fan_outs - 1)
+                if not self._fan_outs:
+                    # Targets the phases did not report, such as async ones
+                    self._queued = 0
+
+    def file_finished(self, record):
+        phase_name = record.phase or ""
+        with self._lock:
+            # Files only read, such as templates being rendered, are not output
+            if record.written:
+                self._files[phase_name] = self._files.get(phase_name, 0) + 1
+            self._bytes["read"] += record.read
+            self._bytes["written"] += record.written
+            self._file_seconds.setdefault(phase_name, _Histogram()).observe(record.wall)
+
+    def _families(self):
+        """Yield ``(name, type, help, samples)`` per metric family"""
+        yield (
+            f"{PREFIX}_projects_total",
+            "counter",
+            "Projects generated, by result",
+            [(f"{PREFIX}_projects_total", (("result", result),), count)
+             for result, count in self._projects.items()],
+        )
+        yield (
+            f"{PREFIX}_files_rendered_total",
+            "counter",
+            "Files written into projects, by the phase that wrote them",
+            [(f"{PREFIX}_files_rendered_total", (("phase", name),), count)
+             for name, count in sorted(self._files.items())],
+        )
+        yield (
+            f"{PREFIX}_bytes_total",
+            "counter",
+            "Bytes read from and written to project files",
+            [(f"{PREFIX}_bytes_total", (("direction", direction),), count)
+             for direction, count in self._bytes.items()],
+        )
+        yield (
+            f"{PREFIX}_phase_duration_seconds",
+            "histogram",
+            f"Wall time of each phase; {PROJECT_PHASE} is the latency of a whole project",
+            [sample for name, histogram in sorted(self._phases.items())
+             for sample in histogram.samples(f"{PREFIX}_phase_duration_seconds", (("phase", name),))],
+        )
+        yield (
+            f"{PREFIX}_file_duration_seconds",
+            "histogram",
+            "Wall time of writing one project file, by phase",
+            [sample for name, histogram in sorted(self._file_seconds.items())
+             for sample in histogram.samples(f"{PREFIX}_file_duration_seconds", (("phase", name),))],
+        )
+        yield (
+            f"{PREFIX}_projects_in_progress",
+            "gauge",
+            "Projects being generated",
+            [(f"{PREFIX}_projects_in_progress", (), self._in_progress)],
+        )
+        yield (
+            f"{PREFIX}_queue_depth",
+            "gauge",
+            "Fan-out targets waiting for a worker",
+            [(f"{PREFIX}_queue_depth", (), self._queued)],
+        )
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        with self._lock:
+            for name, kind, help_text, samples in self._families():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for sample_name, labels, value in samples:
+                    lines.append(f"{sample_name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(collector, path):
+    """Write the metrics to a file, replacing it atomically.
+
+    The node exporter textfile collector must never read a partial file.
+
+    Args:
+        collector (MetricsCollector): Metrics to write
+        path (str): File to write, usually ending in ``.prom``
+    """
+    write_text_atomic(os.path.abspath(path), collector.render())
+
+
+def serve(collector, port, host="127.0.0.1"):
+    """Serve the metrics over HTTP on a background thread.
+
+    Args:
+        collector (MetricsCollector): Metrics to serve
+        port (int): Port to listen on, 0 for any free port
+        host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+
+    Returns:
+        http.server.ThreadingHTTPServer: Running server; call ``shutdown()`` to stop it
+    """
+    # Only loaded when serving
+    import http.server  # pylint: disable=import-outside-toplevel
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        """Answers GET /metrics"""
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = collector.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            """Keep scrapes out of the CLI output"""
+
+    server = http.server.ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="modmaker-metrics", daemon=True)
+    thread.start()
+    return server
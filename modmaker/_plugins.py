@@ -0,0 +1,141 @@
+"""
+Entry-point plugin discovery for modmaker
+
+Third-party packages register command classes in the ``modmaker.commands``
+entry-point group::
+
+    [project.entry-points."modmaker.commands"]
+    deploy = "mypackage.commands:Deploy"
+
+Scanning the installed distributions is slow on large environments, so the
+discovered index is cached on disk, keyed by the mtimes of the
+site-packages directories. Plugins are only imported when their command is
+used.
+"""
+
+import hashlib
+import importlib
+import logging
+import os
+import site
+import sys
+from collections import namedtuple
+
+from modmaker._cache import cache_path, read_json, write_json
+
+LOG = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "modmaker.commands"
+
+PluginEntry = namedtuple("PluginEntry", ["name", "value", "distribution"])
+
+
+def site_packages_dirs():
+    """Return the directories distributions are installed into.
+
+    Returns:
+        list: The site-packages directories of the interpreter and the user,
+            and any other ``site-packages`` or ``dist-packages`` directory on
+            ``sys.path``, without duplicates
+    """
+    dirs = list(getattr(site, "getsitepackages", lambda: [])())
+    if site.ENABLE_USER_SITE:
+        dirs.append(site.getusersitepackages())
+    dirs.extend(
+        path for path in sys.path if os.path.basename(path) in ("site-packages", "dist-packages")
+    )
+    return list(dict.fromkeys(dirs))
+
+
+def site_packages_key(paths=None):
+    """Compute a key that changes whenever distributions are (un)installed.
+
+    Installing or removing a distribution adds or removes a ``.dist-info``
+    directory, which updates the mtime of the directory holding it. Other
+    ``sys.path`` entries, such as the current directory, are left out: files
+    written there do not change the installed plugins.
+
+    Args:
+        paths (list, optional): Directories to consider. Defaults to site_packages_dirs().
+
+    Returns:
+        str: Hex digest of the directories and their mtimes
+    """
+    digest = hashlib.sha1()
+    for path in paths if paths is not None else site_packages_dirs():
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        digest.update(f"{path}\0{mtime}\0".encode())
+    return digest.hexdigest()
+
+
+def _entry_points(group):
+    """Return the entry points of a group across Python versions"""
+    from importlib import metadata  # pylint: disable=import-outside-toplevel
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return list(entry_points.select(group=group))
+    return list(entry_points.get(group, []))
+
+
+def discover_plugins(group=ENTRY_POINT_GROUP):
+    """Scan installed distributions for command plugins.
+
+    Args:
+        group (str, optional): Entry-point group. Defaults to "modmaker.commands".
+
+    Returns:
+        list: PluginEntry for every registered command, sorted by name
+    """
+    plugins = {}
+    for entry_point in _entry_points(group):
+        dist = getattr(entry_point, "dist", None)
+        name = entry_point.name.lower()
+        if name in plugins:
+            LOG.warning("Duplicate modmaker plugin '%s' ignored (%s)", name, entry_point.value)
+            continue
+        plugins[name] = PluginEntry(name, entry_point.value, getattr(dist, "name", None))
+    return [plugins[name] for name in sorted(plugins)]
+
+
+def load_plugin_index(group=ENTRY_POINT_GROUP, paths=None):
+    """Return the plugin index, from the cache when the environment is unchanged.
+
+    Args:
+        group (str, optional): Entry-point group. Defaults to "modmaker.commands".
+        paths (list, optional): Directories used for the cache key. Defaults to site_packages_dirs().
+
+    Returns:
+        tuple: (key, list of PluginEntry)
+    """
+    key = site_packages_key(paths)
+    path = cache_path("plugins", f"{group}.json")
+    cached = read_json(path, default={})
+    if cached.get("key") == key:
+        return key, [PluginEntry(*entry) for entry in cached.get("plugins", [])]
+    LOG.debug("Plugin index for %s is stale, scanning entry points", group)
+    plugins = discover_plugins(group)
+    try:
+        write_json(path, {"key": key, "plugins": [list(entry) for entry in plugins]})
+    except OSError:
+        LOG.debug("Unable to write plugin index", exc_info=True)
+    return key, plugins
+
+
+def load_plugin(entry):
+    """Import the command class of a plugin.
+
+    Args:
+        entry (PluginEntry): Plugin to load
+
+    Returns:
+        type: The command class
+    """
+    module_name, _, attrs = entry.value.split("[")[0].partition(":")
+    obj = importlib.import_module(module_name.strip())
+    for attr in attrs.strip().split(".") if attrs.strip() else []:
+        obj = getattr(obj, attr)
+    return obj
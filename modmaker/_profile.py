@@ -0,0 +1,108 @@
+"""
+Phase timing profile (``--profile``)
+
+Collects the phases and files reported through ``_instrument`` and writes
+a JSON report of where the time went, plus an optional table of the
+slowest files.
+"""
+
+import json
+import sys
+import threading
+import time
+
+from modmaker._instrument import Observer
+
+
+class Profiler(Observer):
+    """Aggregates phase and file timings of one run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._files = []
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def phase_finished(self, record):
+        with self._lock:
+            totals = self._phases.setdefault(record.name, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += record.wall
+            totals[2] += record.cpu
+
+    def file_finished(self, record):
+        with self._lock:
+            self._files.append(record)
+
+    def report(self):
+        """Return the profile collected so far.
+
+        Phase times are summed over all calls, including calls on parallel
+        workers, so they can exceed the total wall time of the run.
+
+        Returns:
+            dict: JSON-serializable report
+        """
+        with self._lock:
+            phases = [
+                {"name": name, "calls": calls, "wall": round(wall, 6), "cpu": round(cpu, 6)}
+                for name, (calls, wall, cpu) in self._phases.items()
+            ]
+            files = [
+                {
+                    "path": record.path,
+                    "phase": record.phase,
+                    "wall": round(record.wall, 6),
+                    "read": record.read,
+                    "written": record.written,
+                }
+                for record in self._files
+            ]
+        return {
+            "wall": round(time.perf_counter() - self._wall, 6),
+            "cpu": round(time.process_time() - self._cpu, 6),
+            "phases": phases,
+            "files": files,
+            "bytes_read": sum(entry["read"] for entry in files),
+            "bytes_written": sum(entry["written"] for entry in files),
+        }
+
+
+def slowest_files_table(report, top):
+    """Format the slowest files of a report as a text table.
+
+    Args:
+        report (dict): Report returned by ``Profiler.report``
+        top (int): Number of files to list
+
+    Returns:
+        str: Table with one line per file, slowest first
+    """
+    files = sorted(report["files"], key=lambda entry: entry["wall"], reverse=True)[:top]
+    lines = ["{:>10}  {:>10}  {:>10}  {:<20}  {}".format("ms", "read", "written", "phase", "path")]
+    for entry in files:
+        lines.append(
+            "{:>10.3f}  {:>10}  {:>10}  {:<20}  {}".format(
+                entry["wall"] * 1000, entry["read"], entry["written"], entry["phase"] or "", entry["path"]
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report, path, top=None):
+    """Write a profile as JSON, and the slowest files table if requested.
+
+    Args:
+        report (dict): Report returned by ``Profiler.report``
+        path (str): JSON file to write, ``-`` for standard output
+        top (int, optional): Also print the N slowest files to stderr. Defaults to None.
+    """
+    text = json.dumps(report, indent=2) + "\n"
+    if path == "-":
+        sys.stdout.write(text)
+    else:
+        with open(path, "w") as f:
+            f.write(text)
+    if top:
+        sys.stderr.write(slowest_files_table(report, top))
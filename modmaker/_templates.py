@@ -0,0 +1,168 @@
+"""
+Template loading utilities for modmaker
+
+Template trees are read into memory once and kept there, so repeated
+project generation in the same process (for example from ``modmaker shell``)
+only re-reads the template files that changed on disk.
+
+When modmaker runs from a zipapp there is no template directory on disk;
+the templates are packed into a single ``templates.blob`` in the archive and
+served from there instead.
+"""
+
+import functools
+import logging
+import marshal
+import os
+import pkgutil
+import threading
+from collections import namedtuple
+
+from modmaker._common_utils import scan_tree
+from modmaker._ignore import load_matcher
+
+LOG = logging.getLogger(__name__)
+
+TemplateFile = namedtuple("TemplateFile", ["relpath", "data", "mode", "mtime_ns", "size"])
+TemplateTree = namedtuple("TemplateTree", ["root", "dirs", "files"])
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = "templates"
+PACKED_TEMPLATES = "templates.blob"
+
+
+def pack_templates(package_dir=PACKAGE_DIR):
+    """Pack every template under ``<package_dir>/templates`` into one blob.
+
+    The blob uses the ``marshal`` format of the running interpreter, like the
+    bytecode it is bundled with.
+
+    Args:
+        package_dir (str, optional): Package directory. Defaults to the modmaker package.
+
+    Returns:
+        bytes: Packed templates, keyed by their path relative to the package
+    """
+    packed = {}
+    templates_dir = os.path.join(package_dir, TEMPLATES_DIR)
+    cache = TemplateCache()
+    for name in sorted(os.listdir(templates_dir)):
+        if not os.path.isdir(os.path.join(templates_dir, name)) or name == "__pycache__":
+            continue
+        tree = cache.load(os.path.join(templates_dir, name))
+        packed[f"{TEMPLATES_DIR}/{name}"] = (
+            [d.replace(os.sep, "/") for d in tree.dirs],
+            [(f.relpath.replace(os.sep, "/"), f.mode, f.data) for f in tree.files],
+        )
+    return marshal.dumps(packed)
+
+
+@functools.lru_cache(maxsize=None)
+def packed_templates():
+    """Return the templates packed into the running zipapp.
+
+    Returns:
+        dict: Template path relative to the package -> TemplateTree,
+            empty when modmaker runs from a regular installation
+    """
+    try:
+        data = pkgutil.get_data(__name__.rpartition(".")[0] or __name__, PACKED_TEMPLATES)
+    except OSError:
+        return {}
+    if data is None:
+        return {}
+    trees = {}
+    for name, (dirs, files) in marshal.loads(data).items():
+        root = os.path.join(PACKAGE_DIR, *name.split("/"))
+        trees[os.path.normpath(root)] = TemplateTree(
+            root,
+            [os.path.normpath(d) for d in dirs],
+            [TemplateFile(os.path.normpath(p), d, mode, 0, len(d)) for p, mode, d in files],
+        )
+    return trees
+
+
+class TemplateCache:
+    """In-memory cache of template trees, refreshed from disk by stat data"""
+
+    def __init__(self):
+        self._trees = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exists(template_dir):
+        """Check if a template exists on disk or in the packed templates.
+
+        Args:
+            template_dir (str): Root directory of the template
+
+        Returns:
+            bool: True if the template can be loaded
+        """
+        template_dir = os.path.abspath(template_dir)
+        return os.path.isdir(template_dir) or os.path.normpath(template_dir) in packed_templates()
+
+    def load(self, template_dir):
+        """Load a template tree, re-reading only the files that changed.
+
+        The tree is scanned once by ``scan_tree``. Paths excluded by the
+        ``.modmakerignore`` rules are skipped, and excluded directories are
+        not walked.
+
+        Args:
+            template_dir (str): Root directory of the template
+
+        Returns:
+            TemplateTree: Directories and files of the template, sorted by path
+        """
+        template_dir = os.path.abspath(template_dir)
+        if not os.path.isdir(template_dir):
+            packed = packed_templates().get(os.path.normpath(template_dir))
+            if packed is not None:
+                return packed
+        with self._lock:
+            cached = self._trees.get(template_dir, {})
+            dirs = []
+            files = {}
+            for entry in scan_tree(template_dir, load_matcher(template_dir)):
+                if entry.is_dir:
+                    dirs.append(entry.relpath)
+                else:
+                    files[entry.relpath] = self._load_file(
+                        os.path.join(template_dir, entry.relpath), entry, cached.get(entry.relpath)
+                    )
+            self._trees[template_dir] = files
+        return TemplateTree(
+            template_dir, dirs, [files[relpath] for relpath in sorted(files)]
+        )
+
+    def clear(self):
+        """Drop all cached template trees"""
+        with self._lock:
+            self._trees.clear()
+
+    @staticmethod
+    def _load_file(path, entry, cached):
+        """Return the cached entry for a file, or re-read it if it changed.
+
+        Args:
+            path (str): Absolute path of the file
+            entry (TreeEntry): Scanned entry of the file, with its stat data
+            cached (TemplateFile): Previously loaded entry, if any
+
+        Returns:
+            TemplateFile: Up-to-date entry for the file
+        """
+        if (
+            cached is not None
+            and cached.mtime_ns == entry.mtime_ns
+            and cached.size == entry.size
+        ):
+            return cached
+        LOG.debug("Loading template file %s", entry.relpath)
+        with open(path, "rb") as f:
+            data = f.read()
+        return TemplateFile(entry.relpath, data, entry.mode, entry.mtime_ns, entry.size)
+
+
+TEMPLATE_CACHE = TemplateCache()
@@ -0,0 +1,149 @@
+"""
+Background update check for modmaker
+
+The latest released version is fetched from the package index on a daemon
+thread, so the check does not delay a command. Daemon threads are killed
+when the interpreter exits, so a run ending before the fetch waits for it
+at exit, at most ``EXIT_WAIT`` seconds after the check started. The result
+is cached on disk with a TTL once the fetch completes: at most one request
+is made per TTL, and a newer version found by a previous run is reported
+from the cache without touching the network. A fetch cut short at exit is
+not recorded, so the next run tries again.
+"""
+
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from modmaker._cache import cache_path, read_json, write_json
+
+LOG = logging.getLogger(__name__)
+
+INDEX_URL_ENV_VAR = "MODMAKER_INDEX_URL"
+DISABLE_ENV_VAR = "MODMAKER_NO_UPDATE_CHECK"
+DEFAULT_INDEX_URL = "https://pypi.org/pypi/{name}/json"
+UPDATE_TTL = 24 * 60 * 60
+# Longest time a run waits at exit for a check still in flight
+EXIT_WAIT = 1.0
+
+
+def index_url(name):
+    """Return the package index URL queried for the latest version.
+
+    ``MODMAKER_INDEX_URL`` overrides the public PyPI JSON API; ``{name}`` in
+    it is replaced by the package name.
+
+    Args:
+        name (str): Package name
+
+    Returns:
+        str: URL of the package's JSON document
+    """
+    return os.environ.get(INDEX_URL_ENV_VAR, DEFAULT_INDEX_URL).format(name=name)
+
+
+def _version_tuple(version):
+    """Return the leading numeric release parts of a version, ``(0,)`` if none"""
+    match = re.match(r"\d+(\.\d+)*", version or "")
+    return tuple(int(part) for part in match.group(0).split(".")) if match else (0,)
+
+
+def is_newer(latest, installed):
+    """Check if a version is newer than the installed one.
+
+    Args:
+        latest (str): Version from the index
+        installed (str): Installed version
+
+    Returns:
+        bool: True if ``latest`` is a higher release
+    """
+    return _version_tuple(latest) > _version_tuple(installed)
+
+
+def update_check_enabled(quiet=False, stream=None):
+    """Decide whether an update check should run at all.
+
+    The check is skipped in quiet mode, in batch mode (stderr is not a
+    terminal) and when ``MODMAKER_NO_UPDATE_CHECK`` is set.
+
+    Args:
+        quiet (bool, optional): Whether --quiet was given. Defaults to False.
+        stream (file, optional): Stream notices are written to. Defaults to sys.stderr.
+
+    Returns:
+        bool: True if the check should run
+    """
+    if quiet or os.environ.get(DISABLE_ENV_VAR):
+        return False
+    stream = stream if stream is not None else sys.stderr
+    return bool(getattr(stream, "isatty", lambda: False)())
+
+
+def _fetch_latest(fetch, url, path, checked, previous):
+    """Fetch the latest version and store it with the time of the check
+
+    A failed fetch is recorded too, keeping the previous result, so an
+    unreachable index is not queried again before the TTL expires.
+    """
+    try:
+        latest = fetch(url)
+    except Exception:  # pylint: disable=broad-except
+        LOG.debug("Update check against %s failed", url, exc_info=True)
+        latest = previous
+    try:
+        write_json(path, {"checked": checked, "latest": latest, "url": url})
+    except OSError:
+        LOG.debug("Unable to write update check cache", exc_info=True)
+
+
+def _wait_at_exit(thread, deadline):
+    """Give a check still in flight until its deadline to complete"""
+    thread.join(max(0.0, deadline - time.monotonic()))
+
+
+def check_for_update(name, installed, fetch, ttl=UPDATE_TTL, now=None):
+    """Report a cached newer version and refresh the cache in the background.
+
+    Args:
+        name (str): Package name
+        installed (str): Installed version
+        fetch (Callable): Returns the latest version given the index URL
+        ttl (int, optional): Seconds between two index requests. Defaults to one day.
+        now (float, optional): Current time, for tests. Defaults to time.time().
+
+    Returns:
+        threading.Thread: The started background check, or None if the cache is fresh
+    """
+    now = time.time() if now is None else now
+    url = index_url(name)
+    path = cache_path("update", f"{name}.json")
+    cached = read_json(path, default={})
+    if not isinstance(cached, dict):
+        cached = {}
+    latest = cached.get("latest")
+    if latest and is_newer(latest, installed):
+        LOG.warning(
+            "A newer version of %s is available: %s (installed: %s). "
+            "Upgrade with 'pip install --upgrade %s'",
+            name,
+            latest,
+            installed,
+            name,
+        )
+    checked = cached.get("checked", 0)
+    if cached.get("url") == url and isinstance(checked, (int, float)) and 0 <= now - checked < ttl:
+        return None
+    thread = threading.Thread(
+        target=_fetch_latest,
+        args=(fetch, url, path, now, latest),
+        name=f"{name}-update-check",
+        daemon=True,
+    )
+    thread.start()
+    atexit.register(_wait_at_exit, thread, time.monotonic() + EXIT_WAIT)
+    return thread
@@ -0,0 +1,8 @@
+"""
+Version of the modmaker package
+
+Rewritten by setup.py with the distribution version when the package is
+built; keep in sync with pyproject.toml (see scripts/sync_versions.py).
+"""
+
+__version__ = "0.1.10"
@@ -0,0 +1,7 @@
+"""
+Benchmarks for modmaker
+
+Each module can be run on its own, for example::
+
+    python -m modmaker.benchmarks.cold_start
+"""
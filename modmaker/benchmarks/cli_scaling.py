@@ -0,0 +1,281 @@
+"""
+CliCore benchmark: scaling with the size of the command tree
+
+Generates ``_cli_modules``-style packages with N commands of M subcommands
+taking K parameters each, and times every start-up stage of CliCore on its
+own: collecting the command classes (``_get_plugin_modules``), the
+introspection in ``_build_args``, ``_build_parser``, ``parse`` and ``run``.
+For each stage, a power law fitted over the tree sizes gives its scaling
+exponent; ``--check`` fails when a stage grows faster than linearly::
+
+    python -m modmaker.benchmarks.cli_scaling --commands 25 50 100 200 400 --check
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from modmaker._cli_core import CliCore
+from modmaker._instrument import add_observer, remove_observer
+from modmaker._profile import Profiler
+
+DEFAULT_COMMANDS = (25, 50, 100, 200, 400)
+DEFAULT_SUBCOMMANDS = (5,)
+DEFAULT_PARAMS = (4,)
+# Phases reported by CliCore.__init__ -> stage name
+INIT_STAGES = {
+    "plugin_discovery": "_get_plugin_modules",
+    "build_args": "_build_args",
+    "build_parser": "_build_parser",
+}
+STAGES = ("import",) + tuple(INIT_STAGES.values()) + ("parse", "run")
+# Exponent above which a stage is reported as superlinear; timing noise
+# keeps linear stages somewhat above 1.0
+MAX_EXPONENT = 1.3
+# Optional parameters get a short flag from their first letter, which must
+# be unique within a command; "h" is taken by --help
+OPTION_LETTERS = "abcdefgijklmnopqrstuvwxyz"
+
+
+def _command_source(index, subcommands, params):
+    """Return the source of one command module"""
+    options = [f"{letter}_value" for letter in OPTION_LETTERS[: max(0, params - 1)]]
+    signature = ", ".join(["self", "name: str"] + [f"{option}: int = 0" for option in options])
+    docs = "\n".join(
+        ["        :param name: Target of the command"]
+        + [f"        :param {option}: Option {option} of the command" for option in options]
+    )
+    returned = " + ".join(["len(name)"] + options)
+    lines = [
+        '"""',
+        f"Synthetic command {index}",
+        '"""',
+        "",
+        "",
+        f"class Command{index:04d}:",
+        '    """',
+        f"    Command number {index}",
+        '    """',
+        "",
+        f'    CLINAME = "cmd{index:04d}"',
+        "",
+        "    def __init__(self):",
+        "        pass",
+    ]
+    for sub in range(subcommands):
+        lines += [
+            "",
+            f"    def sub{sub:03d}({signature}):",
+            '        """',
+            f"        Subcommand {sub} of command {index}",
+            "",
+            docs,
+            '        """',
+            f"        return {returned}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def generate_package(root, package, commands, subcommands, params):
+    """Write a command package with a synthetic command tree.
+
+    Args:
+        root (str): Directory to write the package into
+        package (str): Package name
+        commands (int): Number of commands
+        subcommands (int): Subcommands per command
+        params (int): Parameters per subcommand, at most 26
+
+    Returns:
+        str: Package directory
+    """
+    if params > len(OPTION_LETTERS) + 1:
+        raise ValueError(f"At most {len(OPTION_LETTERS) + 1} parameters per subcommand")
+    package_dir = os.path.join(root, package)
+    os.makedirs(package_dir)
+    imports = []
+    for index in range(commands):
+        with open(os.path.join(package_dir, f"cmd{index:04d}.py"), "w") as f:
+            f.write(_command_source(index, subcommands, params))
+        imports.append(f"from {package}.cmd{index:04d} import Command{index:04d}")
+    with open(os.path.join(package_dir, "__init__.py"), "w") as f:
+        f.write('"""\nSynthetic commands\n"""\n\n' + "\n".join(imports) + "\n")
+    return package_dir
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def run_case(root, commands, subcommands, params, runs=5):
+    """Time each CliCore stage on one command tree.
+
+    Args:
+        root (str): Scratch directory, put on ``sys.path``
+        commands (int): Number of commands
+        subcommands (int): Subcommands per command
+        params (int): Parameters per subcommand
+        runs (int, optional): CliCore instances built; the fastest run counts. Defaults to 5.
+
+    Returns:
+        dict: Tree size and stage name -> seconds
+    """
+    package = f"mm_bench_cli_{commands}_{subcommands}_{params}"
+    generate_package(root, package, commands, subcommands, params)
+    module_package, import_time = _timed(lambda: importlib.import_module(package))
+    argv = [f"cmd{commands - 1:04d}", f"sub{subcommands - 1:03d}", "target"]
+    argv += [f"--{letter}-value=1" for letter in OPTION_LETTERS[: max(0, params - 1)]]
+    best = {"import": import_time}
+    try:
+        for _ in range(max(1, runs)):
+            profiler = Profiler()
+            add_observer(profiler)
+            try:
+                cli = CliCore("bench", module_package, "Synthetic CLI", "1.0")
+            finally:
+                remove_observer(profiler)
+            stages = {
+                INIT_STAGES[phase["name"]]: phase["wall"]
+                for phase in profiler.report()["phases"]
+                if phase["name"] in INIT_STAGES
+            }
+            _, stages["parse"] = _timed(lambda: cli.parse(argv))
+            _, stages["run"] = _timed(cli.run)
+            for stage, seconds in stages.items():
+                best[stage] = min(seconds, best.get(stage, seconds))
+    finally:
+        for name in [name for name in sys.modules if name == package or name.startswith(package + ".")]:
+            del sys.modules[name]
+        shutil.rmtree(os.path.join(root, package))
+    return {
+        "commands": commands,
+        "subcommands": subcommands,
+        "params": params,
+        "size": commands * subcommands * params,
+        "stages": {stage: round(best[stage], 6) for stage in STAGES},
+    }
+
+
+def scaling_exponent(sizes, seconds):
+    """Fit ``seconds = c * size ** k`` by least squares in log space.
+
+    Args:
+        sizes (list): Tree sizes
+        seconds (list): Times measured for them
+
+    Returns:
+        float: Exponent ``k``, or None with fewer than two distinct sizes
+    """
+    points = [(math.log(size), math.log(max(value, 1e-9))) for size, value in zip(sizes, seconds)]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if len(set(sizes)) < 2 or not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def run(commands=DEFAULT_COMMANDS, subcommands=DEFAULT_SUBCOMMANDS, params=DEFAULT_PARAMS, runs=5):
+    """Benchmark every combination of commands, subcommands and parameters.
+
+    ``run`` only executes the last subcommand, so its time is reported but
+    not expected to grow with the tree.
+
+    Returns:
+        dict: Environment, per-case stage times and the scaling exponent of each stage
+    """
+    root = tempfile.mkdtemp(prefix="mm_bench_cli_")
+    sys.path.insert(0, root)
+    try:
+        cases = [
+            run_case(root, n_commands, n_subcommands, n_params, runs)
+            for n_commands in commands
+            for n_subcommands in subcommands
+            for n_params in params
+        ]
+    finally:
+        sys.path.remove(root)
+        shutil.rmtree(root)
+    sizes = [case["size"] for case in cases]
+    exponents = {
+        stage: scaling_exponent(sizes, [case["stages"][stage] for case in cases])
+        for stage in STAGES
+    }
+    return {
+        "benchmark": "cli_scaling",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": cases,
+        "exponents": exponents,
+    }
+
+
+def superlinear(results, max_exponent=MAX_EXPONENT):
+    """Return the tree-building stages that grow faster than linearly.
+
+    Args:
+        results (dict): Results returned by ``run``
+        max_exponent (float, optional): Largest accepted exponent. Defaults to 1.3.
+
+    Returns:
+        list: Stage names
+    """
+    return [
+        stage
+        for stage, exponent in results["exponents"].items()
+        if stage != "run" and exponent is not None and exponent > max_exponent
+    ]
+
+
+def report(results):
+    """Print stage times per tree and the scaling exponents"""
+    header = f"{'N':>5} {'M':>4} {'K':>4}" + "".join(f" {stage + ' ms':>22}" for stage in STAGES)
+    print(header)
+    for case in results["cases"]:
+        times = "".join(f" {case['stages'][stage] * 1000:>22.2f}" for stage in STAGES)
+        print(f"{case['commands']:>5} {case['subcommands']:>4} {case['params']:>4}{times}")
+    exponents = "".join(
+        f" {'-' if value is None else format(value, '.2f'):>22}" for value in results["exponents"].values()
+    )
+    print(f"{'exponent':>15}{exponents}")
+
+
+def main(args=None):
+    """Run the CliCore benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Measure CliCore on synthetic command trees")
+    parser.add_argument("--commands", type=int, nargs="+", default=DEFAULT_COMMANDS,
+                        help="numbers of commands (N)")
+    parser.add_argument("--subcommands", type=int, nargs="+", default=DEFAULT_SUBCOMMANDS,
+                        help="subcommands per command (M)")
+    parser.add_argument("--params", type=int, nargs="+", default=DEFAULT_PARAMS,
+                        help="parameters per subcommand (K, at most 26)")
+    parser.add_argument("--runs", type=int, default=5, help="CliCore instances built per tree")
+    parser.add_argument("-o", "--output", help="also write the results as JSON to this file")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with an error if a stage scales superlinearly")
+    parser.add_argument("--max-exponent", type=float, default=MAX_EXPONENT,
+                        help=f"largest accepted scaling exponent (default: {MAX_EXPONENT})")
+    options = parser.parse_args(args)
+    results = run(options.commands, options.subcommands, options.params, options.runs)
+    report(results)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+    slow = superlinear(results, options.max_exponent)
+    if slow:
+        print(f"Superlinear scaling: {', '.join(slow)}")
+        if options.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Cold-start benchmark: zipapp against the pip-installed layout
+
+Builds the zipapp with ``scripts/build_zipapp.py`` and lays the package out
+the way pip installs it (the package tree with bytecode compiled into
+``__pycache__``), then times fresh interpreter runs of ``--version`` and
+``-h`` from both::
+
+    python -m modmaker.benchmarks.cold_start --runs 30
+    python -m modmaker.benchmarks.cold_start --site /path/to/site-packages
+"""
+
+import argparse
+import compileall
+import importlib.util
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PACKAGE_DIR = os.path.join(ROOT, "modmaker")
+ENTRY_POINT = "from modmaker._cli import main; main()"
+COMMANDS = (("--version",), ("-h",))
+
+
+def _load_build_script():
+    """Import scripts/build_zipapp.py, which is not part of the package"""
+    path = os.path.join(ROOT, "scripts", "build_zipapp.py")
+    spec = importlib.util.spec_from_file_location("build_zipapp", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def install_layout(site_dir):
+    """Lay out the package as pip installs it into site-packages.
+
+    Args:
+        site_dir (str): Directory standing in for site-packages
+
+    Returns:
+        str: ``site_dir``
+    """
+    shutil.copytree(
+        PACKAGE_DIR,
+        os.path.join(site_dir, "modmaker"),
+        ignore=shutil.ignore_patterns("__pycache__", "tests", "benchmarks", "modmaker"),
+    )
+    # Like pip, ignore the template files that are not valid Python
+    compileall.compile_dir(site_dir, quiet=2)
+    return site_dir
+
+
+def time_command(command, env, cwd, runs):
+    """Time fresh interpreter runs of a command.
+
+    Args:
+        command (list): Command line
+        env (dict): Environment of the runs
+        cwd (str): Working directory of the runs
+        runs (int): Number of timed runs, after one warm-up run
+
+    Returns:
+        list: Wall-clock seconds of each run
+    """
+    subprocess.run(command, env=env, cwd=cwd, capture_output=True, check=True)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, cwd=cwd, capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(runs=20, site_dir=None):
+    """Benchmark the cold start of both layouts.
+
+    Args:
+        runs (int, optional): Timed runs per command. Defaults to 20.
+        site_dir (str, optional): Existing site-packages to use instead of a
+            simulated installation. Defaults to None.
+
+    Returns:
+        dict: ``{layout: {command: [seconds, ...]}}``
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        pyz = _load_build_script().build(os.path.join(work_dir, "modmaker.pyz"))
+        site_dir = site_dir or install_layout(os.path.join(work_dir, "site"))
+        env = dict(
+            os.environ,
+            MODMAKER_CACHE_DIR=os.path.join(work_dir, "cache"),
+            MODMAKER_NO_UPDATE_CHECK="1",
+        )
+        layouts = {
+            "installed": ([sys.executable, "-c", ENTRY_POINT], dict(env, PYTHONPATH=site_dir)),
+            "zipapp": ([sys.executable, pyz], env),
+        }
+        for layout, (command, layout_env) in layouts.items():
+            results[layout] = {
+                " ".join(args): time_command(command + list(args), layout_env, work_dir, runs)
+                for args in COMMANDS
+            }
+    return results
+
+
+def report(results):
+    """Print median and minimum timings per layout and command"""
+    print(f"{'layout':<10} {'command':<10} {'median ms':>10} {'min ms':>8}")
+    for layout, commands in results.items():
+        for command, timings in commands.items():
+            print(
+                f"{layout:<10} {command:<10} {statistics.median(timings) * 1000:>10.1f}"
+                f" {min(timings) * 1000:>8.1f}"
+            )
+
+
+def main(args=None):
+    """Run the cold-start benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Compare zipapp and installed cold starts")
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per command")
+    parser.add_argument("--site", help="site-packages of a real installation to compare against")
+    parsed = parser.parse_args(args)
+    report(run(parsed.runs, parsed.site))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Create benchmark: end-to-end and per-phase time on synthetic templates
+
+Synthesizes template trees of growing size, with a given share of lines
+holding placeholders and a given share of binary files, and generates a
+project from each with ``Create``. The first run reads the templates from
+disk (cold template cache), the following runs reuse the cache (warm).
+Results can be written as JSON to compare runs; everything runs offline::
+
+    python -m modmaker.benchmarks.create_scaling --sizes 10 1000 50000 -o results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+
+from modmaker._cli_modules.create import Create
+from modmaker._instrument import add_observer, remove_observer
+from modmaker._profile import Profiler
+from modmaker._templates import TEMPLATE_CACHE
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 50000)
+DEFAULT_DENSITIES = (0.0, 0.5)
+DEFAULT_BINARY_RATIOS = (0.0, 0.5)
+FILES_PER_DIR = 100
+LINES_PER_FILE = 40
+BINARY_SIZE = 2048
+PLACEHOLDERS = ("{{PROJECT_NAME}}", "{{AUTHOR}}", "{{EMAIL}}", "{{LICENSE}}", "{{PYTHON_VERSION}}")
+
+
+def synthesize_templates(template_dir, files, density=0.5, binary_ratio=0.0, seed=0):
+    """Write a synthetic template tree.
+
+    Files are spread over directories of ``FILES_PER_DIR`` files, half of
+    them inside the ``{{PROJECT_NAME}}`` package directory.
+
+    Args:
+        template_dir (str): Directory to create
+        files (int): Number of files
+        density (float, optional): Share of text lines holding a placeholder. Defaults to 0.5.
+        binary_ratio (float, optional): Share of binary files. Defaults to 0.0.
+        seed (int, optional): Random seed, for reproducible trees. Defaults to 0.
+
+    Returns:
+        int: Total bytes written
+    """
+    rng = random.Random(seed)
+    total = 0
+    for index in range(files):
+        package = "{{PROJECT_NAME}}" if index % 2 else "docs"
+        directory = os.path.join(template_dir, package, f"d{index // FILES_PER_DIR:04d}")
+        os.makedirs(directory, exist_ok=True)
+        if rng.random() < binary_ratio:
+            data = rng.getrandbits(BINARY_SIZE * 8).to_bytes(BINARY_SIZE, "little")
+            path = os.path.join(directory, f"f{index:06d}.bin")
+        else:
+            lines = []
+            for line in range(LINES_PER_FILE):
+                if rng.random() < density:
+                    lines.append(f"value_{line} = \"{rng.choice(PLACEHOLDERS)}\"")
+                else:
+                    lines.append(f"value_{line} = {rng.random()!r}")
+            data = ("\n".join(lines) + "\n").encode()
+            path = os.path.join(directory, f"f{index:06d}.py")
+        with open(path, "wb") as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+
+def time_create(template_dir, output_dir, name):
+    """Generate one project and time it end to end and per phase.
+
+    Args:
+        template_dir (str): Templates to generate from
+        output_dir (str): Directory the project is created in
+        name (str): Project name
+
+    Returns:
+        dict: ``wall`` seconds and ``phases`` name -> wall seconds
+    """
+    profiler = Profiler()
+    create = Create()
+    create.template_dir = template_dir
+    cwd = os.getcwd()
+    os.chdir(output_dir)
+    add_observer(profiler)
+    try:
+        # Create reports success on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            create.project(name)
+            wall = time.perf_counter() - start
+    finally:
+        remove_observer(profiler)
+        os.chdir(cwd)
+    report = profiler.report()
+    return {
+        "wall": round(wall, 6),
+        "phases": {phase["name"]: phase["wall"] for phase in report["phases"]},
+        "bytes_written": report["bytes_written"],
+    }
+
+
+def run_case(work_dir, files, density, binary_ratio, runs=3):
+    """Benchmark one template shape.
+
+    Args:
+        work_dir (str): Scratch directory
+        files (int): Number of template files
+        density (float): Share of text lines holding a placeholder
+        binary_ratio (float): Share of binary files
+        runs (int, optional): Projects generated; the first one is cold. Defaults to 3.
+
+    Returns:
+        dict: Case parameters, the cold run and the fastest warm run
+    """
+    template_dir = os.path.join(work_dir, "templates")
+    output_dir = os.path.join(work_dir, "out")
+    os.makedirs(output_dir)
+    template_bytes = synthesize_templates(template_dir, files, density, binary_ratio)
+    TEMPLATE_CACHE.clear()
+    try:
+        results = [time_create(template_dir, output_dir, f"p{run}") for run in range(max(1, runs))]
+    finally:
+        TEMPLATE_CACHE.clear()
+        shutil.rmtree(template_dir)
+        shutil.rmtree(output_dir)
+    warm = min(results[1:], key=lambda result: result["wall"]) if len(results) > 1 else None
+    return {
+        "files": files,
+        "density": density,
+        "binary_ratio": binary_ratio,
+        "template_bytes": template_bytes,
+        "cold": results[0],
+        "warm": warm,
+    }
+
+
+def run(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES, binary_ratios=DEFAULT_BINARY_RATIOS, runs=3):
+    """Benchmark every combination of template size, density and binary ratio.
+
+    Args:
+        sizes (tuple, optional): Numbers of template files
+        densities (tuple, optional): Shares of lines holding a placeholder
+        binary_ratios (tuple, optional): Shares of binary files
+        runs (int, optional): Projects generated per case. Defaults to 3.
+
+    Returns:
+        dict: Environment and per-case results
+    """
+    logger = logging.getLogger("modmaker")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    cases = []
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            for files in sizes:
+                for density in densities:
+                    for binary_ratio in binary_ratios:
+                        work_dir = tempfile.mkdtemp(dir=scratch)
+                        cases.append(run_case(work_dir, files, density, binary_ratio, runs))
+    finally:
+        logger.setLevel(level)
+    return {
+        "benchmark": "create_scaling",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": cases,
+    }
+
+
+def report(results):
+    """Print the cold and warm time of each case, and the slowest phase"""
+    print(f"{'files':>7} {'density':>8} {'binary':>7} {'cold ms':>10} {'warm ms':>10}  slowest phase")
+    for case in results["cases"]:
+        warm = case["warm"] or case["cold"]
+        phases = {name: wall for name, wall in warm["phases"].items() if name != "create_project"}
+        slowest = max(phases, key=phases.get) if phases else ""
+        print(
+            f"{case['files']:>7} {case['density']:>8.2f} {case['binary_ratio']:>7.2f} "
+            f"{case['cold']['wall'] * 1000:>10.1f} {warm['wall'] * 1000:>10.1f}  {slowest}"
+        )
+
+
+def main(args=None):
+    """Run the Create benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Measure Create on synthetic templates")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="numbers of template files")
+    parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES,
+                        help="shares of text lines holding a placeholder")
+    parser.add_argument("--binary-ratios", type=float, nargs="+", default=DEFAULT_BINARY_RATIOS,
+                        help="shares of binary template files")
+    parser.add_argument("--runs", type=int, default=3, help="projects generated per case")
+    parser.add_argument("-o", "--output", help="also write the results as JSON to this file")
+    options = parser.parse_args(args)
+    results = run(options.sizes, options.densities, options.binary_ratios, options.runs)
+    report(results)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
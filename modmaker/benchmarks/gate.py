@@ -0,0 +1,246 @@
+"""
+Performance regression gate: ``modmaker-bench``
+
+Runs the CLI start-up and Create benchmarks several times, summarizes every
+measurement by its median and interquartile range (IQR), and compares the
+medians with a baseline. A measurement regressed when its median is more
+than ``--threshold`` percent slower than the baseline, and the slowdown is
+larger than the IQRs of both runs added up, so noisy measurements do not
+fail the gate on their own.
+
+Timings depend on the host, so no baseline is committed: the baseline lives
+in the modmaker cache directory of the machine that runs the gate. Record it
+on the base revision, then compare the change against it::
+
+    git checkout main && modmaker-bench record
+    git checkout my-branch && modmaker-bench compare   # exits with 1 on a regression
+
+``compare`` without a baseline records one instead of comparing.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from modmaker._cache import cache_path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_REPEAT = 15
+DEFAULT_THRESHOLD = 20
+STARTUP_COMMANDS = (("--version",), ("-h",))
+# Fixed workloads, small enough to repeat
+CLI_TREE = (50, 5, 4)
+CREATE_FILES = 200
+
+
+def _time_startup(args, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "modmaker"] + list(args), cwd=ROOT, env=env,
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def run_once(work_dir):
+    """Run every benchmark of the gate once.
+
+    Args:
+        work_dir (str): Scratch directory, holding the modmaker cache
+
+    Returns:
+        dict: Measurement name -> milliseconds
+    """
+    # pylint: disable=import-outside-toplevel
+    from modmaker.benchmarks import cli_scaling, create_scaling
+
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])),
+        MODMAKER_CACHE_DIR=os.path.join(work_dir, "cache"),
+        MODMAKER_NO_UPDATE_CHECK="1",
+    )
+    results = {}
+    for args in STARTUP_COMMANDS:
+        results[f"startup modmaker {' '.join(args)}"] = _time_startup(args, env) * 1000
+    commands, subcommands, params = CLI_TREE
+    cli = cli_scaling.run((commands,), (subcommands,), (params,), runs=1)["cases"][0]
+    for stage in ("_build_args", "_build_parser", "parse"):
+        results[f"cli {stage} ({commands}x{subcommands}x{params})"] = cli["stages"][stage] * 1000
+    create = create_scaling.run((CREATE_FILES,), (0.5,), (0.0,), runs=2)["cases"][0]
+    results[f"create cold ({CREATE_FILES} files)"] = create["cold"]["wall"] * 1000
+    results[f"create warm ({CREATE_FILES} files)"] = create["warm"]["wall"] * 1000
+    return results
+
+
+def collect(repeat=DEFAULT_REPEAT):
+    """Run the benchmarks repeatedly.
+
+    Every round runs all benchmarks once, so a slow spell of the host
+    spreads over all measurements instead of skewing one of them.
+
+    Args:
+        repeat (int, optional): Rounds. Defaults to 15.
+
+    Returns:
+        dict: Measurement name -> list of milliseconds
+    """
+    samples = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Warm-up round: fills the plugin cache, as after installation
+        run_once(work_dir)
+        for _ in range(max(1, repeat)):
+            for name, ms in run_once(work_dir).items():
+                samples.setdefault(name, []).append(ms)
+    return samples
+
+
+def summarize(samples):
+    """Summarize samples by median and interquartile range.
+
+    Args:
+        samples (dict): Measurement name -> list of milliseconds
+
+    Returns:
+        dict: Measurement name -> ``{"median", "iqr", "samples"}``
+    """
+    summary = {}
+    for name, values in samples.items():
+        if len(values) > 1:
+            first, _, third = statistics.quantiles(values, n=4)
+            iqr = third - first
+        else:
+            iqr = 0.0
+        summary[name] = {
+            "median": round(statistics.median(values), 3),
+            "iqr": round(iqr, 3),
+            "samples": [round(value, 3) for value in values],
+        }
+    return summary
+
+
+def baseline_file():
+    """Return the path of the local baseline.
+
+    Returns:
+        str: ``bench/baseline.json`` in the modmaker cache directory
+    """
+    return cache_path("bench", "baseline.json")
+
+
+def load_baseline(path=None):
+    """Read a baseline.
+
+    Args:
+        path (str, optional): Baseline file. Defaults to the local baseline.
+
+    Returns:
+        dict: Measurement name -> summary, empty without a baseline
+    """
+    path = path or baseline_file()
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("metrics", {})
+
+
+def save_baseline(summary, path=None):
+    """Write a baseline.
+
+    Args:
+        summary (dict): Summary returned by ``summarize``
+        path (str, optional): Baseline file. Defaults to the local baseline.
+    """
+    path = path or baseline_file()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = {"python": platform.python_version(), "platform": platform.platform(), "metrics": summary}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def compare(summary, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare a run with a baseline.
+
+    Args:
+        summary (dict): Summary returned by ``summarize``
+        baseline (dict): Baseline summary
+        threshold (float, optional): Allowed slowdown of the median in percent. Defaults to 20.
+
+    Returns:
+        list: ``(name, summary, baseline summary or None, regressed)`` per measurement
+    """
+    rows = []
+    for name, current in summary.items():
+        base = baseline.get(name)
+        regressed = False
+        if base is not None:
+            slowdown = current["median"] - base["median"]
+            noise = current["iqr"] + base["iqr"]
+            regressed = slowdown > base["median"] * threshold / 100.0 and slowdown > noise
+        rows.append((name, current, base, regressed))
+    return rows
+
+
+def format_table(rows):
+    """Format comparisons as a text table.
+
+    Args:
+        rows (list): Rows returned by ``compare``
+
+    Returns:
+        str: Table with one line per measurement
+    """
+    width = max([len("measurement")] + [len(row[0]) for row in rows])
+    lines = [f"{'measurement':<{width}}  {'median ms':>10}  {'iqr':>7}  {'baseline':>10}  {'change':>8}"]
+    for name, current, base, regressed in rows:
+        if base is None:
+            baseline, change = "-", ""
+        else:
+            baseline = f"{base['median']:.2f}"
+            change = f"{(current['median'] - base['median']) / base['median'] * 100:+.0f}%" if base["median"] else ""
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(
+            f"{name:<{width}}  {current['median']:>10.2f}  {current['iqr']:>7.2f}  {baseline:>10}  {change:>8}{flag}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(args=None):
+    """Run the regression gate from the command line"""
+    parser = argparse.ArgumentParser(prog="modmaker-bench", description="Gate modmaker performance on a baseline")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = commands.add_parser("compare", help="run the benchmarks and compare them with the baseline")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help=f"allowed slowdown of a median in percent (default: {DEFAULT_THRESHOLD})")
+    record_parser = commands.add_parser("record", help="run the benchmarks and store them as the baseline")
+    for sub in (compare_parser, record_parser):
+        sub.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="rounds of benchmarks")
+        sub.add_argument("--baseline", default=baseline_file(), help="baseline file (default: %(default)s)")
+        sub.add_argument("-o", "--output", help="also write the results as JSON to this file")
+    options = parser.parse_args(args)
+    summary = summarize(collect(options.repeat))
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    baseline = load_baseline(options.baseline)
+    if options.command == "record" or not baseline:
+        save_baseline(summary, options.baseline)
+        if options.command == "compare":
+            print(f"No baseline at {options.baseline}, this run is recorded as the baseline")
+        print(f"Baseline written to {options.baseline}")
+        return
+    rows = compare(summary, baseline, options.threshold)
+    sys.stdout.write(format_table(rows))
+    regressed = [row[0] for row in rows if row[3]]
+    if regressed:
+        print(f"Slower than the baseline by more than {options.threshold:g}%: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Logging throughput benchmark: records per second of the CLI logger
+
+Compares the generic ``Formatter("%(color_loglevel)s%(message)s")`` behind
+the original ``dir()``-based filter with ``CliFormatter``, and measures the
+cost of records dropped by the level check with eager f-strings against
+lazy %-style arguments::
+
+    python -m modmaker.benchmarks.logging_throughput --records 200000
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from modmaker._logger import CliFormatter, PrintMsg
+
+
+class LegacyAppFilter(logging.Filter):
+    """The filter the CLI logger used before CliFormatter, kept as the baseline"""
+
+    def filter(self, record):
+        if "nametag" in dir(record):
+            record.color_loglevel = record.nametag
+        else:
+            record.color_loglevel = getattr(PrintMsg, record.levelname)
+        return True
+
+
+def _logger(name, stream, formatter, log_filter=None, level=logging.DEBUG):
+    """Create an isolated logger writing to ``stream``"""
+    log = logging.getLogger(f"modmaker.benchmarks.{name}")
+    log.handlers = []
+    log.propagate = False
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(formatter)
+    if log_filter is not None:
+        handler.addFilter(log_filter)
+    log.addHandler(handler)
+    log.setLevel(level)
+    return log
+
+
+def _rate(func, records):
+    """Return how many times per second ``func`` runs"""
+    start = time.perf_counter()
+    for index in range(records):
+        func(index)
+    return records / (time.perf_counter() - start)
+
+
+def run(records=100000):
+    """Measure records per second for each logging path.
+
+    Args:
+        records (int, optional): Records logged per case. Defaults to 100000.
+
+    Returns:
+        dict: Case name -> records per second
+    """
+    path = "/tmp/project/package/module.py"
+    with open(os.devnull, "w") as stream:
+        legacy = _logger(
+            "legacy", stream, logging.Formatter("%(color_loglevel)s%(message)s"), LegacyAppFilter()
+        )
+        fast = _logger("fast", stream, CliFormatter())
+        quiet = _logger("quiet", stream, CliFormatter(), level=logging.INFO)
+        return {
+            "emitted, legacy formatter": _rate(lambda i: legacy.debug("Wrote %s", path), records),
+            "emitted, CliFormatter": _rate(lambda i: fast.debug("Wrote %s", path), records),
+            "filtered, eager f-string": _rate(lambda i: quiet.debug(f"Wrote {path} {i}"), records),
+            "filtered, lazy arguments": _rate(lambda i: quiet.debug("Wrote %s %d", path, i), records),
+        }
+
+
+def report(results):
+    """Print records per second per case"""
+    print(f"{'case':<28} {'records/s':>12}")
+    for case, rate in results.items():
+        print(f"{case:<28} {rate:>12,.0f}")
+
+
+def main(args=None):
+    """Run the logging benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Measure CLI logger records per second")
+    parser.add_argument("--records", type=int, default=100000, help="records per case")
+    report(run(parser.parse_args(args).records))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,15 @@
 """
 Unit tests for modmaker package
-"""
\ No newline at end of file
+"""
+
+import os
+import sys
+
+# The test modules put the package directory itself first on sys.path so they
+# can import ``_cli`` and friends directly. Bind ``modmaker`` to this package
+# before that happens so absolute ``modmaker.*`` imports keep resolving here.
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+import modmaker  # noqa: E402,F401  pylint: disable=wrong-import-position
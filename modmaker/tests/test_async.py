@@ -0,0 +1,139 @@
+"""
+Unit tests for _async.py and async command support in CliCore
+"""
+
+import unittest
+import asyncio
+import os
+import signal
+import sys
+import types
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._async import get_semaphore, run_coroutine
+from modmaker._cli_core import CliCore
+
+
+class Check:
+    """
+    Check repositories
+    """
+
+    def __init__(self):
+        pass
+
+    async def repos(self, count: int):
+        """
+        Check many repositories concurrently
+
+        :param count: Number of repositories
+        """
+        running = 0
+        peak = 0
+
+        async def check_one():
+            nonlocal running, peak
+            async with get_semaphore():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.001)
+                running -= 1
+
+        await asyncio.gather(*(check_one() for _ in range(count)))
+        return peak
+
+    def sync(self):
+        """Synchronous subcommand"""
+        return "sync"
+
+
+class Ping:
+    """
+    Ping a host
+    """
+
+    async def __call__(self, host: str):
+        """
+        :param host: Host to ping
+        """
+        await asyncio.sleep(0)
+        return f"pong {host}"
+
+
+COMMANDS = types.ModuleType("commands")
+COMMANDS.Check = Check
+COMMANDS.Ping = Ping
+
+GLOBAL_ARGS = [[["--concurrency"], {"type": int, "dest": "_concurrency"}]]
+
+
+class TestAsyncCommands(unittest.TestCase):
+    """Test cases for async commands"""
+
+    def setUp(self):
+        self.cli = CliCore("mm", COMMANDS, "Test CLI", "1.0", GLOBAL_ARGS)
+
+    def test_detected_during_build(self):
+        """Test that coroutine functions and async __call__ are detected"""
+        self.assertEqual(self.cli._async_commands, {("check", "repos"), ("ping", "")})
+        self.assertEqual(self.cli.args["commands"]["ping"]["args"][0][0], ["host"])
+
+    def test_run_async_subcommand(self):
+        """Test that the semaphore is sized by --concurrency"""
+        self.cli.parse(["--concurrency", "3", "check", "repos", "20"])
+        self.assertEqual(self.cli.run(), 3)
+
+    def test_run_async_call(self):
+        """Test classes with an async __call__"""
+        self.cli.parse(["ping", "example.com"])
+        self.assertEqual(self.cli.run(), "pong example.com")
+
+    def test_sync_subcommand_unchanged(self):
+        """Test that synchronous commands still run directly"""
+        self.cli.parse(["check", "sync"])
+        self.assertEqual(self.cli.run(), "sync")
+
+
+class TestRunCoroutine(unittest.TestCase):
+    """Test cases for the managed event loop"""
+
+    def test_no_semaphore_outside_commands(self):
+        """Test that the semaphore only exists while a command runs"""
+        with self.assertRaises(RuntimeError):
+            get_semaphore()
+
+    def test_invalid_concurrency(self):
+        """Test that a concurrency below one is rejected"""
+
+        async def noop():
+            return None
+
+        for concurrency in (0, -1):
+            coro = noop()
+            with self.assertRaises(ValueError):
+                run_coroutine(coro, concurrency=concurrency)
+            coro.close()
+
+    @unittest.skipUnless(hasattr(signal, "SIGINT") and os.name == "posix", "POSIX signals only")
+    def test_sigint_cancels(self):
+        """Test that SIGINT cancels the command and restores the handler"""
+        cleaned_up = []
+        handler = signal.getsignal(signal.SIGINT)
+
+        async def long_running():
+            try:
+                os.kill(os.getpid(), signal.SIGINT)
+                await asyncio.sleep(10)
+            finally:
+                cleaned_up.append(True)
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_coroutine(long_running())
+        self.assertEqual(cleaned_up, [True])
+        self.assertIs(signal.getsignal(signal.SIGINT), handler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the performance regression gate (benchmarks/gate.py)
+
+The gate itself only runs with ``MODMAKER_BENCH_GATE=1``: it compares with
+the baseline recorded on this machine, in the modmaker cache directory.
+"""
+
+import unittest
+from unittest.mock import patch
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker.benchmarks import gate
+
+
+class TestBenchGate(unittest.TestCase):
+    """Test cases for the regression gate"""
+
+    def test_summarize(self):
+        """Test median and interquartile range of samples"""
+        summary = gate.summarize({"a": [1.0, 2.0, 3.0, 4.0, 100.0], "b": [5.0]})
+        self.assertEqual(summary["a"]["median"], 3.0)
+        self.assertEqual(summary["a"]["iqr"], 50.5)
+        self.assertEqual(summary["a"]["samples"], [1.0, 2.0, 3.0, 4.0, 100.0])
+        self.assertEqual(summary["b"], {"median": 5.0, "iqr": 0.0, "samples": [5.0]})
+
+    def test_compare(self):
+        """Test that only slowdowns above the threshold and the noise regress"""
+        baseline = {
+            "steady": {"median": 10.0, "iqr": 0.5},
+            "noisy": {"median": 10.0, "iqr": 2.0},
+            "faster": {"median": 10.0, "iqr": 0.5},
+        }
+        summary = {
+            "steady": {"median": 13.0, "iqr": 0.5},
+            "noisy": {"median": 13.0, "iqr": 1.5},
+            "faster": {"median": 8.0, "iqr": 0.5},
+            "new": {"median": 1.0, "iqr": 0.0},
+        }
+        rows = gate.compare(summary, baseline, threshold=20)
+        self.assertEqual({row[0]: row[3] for row in rows},
+                         {"steady": True, "noisy": False, "faster": False, "new": False})
+        self.assertEqual(gate.compare(summary, baseline, threshold=50)[0][3], False)
+        table = gate.format_table(rows)
+        self.assertIn("+30%  REGRESSION", table)
+        self.assertRegex(table, r"new\s+1.00\s+0.00\s+-")
+
+    def test_baseline_round_trip(self):
+        """Test that a recorded baseline is read back"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            self.assertEqual(gate.load_baseline(path), {})
+            summary = gate.summarize({"a": [1.0, 2.0]})
+            gate.save_baseline(summary, path)
+            self.assertEqual(gate.load_baseline(path), summary)
+
+    def test_local_baseline(self):
+        """Test that the default baseline lives in the cache directory"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(os.environ, {"MODMAKER_CACHE_DIR": temp_dir}):
+                self.assertEqual(gate.baseline_file(), os.path.join(temp_dir, "bench", "baseline.json"))
+                gate.save_baseline(gate.summarize({"a": [1.0]}))
+                self.assertEqual(gate.load_baseline()["a"]["median"], 1.0)
+
+    @patch("modmaker.benchmarks.gate.collect")
+    def test_main(self, mock_collect):
+        """Test the exit status of compare, and record"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "bench", "baseline.json")
+            output = os.path.join(temp_dir, "results.json")
+            mock_collect.return_value = {"a": [10.0, 10.0, 10.0]}
+            with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                gate.main(["compare", "--baseline", path])
+            self.assertIn("recorded as the baseline", stdout.getvalue())
+            self.assertEqual(gate.load_baseline(path)["a"]["median"], 10.0)
+            with patch("sys.stdout", new_callable=io.StringIO):
+                gate.main(["record", "--baseline", path, "--repeat", "3"])
+            mock_collect.assert_called_with(3)
+
+            with patch("sys.stdout", new_callable=io.StringIO):
+                gate.main(["compare", "--baseline", path, "-o", output])
+            with open(output) as f:
+                self.assertEqual(json.load(f)["a"]["median"], 10.0)
+
+            mock_collect.return_value = {"a": [20.0, 20.0, 20.0]}
+            with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                with self.assertRaises(SystemExit) as raised:
+                    gate.main(["compare", "--baseline", path])
+            self.assertEqual(raised.exception.code, 1)
+            self.assertIn("REGRESSION", stdout.getvalue())
+
+            with patch("sys.stdout", new_callable=io.StringIO):
+                gate.main(["compare", "--baseline", path, "--threshold", "150"])
+
+    @unittest.skipUnless(os.environ.get("MODMAKER_BENCH_GATE"), "set MODMAKER_BENCH_GATE=1 to run the gate")
+    def test_gate(self):
+        """Test that no benchmark regressed against the local baseline"""
+        baseline = gate.load_baseline()
+        if not baseline:
+            self.skipTest(f"no baseline at {gate.baseline_file()}, run modmaker-bench record first")
+        rows = gate.compare(gate.summarize(gate.collect()), baseline)
+        regressed = [row[0] for row in rows if row[3]]
+        self.assertFalse(regressed, gate.format_table(rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,11 @@ Unit tests for _cli.py
 """
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 import sys
 import argparse
+import io
+import tempfile
 
 # Add the parent directory to the path so Python can find the modules
 import os
@@ -14,6 +16,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Import module directly using relative imports
 from _cli import (
+    _get_log_format,
     _get_log_level,
     _print_tracebacks,
     _setup_logging,
@@ -21,13 +24,20 @@ from _cli import (
     get_installed_version,
     get_pip_version,
     main,
-    NAME,
 )
 
 
 class TestCli(unittest.TestCase):
     """Test cases for CLI module"""
 
+    def setUp(self):
+        # Building the CLI writes the plugin index to the cache directory
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        patcher = patch.dict(os.environ, {"MODMAKER_CACHE_DIR": cache.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_get_log_level_default(self):
         """Test default log level"""
         args = []
@@ -54,26 +64,30 @@ class TestCli(unittest.TestCase):
         _get_log_level(args, exit_func=exit_func)
         exit_func.assert_called_once_with(1, "--debug and --quiet cannot be specified simultaneously")
 
+    def test_get_log_format(self):
+        """Test that the log format is read before parsing"""
+        self.assertEqual(_get_log_format(["create", "project", "a"]), "text")
+        self.assertEqual(_get_log_format(["--log-format", "json", "create"]), "json")
+        self.assertEqual(_get_log_format(["--log-format=json", "create"]), "json")
+        self.assertEqual(_get_log_format(["--log-format"]), "text")
+
     def test_print_tracebacks(self):
         """Test traceback printing logic"""
         self.assertTrue(_print_tracebacks("DEBUG"))
         self.assertFalse(_print_tracebacks("INFO"))
         self.assertFalse(_print_tracebacks("ERROR"))
 
-    @patch("_cli.get_distribution_version")
-    def test_get_installed_version_success(self, mock_get_version):
-        """Test successful version retrieval"""
-        mock_get_version.return_value = "1.0.0"
-        self.assertEqual(get_installed_version(), "1.0.0")
-        mock_get_version.assert_called_once_with(NAME)
+    def test_get_installed_version(self):
+        """Test that the version baked into _version.py is reported"""
+        from modmaker._version import __version__
+        self.assertEqual(get_installed_version(), __version__)
 
-    @patch("_cli.get_distribution_version")
-    def test_get_installed_version_error(self, mock_get_version):
-        """Test version retrieval error handling"""
-        mock_get_version.side_effect = Exception("Test error")
-        self.assertEqual(get_installed_version(), "[local source] no pip module installed")
+    @patch("_cli.__version__", "1.0.0")
+    def test_get_installed_version_baked(self):
+        """Test that no distribution metadata is consulted"""
+        self.assertEqual(get_installed_version(), "1.0.0")
 
-    @patch("_cli.requests.get")
+    @patch("requests.get")
     def test_get_pip_version(self, mock_get):
         """Test PyPI version retrieval"""
         mock_response = MagicMock()
@@ -141,6 +155,165 @@ class TestCli(unittest.TestCase):
             # Restore
             sys.argv = old_argv
 
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_modmaker_error(self, mock_signal, mock_welcome):
+        """Test that library errors become the exit code of the error"""
+        from modmaker._exceptions import ModmakerError, UsageError
+        old_argv = sys.argv
+        sys.argv = ["modmaker", "create", "project", "a"]
+        try:
+            for error, code in ((ModmakerError("failed"), 1), (UsageError("bad option"), 2)):
+                mock_cli_core = MagicMock()
+                mock_cli_core.return_value.run.side_effect = error
+                exit_func = MagicMock()
+                main(cli_core_class=mock_cli_core, exit_func=exit_func)
+                exit_func.assert_called_once_with(code)
+        finally:
+            sys.argv = old_argv
+
+    @patch("_cli.stop_queued_logging")
+    @patch("_cli.start_queued_logging")
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_queued_logging_with_jobs(self, mock_signal, mock_welcome, mock_start, mock_stop):
+        """Test that parallel jobs switch logging to queued mode and flush it"""
+        old_argv = sys.argv
+        try:
+            for jobs, started in ((4, True), (1, False)):
+                mock_start.reset_mock()
+                mock_stop.reset_mock()
+                sys.argv = ["modmaker", "-j", str(jobs), "create", "project", "a"]
+                mock_cli_core = MagicMock()
+                mock_cli_core.return_value.parsed_args = argparse.Namespace(_jobs=jobs)
+                main(cli_core_class=mock_cli_core, exit_func=MagicMock())
+                self.assertEqual(mock_start.called, started)
+                mock_stop.assert_called_once()
+        finally:
+            sys.argv = old_argv
+
+    @patch("_cli.stop_log_buffer")
+    @patch("_cli.start_log_buffer")
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_log_buffer(self, mock_signal, mock_welcome, mock_start, mock_stop):
+        """Test that --log-buffer installs the project buffer for the run"""
+        old_argv = sys.argv
+        sys.argv = ["modmaker", "--log-buffer", "50", "create", "project", "a"]
+        try:
+            mock_cli_core = MagicMock()
+            mock_cli_core.return_value.parsed_args = argparse.Namespace(_log_buffer=50)
+            main(cli_core_class=mock_cli_core, exit_func=MagicMock())
+            mock_start.assert_called_once_with(ANY, 50)
+            mock_stop.assert_called_once()
+        finally:
+            sys.argv = old_argv
+
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_profile(self, mock_signal, mock_welcome):
+        """Test that --profile writes the phases of a create run"""
+        import json
+        old_argv, cwd = sys.argv, os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile = os.path.join(temp_dir, "profile.json")
+            sys.argv = ["modmaker", "--profile", profile, "create", "project", "demo", "other"]
+            os.chdir(temp_dir)
+            try:
+                with patch("sys.stdout", new_callable=io.StringIO):
+                    main(exit_func=MagicMock())
+            finally:
+                os.chdir(cwd)
+                sys.argv = old_argv
+            with open(profile) as f:
+                report = json.load(f)
+        phases = {entry["name"]: entry["calls"] for entry in report["phases"]}
+        for name in ("discover", "copy", "replace_variables", "create_cli_structure"):
+            self.assertEqual(phases[name], 2)
+        self.assertGreater(report["bytes_written"], 0)
+        self.assertTrue(any(entry["phase"] == "replace_variables" for entry in report["files"]))
+
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_trace(self, mock_signal, mock_welcome):
+        """Test that --trace writes a trace-event timeline of a create run"""
+        import json
+        old_argv, cwd = sys.argv, os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_file = os.path.join(temp_dir, "trace.json")
+            sys.argv = ["modmaker", "--trace", trace_file, "create", "project", "demo"]
+            os.chdir(temp_dir)
+            try:
+                with patch("sys.stdout", new_callable=io.StringIO):
+                    main(exit_func=MagicMock())
+            finally:
+                os.chdir(cwd)
+                sys.argv = old_argv
+            with open(trace_file) as f:
+                events = json.load(f)["traceEvents"]
+        spans = {event["name"] for event in events if event["ph"] == "X"}
+        for name in ("create_project", "copy", "replace_variables", "pyproject.toml"):
+            self.assertIn(name, spans)
+
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_metrics_file(self, mock_signal, mock_welcome):
+        """Test that --metrics-file writes Prometheus metrics of a create run"""
+        old_argv, cwd = sys.argv, os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metrics = os.path.join(temp_dir, "modmaker.prom")
+            sys.argv = ["modmaker", "--metrics-file", metrics, "create", "project", "demo"]
+            os.chdir(temp_dir)
+            try:
+                with patch("sys.stdout", new_callable=io.StringIO):
+                    main(exit_func=MagicMock())
+            finally:
+                os.chdir(cwd)
+                sys.argv = old_argv
+            with open(metrics) as f:
+                text = f.read()
+        self.assertIn('modmaker_projects_total{result="created"} 1\n', text)
+        self.assertIn('modmaker_phase_duration_seconds_count{phase="create_project"} 1\n', text)
+
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_version_fast_path(self, mock_signal, mock_welcome):
+        """Test that --version is answered without building the CLI"""
+        old_argv = sys.argv
+        sys.argv = ["modmaker", "--version"]
+        try:
+            mock_cli_core = MagicMock()
+            with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                main(cli_core_class=mock_cli_core, exit_func=MagicMock())
+            mock_cli_core.assert_not_called()
+            mock_welcome.assert_not_called()
+            self.assertEqual(stdout.getvalue(), get_installed_version() + "\n")
+        finally:
+            sys.argv = old_argv
+
+    @patch("_cli._welcome")
+    @patch("_cli.signal.signal")
+    def test_main_help_fast_path(self, mock_signal, mock_welcome):
+        """Test that top-level help is rendered once and then served from the cache"""
+        old_argv = sys.argv
+        sys.argv = ["modmaker", "-h"]
+        try:
+            with tempfile.TemporaryDirectory() as cache, \
+                    patch.dict(os.environ, {"MODMAKER_CACHE_DIR": cache}):
+                with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                    main(exit_func=MagicMock())
+                rendered = stdout.getvalue()
+                mock_cli_core = MagicMock()
+                with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                    main(cli_core_class=mock_cli_core, exit_func=MagicMock())
+            mock_cli_core.assert_not_called()
+            mock_welcome.assert_not_called()
+            self.assertEqual(stdout.getvalue(), rendered)
+            self.assertIn("usage: modmaker", rendered)
+            self.assertIn("create", rendered)
+        finally:
+            sys.argv = old_argv
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
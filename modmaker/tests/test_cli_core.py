@@ -13,7 +13,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import module directly using relative imports
-from _cli_core import CliCore
+from modmaker._cli_core import CliCore
 
 
 # Test fixtures
@@ -15,10 +15,11 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import module directly using relative imports
-from _common_utils import (
+from modmaker._common_utils import (
     exit_with_code,
     ensure_directory,
     copy_directory_contents,
+    scan_tree,
 )
 
 
@@ -98,11 +99,58 @@ class TestCommonUtils(unittest.TestCase):
                     self.assertEqual(f.read(), "test content")
                 with open(os.path.join(dst_dir, "subdir", "subfile.txt"), "r") as f:
                     self.assertEqual(f.read(), "subfile content")
+                # Modification times are preserved, as by shutil.copy2
+                self.assertEqual(
+                    os.stat(os.path.join(dst_dir, "test.txt")).st_mtime_ns,
+                    os.stat(src_file).st_mtime_ns,
+                )
 
-    @patch("shutil.copy2")
-    def test_copy_directory_contents_error(self, mock_copy2):
+    def test_scan_tree(self):
+        """Test that a tree is scanned depth first with cached types, sizes and modes"""
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "b", "c"))
+            os.makedirs(os.path.join(root, "a"))
+            with open(os.path.join(root, "b", "c", "file.txt"), "w") as f:
+                f.write("12345")
+            with open(os.path.join(root, "z.py"), "w") as f:
+                f.write("")
+            os.chmod(os.path.join(root, "z.py"), 0o755)
+            plan = scan_tree(root)
+        self.assertEqual(
+            [(entry.relpath, entry.is_dir) for entry in plan],
+            [
+                ("a", True),
+                ("b", True),
+                ("z.py", False),
+                (os.path.join("b", "c"), True),
+                (os.path.join("b", "c", "file.txt"), False),
+            ],
+        )
+        self.assertEqual(plan[4].size, 5)
+        self.assertEqual(plan[2].mode, 0o755)
+
+    @unittest.skipUnless(hasattr(os, "symlink") and os.name == "posix", "POSIX symlinks only")
+    def test_copy_directory_contents_symlinks(self):
+        """Test that linked directories are copied and links to a parent are not followed"""
+        with tempfile.TemporaryDirectory() as root:
+            src_dir = os.path.join(root, "src")
+            shared = os.path.join(root, "shared")
+            os.makedirs(src_dir)
+            os.makedirs(shared)
+            with open(os.path.join(shared, "file.txt"), "w") as f:
+                f.write("shared content")
+            os.symlink(shared, os.path.join(src_dir, "linked"))
+            os.symlink(src_dir, os.path.join(src_dir, "loop"))
+            dst_dir = os.path.join(root, "dst")
+            self.assertTrue(copy_directory_contents(src_dir, dst_dir))
+            with open(os.path.join(dst_dir, "linked", "file.txt")) as f:
+                self.assertEqual(f.read(), "shared content")
+            self.assertEqual(os.listdir(os.path.join(dst_dir, "loop")), [])
+
+    @patch("shutil.copyfile")
+    def test_copy_directory_contents_error(self, mock_copyfile):
         """Test error handling in copy_directory_contents"""
-        mock_copy2.side_effect = PermissionError("Permission denied")
+        mock_copyfile.side_effect = PermissionError("Permission denied")
         
         with tempfile.TemporaryDirectory() as src_dir:
             with tempfile.TemporaryDirectory() as dst_dir:
@@ -112,7 +160,7 @@ class TestCommonUtils(unittest.TestCase):
                     f.write("test content")
                 
                 # This should not raise an exception despite the error
-                copy_directory_contents(src_dir, dst_dir)
+                self.assertFalse(copy_directory_contents(src_dir, dst_dir))
 
 
 if __name__ == "__main__":
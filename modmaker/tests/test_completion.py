@@ -0,0 +1,119 @@
+"""
+Unit tests for _completion.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._cli_core import CliCore
+from modmaker._completion import (
+    completion_table,
+    installed_path,
+    install_completion,
+    refresh_completions,
+    render_completion,
+)
+
+
+class Create:
+    """
+    Create things
+    """
+
+    def __init__(self):
+        pass
+
+    def project(self, name: str, force: bool = False):
+        """
+        Create a project
+
+        :param name: Project name
+        :param force: Overwrite existing files
+        """
+
+
+COMMANDS = types.ModuleType("commands")
+COMMANDS.Create = Create
+
+GLOBAL_ARGS = [[["-q", "--quiet"], {"action": "store_true", "dest": "_quiet"}]]
+
+
+class TestCompletion(unittest.TestCase):
+    """Test cases for static completion scripts"""
+
+    def setUp(self):
+        self.cache = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {"MODMAKER_CACHE_DIR": self.cache.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.cache.cleanup)
+        self.cli = CliCore("mm", COMMANDS, "Test CLI", "1.0", GLOBAL_ARGS)
+
+    def test_completion_table(self):
+        """Test that every command, subcommand and flag is covered"""
+        table = completion_table(self.cli)
+        self.assertEqual(table[":"], ["create", "-h", "--help", "-v", "--version", "-q", "--quiet"])
+        self.assertEqual(table["create:"], ["project", "-h", "--help"])
+        self.assertEqual(table["create:project"], ["-h", "--help", "-f", "--force"])
+
+    def test_render_contains_spec_key(self):
+        """Test that every script records the spec key"""
+        for shell in ("bash", "zsh", "fish"):
+            script = render_completion(self.cli, shell)
+            self.assertIn(f"# spec-key: {self.cli.spec_key}", script)
+            self.assertIn("--force", script)
+
+    def test_render_unknown_shell(self):
+        """Test that unsupported shells are rejected"""
+        with self.assertRaises(ValueError):
+            render_completion(self.cli, "tcsh")
+
+    @unittest.skipIf(shutil.which("bash") is None, "bash is not installed")
+    def test_bash_script_completes(self):
+        """Test the bash script without starting Python"""
+        script = render_completion(self.cli, "bash")
+        check = script + 'COMP_WORDS=(mm create project --f); COMP_CWORD=3; _mm_complete; echo "${COMPREPLY[@]}"\n'
+        result = subprocess.run(["bash", "-c", check], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "--force")
+
+    def test_refresh_without_installed_scripts(self):
+        """Test that nothing is written when no script is installed"""
+        self.assertEqual(refresh_completions(self.cli), [])
+        self.assertFalse(os.path.exists(installed_path("mm", "bash")))
+
+    def test_refresh_stale_script(self):
+        """Test that installed scripts are regenerated when the key changes"""
+        path = install_completion(self.cli, "bash")
+        self.assertEqual(refresh_completions(self.cli), [])
+        with patch.object(CliCore, "spec_key", "changed"):
+            self.assertEqual(refresh_completions(self.cli), ["bash"])
+        with open(path) as f:
+            self.assertIn("# spec-key: changed", f.read())
+
+    def test_spec_key_tracks_argument_sources(self):
+        """Test that the key covers the global args file and the modules generating flags"""
+        path = os.path.join(self.cache.name, "cli.py")
+        with open(path, "w") as f:
+            f.write("GLOBAL_ARGS = []\n")
+        cli = CliCore("mm", COMMANDS, "Test CLI", "1.0", GLOBAL_ARGS, spec_paths=[path])
+        before = cli.spec_key
+        self.assertNotEqual(before, self.cli.spec_key)
+        with open(path, "w") as f:
+            f.write("GLOBAL_ARGS = [['--new']]\n")
+        self.assertNotEqual(cli.spec_key, before)
+        key = self.cli.spec_key
+        with patch("modmaker._cli_core.SPEC_SOURCES", ()):
+            self.assertNotEqual(self.cli.spec_key, key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the create command
+"""
+
+import unittest
+from unittest.mock import patch
+import importlib.util
+import os
+import sys
+import tempfile
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._cli_modules.create import Create
+from modmaker._exceptions import ModmakerError, ProjectExistsError, TemplateError
+
+
+class TestCreate(unittest.TestCase):
+    """Test cases for the create command"""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(temp_dir.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_project(self):
+        """Test that a project is generated in the current directory"""
+        self.assertTrue(Create().project("demo"))
+        self.assertTrue(os.path.isfile(os.path.join("demo", "demo", "_cli.py")))
+        self.assertTrue(os.path.isfile(os.path.join("demo", "pyproject.toml")))
+
+    def test_existing_project_raises(self):
+        """Test that an existing directory raises instead of exiting"""
+        os.mkdir("demo")
+        with self.assertRaises(ProjectExistsError) as ctx:
+            Create().project("demo")
+        self.assertEqual(ctx.exception.project, "demo")
+        self.assertEqual(ctx.exception.exit_code, 1)
+        self.assertIsInstance(ctx.exception, ModmakerError)
+
+    def test_template_dir(self):
+        """Test generating from other templates"""
+        template = os.path.join("tpl", "{{PROJECT_NAME}}")
+        os.makedirs(template)
+        with open(os.path.join(template, "about.txt"), "w") as f:
+            f.write("{{PROJECT_NAME}} by {{AUTHOR}}")
+        create = Create()
+        create.template_dir = os.path.abspath("tpl")
+        create.project("demo")
+        with open(os.path.join("demo", "demo", "about.txt")) as f:
+            self.assertEqual(f.read(), "demo by Your Name")
+        create.template_dir = os.path.abspath("missing")
+        with self.assertRaises(TemplateError):
+            create.project("other")
+
+    def test_render_in_memory(self):
+        """Test that text files are rendered, other files copied as is, each written once"""
+        os.makedirs(os.path.join("tpl", "docs"))
+        with open(os.path.join("tpl", "docs", "readme.md"), "wb") as f:
+            f.write(b"# {{PROJECT_NAME}}\r\nline\r\n")
+        with open(os.path.join("tpl", "logo.png"), "wb") as f:
+            f.write(b"\x89PNG {{PROJECT_NAME}}")
+        with open(os.path.join("tpl", "bad.txt"), "wb") as f:
+            f.write(b"\xff {{PROJECT_NAME}}")
+        create = Create()
+        create.template_dir = os.path.abspath("tpl")
+        with patch("modmaker._cli_modules.create.os.walk") as walk:
+            create.project("demo")
+        walk.assert_not_called()
+        with open(os.path.join("demo", "docs", "readme.md"), "rb") as f:
+            self.assertEqual(f.read(), b"# demo\nline\n")
+        with open(os.path.join("demo", "logo.png"), "rb") as f:
+            self.assertEqual(f.read(), b"\x89PNG {{PROJECT_NAME}}")
+        with open(os.path.join("demo", "bad.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"\xff {{PROJECT_NAME}}")
+
+    def test_generated_common_utils(self):
+        """Test that the generated copy helper imports and copies a tree"""
+        Create().project("demo")
+        spec = importlib.util.spec_from_file_location(
+            "demo_common_utils", os.path.join("demo", "demo", "_common_utils.py")
+        )
+        common_utils = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(common_utils)
+        os.makedirs(os.path.join("src", "sub"))
+        with open(os.path.join("src", "sub", "a.txt"), "w") as f:
+            f.write("a")
+        with open(os.path.join("src", "b.txt"), "w") as f:
+            f.write("b")
+        self.assertTrue(common_utils.copy_directory_contents("src", "dest"))
+        with open(os.path.join("dest", "sub", "a.txt")) as f:
+            self.assertEqual(f.read(), "a")
+        self.assertTrue(os.path.isfile(os.path.join("dest", "b.txt")))
+
+    def test_many_projects_in_one_process(self):
+        """Test that a failing project does not stop the following ones"""
+        os.mkdir("b")
+        failed = []
+        for name in ("a", "b", "c"):
+            try:
+                Create().project(name)
+            except ModmakerError:
+                failed.append(name)
+        self.assertEqual(failed, ["b"])
+        self.assertTrue(os.path.isdir(os.path.join("c", "c")))
+
+
+if __name__ == "__main__":
+    unittest.main()
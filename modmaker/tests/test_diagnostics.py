@@ -0,0 +1,119 @@
+"""
+Unit tests for _diagnostics.py and the doctor command
+"""
+
+import unittest
+from unittest.mock import patch
+import io
+import os
+import sys
+import tempfile
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._diagnostics import (
+    Comparison,
+    compare,
+    format_table,
+    import_times,
+    load_baseline,
+    measure_cli,
+    parse_importtime,
+    save_baseline,
+)
+from modmaker._instrument import phase
+from modmaker._cli_modules.doctor import Doctor
+
+IMPORTTIME = (
+    "import time: self [us] | cumulative | imported package\n"
+    "import time:      1000 |       1000 |   modmaker._logger\n"
+    "import time:       500 |       2500 |   modmaker._cli_core\n"
+    "import time:       300 |       4000 | modmaker._cli\n"
+    "import time:       200 |        200 |   fancylib.core\n"
+    "import time:       100 |        300 | fancylib\n"
+    "import time:      7000 |       9000 | importlib.metadata\n"
+)
+
+
+class TestDiagnostics(unittest.TestCase):
+    """Test cases for start-up diagnostics"""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        patcher = patch.dict(os.environ, {"MODMAKER_CACHE_DIR": temp_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_import_times(self):
+        """Test that modmaker modules, metadata and third-party imports are reported"""
+        results = import_times(parse_importtime(IMPORTTIME))
+        self.assertEqual(results["import modmaker._cli"], 4.0)
+        self.assertEqual(results["import modmaker._cli_core"], 2.5)
+        self.assertEqual(results["import modmaker._logger"], 1.0)
+        self.assertEqual(results["import importlib.metadata"], 9.0)
+        self.assertNotIn("import modmaker._cli_modules", results)
+        if hasattr(sys, "stdlib_module_names"):
+            self.assertEqual(results["import fancylib (third-party)"], 0.3)
+            self.assertNotIn("import fancylib.core (third-party)", results)
+
+    def test_measure_cli(self):
+        """Test that the CliCore phases and the plugin scan are timed"""
+        def build():
+            for name in ("plugin_discovery", "build_args", "build_parser"):
+                with phase(name):
+                    pass
+
+        results = measure_cli(build, lambda: [], repeat=2)
+        for name in ("build CLI (total)", "plugin discovery (cached index)",
+                     "_build_args introspection", "parser build", "plugin scan (uncached)"):
+            self.assertGreaterEqual(results[name], 0)
+
+    def test_compare(self):
+        """Test that only slowdowns above the margin and the noise floor regress"""
+        rows = compare(
+            {"a": 20.0, "b": 1.5, "c": 11.0, "d": 5.0},
+            {"a": 10.0, "b": 1.0, "c": 10.0},
+            margin=25,
+        )
+        self.assertEqual([row.regressed for row in rows], [True, False, False, False])
+        self.assertIsNone(rows[3].baseline)
+
+    def test_format_table(self):
+        """Test the table of measurements"""
+        table = format_table([Comparison("import x", 20.0, 10.0, True), Comparison("y", 1.0, None, False)])
+        lines = table.splitlines()
+        self.assertIn("+100%", lines[1])
+        self.assertIn("REGRESSION", lines[1])
+        self.assertNotIn("REGRESSION", lines[2])
+
+    def test_baseline(self):
+        """Test storing and reading the baseline"""
+        self.assertEqual(load_baseline(), {})
+        path = save_baseline({"a": 1.5})
+        self.assertTrue(os.path.isfile(path))
+        self.assertEqual(load_baseline(), {"a": 1.5})
+        self.assertEqual(load_baseline(path), {"a": 1.5})
+
+    def test_doctor(self):
+        """Test that doctor without --timings only reports the installation"""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            Doctor()
+        self.assertIn("modmaker", stdout.getvalue())
+        self.assertIn("cache: " + os.environ["MODMAKER_CACHE_DIR"], stdout.getvalue())
+
+    @patch("modmaker._diagnostics.measure_imports", return_value={"import modmaker._cli": 50.0})
+    def test_doctor_timings(self, mock_imports):
+        """Test that doctor --timings flags regressions against the baseline"""
+        save_baseline({"import modmaker._cli": 10.0})
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                self.assertLogs("modmaker._cli_modules.doctor", "WARNING") as logs:
+            Doctor(timings=True, repeat=1)
+        self.assertIn("REGRESSION", stdout.getvalue())
+        self.assertIn("parser build", stdout.getvalue())
+        self.assertIn("import modmaker._cli", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
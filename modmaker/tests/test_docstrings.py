@@ -0,0 +1,119 @@
+"""
+Unit tests for _docstrings.py
+"""
+
+import unittest
+import os
+import sys
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._cli_core import CliCore
+from modmaker._docstrings import parse_docstring
+
+
+class TestParseDocstring(unittest.TestCase):
+    """Test cases for docstring parsing"""
+
+    def test_sphinx(self):
+        """Test Sphinx style fields"""
+        doc = parse_docstring(
+            """
+            Create a project
+
+            :param name: Project name
+                spanning two lines
+            :param int count: How many
+            :type name: str
+            :returns: Nothing
+            """
+        )
+        self.assertEqual(doc.summary, "Create a project")
+        self.assertEqual(doc.description, ("Create a project",))
+        self.assertEqual(doc.params["name"].help, "Project name spanning two lines")
+        self.assertEqual(doc.params["name"].type, "str")
+        self.assertEqual(doc.params["count"].type, "int")
+
+    def test_google(self):
+        """Test Google style sections"""
+        doc = parse_docstring(
+            """Initialize the CLI core.
+
+            Args:
+                prog_name (str): The program name
+                version (str, optional): Version string.
+                    Defaults to None.
+                *args: Extra values
+
+            Returns:
+                bool: Success status
+            """
+        )
+        self.assertEqual(doc.description, ("Initialize the CLI core.",))
+        self.assertEqual(doc.params["prog_name"], ("The program name", "str"))
+        self.assertEqual(doc.params["version"].help, "Version string. Defaults to None.")
+        self.assertEqual(doc.params["version"].type, "str")
+        self.assertEqual(doc.params["args"].help, "Extra values")
+        self.assertNotIn("bool", doc.params)
+
+    def test_numpy(self):
+        """Test NumPy style sections"""
+        doc = parse_docstring(
+            """
+            Render a template
+
+            Parameters
+            ----------
+            path : str
+                Template path
+            count : int, optional
+                How many copies
+
+            Returns
+            -------
+            bool
+                Success
+            """
+        )
+        self.assertEqual(doc.summary, "Render a template")
+        self.assertEqual(doc.params["path"], ("Template path", "str"))
+        self.assertEqual(doc.params["count"], ("How many copies", "int"))
+        self.assertNotIn("bool", doc.params)
+
+    def test_empty(self):
+        """Test missing docstrings"""
+        doc = parse_docstring(None)
+        self.assertEqual(doc.summary, "")
+        self.assertEqual(dict(doc.params), {})
+
+    def test_cached(self):
+        """Test that a docstring is parsed only once"""
+        doc = "Cached\n\n:param x: value\n"
+        self.assertIs(parse_docstring(doc), parse_docstring(doc))
+
+
+class TestCliCoreDocstrings(unittest.TestCase):
+    """Test cases for docstring driven CLI help"""
+
+    def test_google_param_help(self):
+        """Test that Google style commands get parameter help and types"""
+
+        def command(name, count=1):
+            """
+            Run the command
+
+            Args:
+                name (str): Who to greet
+                count (int): How many times
+            """
+
+        params = dict((tuple(flags), kwargs) for flags, kwargs in CliCore._get_params(command))
+        self.assertEqual(params[("name",)]["help"], "Who to greet")
+        self.assertEqual(params[("-c", "--count")]["help"], "How many times")
+        self.assertIs(params[("-c", "--count")]["type"], int)
+        self.assertEqual(CliCore._get_help(command), "Run the command")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+"""
+Unit tests for _fanout.py and fan-out support in CliCore
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import types
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._cli_core import CliCore
+from modmaker._exceptions import ModmakerError, UsageError
+from modmaker._fanout import (
+    FanOutResult,
+    FanOutResults,
+    dispatch,
+    fan_out,
+    get_fan_out_param,
+    read_targets,
+)
+
+WORKER_SOURCE = '''
+import os
+
+from modmaker._fanout import fan_out
+
+
+class Build:
+    """
+    Build projects
+    """
+
+    def __init__(self):
+        pass
+
+    @fan_out("name")
+    def project(self, name: str):
+        """
+        :param name: Project to build
+        """
+        if name == "bad":
+            raise ValueError("cannot build bad")
+        return (name, os.getpid(), id(self))
+'''
+
+
+class Build:
+    """
+    Build projects
+    """
+
+    instances = 0
+
+    def __init__(self):
+        Build.instances += 1
+
+    @fan_out("name")
+    def project(self, name: str, release: bool = False):
+        """
+        :param name: Project to build
+        :param release: Build in release mode
+        """
+        if name == "exit":
+            sys.exit(3)
+        if name == "broken":
+            raise ModmakerError("broken target", exit_code=4)
+        if name == "bad":
+            raise ValueError("cannot build bad")
+        return (name, release, threading.get_ident())
+
+    @fan_out("repo")
+    async def check(self, repo: str):
+        """
+        :param repo: Repository to check
+        """
+        await asyncio.sleep(0)
+        return repo.upper()
+
+
+COMMANDS = types.ModuleType("commands")
+COMMANDS.Build = Build
+
+GLOBAL_ARGS = [
+    [["--jobs"], {"type": int, "default": 1, "dest": "_jobs"}],
+    [["--pool"], {"default": "thread", "dest": "_pool"}],
+]
+
+
+class TestFanOut(unittest.TestCase):
+    """Test cases for fanned-out commands"""
+
+    def setUp(self):
+        self.cli = CliCore("mm", COMMANDS, "Test CLI", "1.0", GLOBAL_ARGS)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_decorator(self):
+        """Test that the fan-out parameter is recorded on the function"""
+        self.assertEqual(get_fan_out_param(Build.project), "name")
+        self.assertIsNone(get_fan_out_param(Build.__init__))
+
+    def test_arguments(self):
+        """Test that the parameter repeats and gets a file option"""
+        params = {flags[-1]: kwargs for flags, kwargs in self.cli.args["commands"]["build"]["subcommands"]["project"]}
+        self.assertEqual(params["name"]["nargs"], "*")
+        self.assertEqual(params["--name-file"]["dest"], "_fan_out_file")
+
+    def test_read_targets(self):
+        """Test reading targets from a file"""
+        path = os.path.join(self.temp_dir.name, "targets.txt")
+        with open(path, "w") as f:
+            f.write("one\n\n# comment\n  two  \n")
+        self.assertEqual(read_targets(path), ["one", "two"])
+
+    def test_results_in_order(self):
+        """Test that thread pool results keep the target order"""
+        targets = [f"p{i}" for i in range(50)]
+        self.cli.parse(["--jobs", "8", "build", "project", "--release"] + targets)
+        results = self.cli.run()
+        self.assertEqual([r.target for r in results], targets)
+        self.assertEqual([r.value[0] for r in results], targets)
+        self.assertTrue(all(r.value[1] for r in results))
+        self.assertEqual(results.exit_code, 0)
+
+    def test_command_instantiated_once(self):
+        """Test that one command instance serves all targets"""
+        before = Build.instances
+        self.cli.parse(["--jobs", "4", "build", "project", "a", "b", "c", "d"])
+        self.cli.run()
+        self.assertEqual(Build.instances, before + 1)
+
+    def test_targets_from_file(self):
+        """Test combining command line and file targets"""
+        path = os.path.join(self.temp_dir.name, "targets.txt")
+        with open(path, "w") as f:
+            f.write("b\nc\n")
+        self.cli.parse(["build", "project", "a", "--name-file", path])
+        self.assertEqual([r.target for r in self.cli.run()], ["a", "b", "c"])
+
+    def test_failures_aggregated(self):
+        """Test that failures become exit codes instead of stopping the run"""
+        self.cli.parse(["--jobs", "2", "build", "project", "ok", "bad", "exit"])
+        results = self.cli.run()
+        self.assertEqual([r.exit_code for r in results], [0, 1, 3])
+        self.assertEqual(results[1].error, "cannot build bad")
+        self.assertEqual(results.exit_code, 3)
+        self.assertEqual([r.target for r in results.failed], ["bad", "exit"])
+
+    def test_modmaker_error_exit_code(self):
+        """Test that a ModmakerError fails its target with its exit code"""
+        self.cli.parse(["--jobs", "2", "build", "project", "ok", "broken"])
+        results = self.cli.run()
+        self.assertEqual(results[1], FanOutResult("broken", 4, None, "broken target"))
+        self.assertEqual(results.exit_code, 4)
+
+    def test_summary_only_for_several_targets(self):
+        """Test that a single target does not log the fan-out summary"""
+        self.cli.parse(["build", "project", "a"])
+        with self.assertLogs("modmaker._fanout", level="DEBUG") as logs:
+            self.cli.run()
+        self.assertFalse(any("targets succeeded" in line for line in logs.output))
+        self.cli.parse(["build", "project", "a", "b"])
+        with self.assertLogs("modmaker._fanout", level="INFO") as logs:
+            self.cli.run()
+        self.assertIn("2 of 2 targets succeeded", logs.output[-1])
+
+    def test_no_targets(self):
+        """Test that a fan-out without targets is an error"""
+        self.cli.parse(["build", "project"])
+        with self.assertRaises(UsageError):
+            self.cli.run()
+
+    def test_async_fan_out(self):
+        """Test that async commands fan out on one event loop"""
+        self.cli.parse(["--jobs", "2", "build", "check", "x", "y"])
+        self.assertEqual([r.value for r in self.cli.run()], ["X", "Y"])
+
+    def test_process_pool(self):
+        """Test dispatching on a process pool with importable commands"""
+        with open(os.path.join(self.temp_dir.name, "mm_fanout_worker.py"), "w") as f:
+            f.write(WORKER_SOURCE)
+        sys.path.insert(0, self.temp_dir.name)
+        self.addCleanup(sys.path.remove, self.temp_dir.name)
+        self.addCleanup(sys.modules.pop, "mm_fanout_worker", None)
+        import mm_fanout_worker  # pylint: disable=import-error
+
+        commands = types.ModuleType("commands")
+        commands.Build = mm_fanout_worker.Build
+        cli = CliCore("mm", commands, "Test CLI", "1.0", GLOBAL_ARGS)
+        cli.parse(["--jobs", "2", "--pool", "process", "build", "project", "a", "bad", "c"])
+        results = cli.run()
+        self.assertEqual([r.exit_code for r in results], [0, 1, 0])
+        self.assertEqual(results[0].value[0], "a")
+        self.assertNotEqual(results[0].value[1], os.getpid())
+        # Each pool process instantiates the command once
+        instances = {}
+        for result in results:
+            if result.value:
+                instances.setdefault(result.value[1], set()).add(result.value[2])
+        self.assertTrue(all(len(ids) == 1 for ids in instances.values()))
+
+    def test_process_pool_needs_no_cli(self):
+        """Test that commands asking for the running CLI are not sent to pool processes"""
+
+        class Shell:
+            """
+            Run commands
+            """
+
+            def __init__(self):
+                pass
+
+            @fan_out("name")
+            def run(self, name: str, _cli=None):
+                """
+                :param name: Command to run
+                """
+                return _cli
+
+        commands = types.ModuleType("commands")
+        commands.Shell = Shell
+        cli = CliCore("mm", commands, "Test CLI", "1.0", GLOBAL_ARGS)
+        cli.parse(["--jobs", "2", "shell", "run", "a", "b"])
+        self.assertTrue(all(result.value is cli for result in cli.run()))
+        cli.parse(["--jobs", "2", "--pool", "process", "shell", "run", "a", "b"])
+        with self.assertRaises(UsageError):
+            cli.run()
+
+    def test_dispatch_unknown_pool(self):
+        """Test that unknown pools are rejected"""
+        with self.assertRaises(ValueError):
+            dispatch(str, ["a"], 2, "fiber")
+
+    def test_results_exit_code(self):
+        """Test the aggregated exit code of empty and mixed results"""
+        self.assertEqual(FanOutResults().exit_code, 0)
+        results = FanOutResults([FanOutResult("a", 0, None, None), FanOutResult("b", 2, None, None)])
+        self.assertEqual(results.exit_code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Unit tests for _help.py
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import tempfile
+import types
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._cache import cache_path
+from modmaker._cli_core import CliCore
+from modmaker._help import cached_help, help_key
+
+
+class Create:
+    """
+    Create things
+    """
+
+    def __init__(self):
+        pass
+
+    def project(self, name: str):
+        """
+        :param name: Project name
+        """
+
+
+COMMANDS = types.ModuleType("commands")
+COMMANDS.Create = Create
+
+
+class TestHelp(unittest.TestCase):
+    """Test cases for the pre-rendered top-level help"""
+
+    def setUp(self):
+        self.cache = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {"MODMAKER_CACHE_DIR": self.cache.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.cache.cleanup)
+
+    def test_help_key_matches_spec_key(self):
+        """Test that the key is computed like CliCore.spec_key"""
+        cli = CliCore("mm", COMMANDS, "Test CLI", "1.0", spec_paths=[__file__])
+        self.assertEqual(help_key("mm", COMMANDS, "1.0", paths=[__file__]), cli.spec_key)
+        self.assertNotEqual(help_key("mm", COMMANDS, "1.0"), cli.spec_key)
+        self.assertNotEqual(help_key("mm", COMMANDS, "1.1"), cli.spec_key)
+        self.assertNotEqual(help_key("mm", COMMANDS, "1.0", parts=[80]), cli.spec_key)
+
+    def test_help_key_tracks_extra_paths(self):
+        """Test that extra files the help depends on change the key"""
+        path = os.path.join(self.cache.name, "cli.py")
+        with open(path, "w") as f:
+            f.write("A = 1\n")
+        before = help_key("mm", COMMANDS, paths=[path])
+        with open(path, "w") as f:
+            f.write("A = 22\n")
+        self.assertNotEqual(help_key("mm", COMMANDS, paths=[path]), before)
+
+    def test_cached_help(self):
+        """Test that help is rendered once per key"""
+        render = MagicMock(return_value="usage: mm\n")
+        self.assertEqual(cached_help("mm", "k1", render), "usage: mm\n")
+        self.assertEqual(cached_help("mm", "k1", render), "usage: mm\n")
+        render.assert_called_once()
+        render.return_value = "usage: mm new\n"
+        self.assertEqual(cached_help("mm", "k2", render), "usage: mm new\n")
+        self.assertEqual(render.call_count, 2)
+
+    def test_cached_help_corrupt(self):
+        """Test that an unreadable cache file is regenerated"""
+        os.makedirs(os.path.dirname(cache_path("help", "mm.json")))
+        with open(cache_path("help", "mm.json"), "w") as f:
+            f.write("{not json")
+        self.assertEqual(cached_help("mm", "k1", lambda: "usage\n"), "usage\n")
+        self.assertEqual(cached_help("mm", "k1", lambda: "other\n"), "usage\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Unit tests for _ignore.py
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._ignore import IGNORE_FILE, IgnoreMatcher, load_matcher, parse_patterns
+
+
+def matcher(*lines):
+    return IgnoreMatcher(parse_patterns(lines))
+
+
+class TestIgnoreMatcher(unittest.TestCase):
+    """Test cases for gitignore semantics"""
+
+    def test_unanchored_patterns_match_at_any_depth(self):
+        """Test that patterns without a slash match the last components"""
+        rules = matcher("*.log", "scratch")
+        self.assertTrue(rules.ignored("build.log"))
+        self.assertTrue(rules.ignored("a/b/build.log"))
+        self.assertTrue(rules.ignored("a/scratch", is_dir=True))
+        self.assertTrue(rules.ignored("scratch"))
+        self.assertFalse(rules.ignored("build.log.txt"))
+        self.assertFalse(rules.ignored("scratchpad"))
+
+    def test_anchored_patterns(self):
+        """Test that patterns with a slash are relative to the root"""
+        rules = matcher("/docs", "src/*.tmp")
+        self.assertTrue(rules.ignored("docs", is_dir=True))
+        self.assertFalse(rules.ignored("a/docs", is_dir=True))
+        self.assertTrue(rules.ignored("src/x.tmp"))
+        self.assertFalse(rules.ignored("a/src/x.tmp"))
+        self.assertFalse(rules.ignored("src/a/x.tmp"))
+
+    def test_double_star(self):
+        """Test leading, trailing and inner ** patterns"""
+        rules = matcher("**/cache", "out/**", "a/**/z.py")
+        self.assertTrue(rules.ignored("cache", is_dir=True))
+        self.assertTrue(rules.ignored("x/y/cache", is_dir=True))
+        self.assertTrue(rules.ignored("out/a/b.txt"))
+        self.assertFalse(rules.ignored("out", is_dir=True))
+        self.assertTrue(rules.ignored("a/z.py"))
+        self.assertTrue(rules.ignored("a/b/c/z.py"))
+        self.assertFalse(rules.ignored("b/a/z.py"))
+
+    def test_wildcards_and_classes(self):
+        """Test that * and ? stay within one component and classes match"""
+        rules = matcher("f?le.*", "[!a-c]x.py", "*.py[co]")
+        self.assertTrue(rules.ignored("file.txt"))
+        self.assertFalse(rules.ignored("fiile.txt"))
+        self.assertTrue(rules.ignored("dx.py"))
+        self.assertFalse(rules.ignored("ax.py"))
+        self.assertTrue(rules.ignored("m.pyc"))
+        self.assertFalse(rules.ignored("m.py"))
+        self.assertFalse(matcher("a*b").ignored("a/b"))
+
+    def test_directories_only(self):
+        """Test that a trailing slash only matches directories"""
+        rules = matcher("tmp/")
+        self.assertTrue(rules.ignored("tmp", is_dir=True))
+        self.assertFalse(rules.ignored("tmp"))
+
+    def test_negation_last_match_wins(self):
+        """Test that ! re-includes paths and the last matching rule decides"""
+        rules = matcher("*.md", "!README.md", "docs/README.md")
+        self.assertTrue(rules.ignored("notes.md"))
+        self.assertFalse(rules.ignored("README.md"))
+        self.assertTrue(rules.ignored("docs/README.md"))
+
+    def test_comments_escapes_and_spaces(self):
+        """Test comments, blank lines, escapes and trailing spaces"""
+        rules = matcher("# comment", "", "\\#hash", "\\!bang", "trail   ", "space\\ ")
+        self.assertTrue(rules.ignored("#hash"))
+        self.assertTrue(rules.ignored("!bang"))
+        self.assertTrue(rules.ignored("trail"))
+        self.assertTrue(rules.ignored("space "))
+        self.assertFalse(rules.ignored("# comment"))
+
+    def test_load_matcher(self):
+        """Test the default rules, the ignore file and recompiling when it changes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            defaults = load_matcher(temp_dir)
+            self.assertTrue(defaults.ignored(".DS_Store"))
+            self.assertTrue(defaults.ignored("pkg/__pycache__", is_dir=True))
+            self.assertTrue(defaults.ignored("pkg/mod.pyc"))
+            self.assertFalse(defaults.ignored("pkg/mod.py"))
+            path = os.path.join(temp_dir, IGNORE_FILE)
+            with open(path, "w") as f:
+                f.write("*.big\n!.DS_Store\n")
+            rules = load_matcher(temp_dir)
+            self.assertIs(load_matcher(temp_dir), rules)
+            self.assertTrue(rules.ignored("data.big"))
+            self.assertTrue(rules.ignored(IGNORE_FILE))
+            self.assertFalse(rules.ignored(".DS_Store"))
+            with open(path, "w") as f:
+                f.write("*.bigger\n")
+            self.assertFalse(load_matcher(temp_dir).ignored("data.big"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Import-time budget for the modmaker startup path
+
+``modmaker --version`` and ``modmaker -h`` are run under ``python -X importtime``
+and fail when the imports done by modmaker exceed the budget, or when a module
+that is only needed by some commands is imported eagerly.
+"""
+
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from modmaker._diagnostics import parse_importtime
+
+# Total import time, in milliseconds, allowed for modmaker and everything it imports.
+# Override with MODMAKER_IMPORT_BUDGET_MS on unusually slow machines.
+IMPORT_BUDGET_MS = float(os.environ.get("MODMAKER_IMPORT_BUDGET_MS", "150"))
+
+# Modules only needed by specific commands; they must be imported lazily
+LAZY_MODULES = ("requests", "asyncio", "concurrent.futures", "readline", "importlib.metadata",
+                "tracemalloc", "http.server")
+
+
+def modmaker_import_ms(entries):
+    """Sum the top-level imports made from the moment modmaker is first imported"""
+    names = [name for name, _, _ in entries]
+    start = names.index("modmaker")
+    return sum(cumulative for _, depth, cumulative in entries[start:] if depth == 0) / 1000.0
+
+
+class TestImportTime(unittest.TestCase):
+    """Test cases for the startup import budget"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _importtime(self, *args):
+        env = dict(os.environ, MODMAKER_CACHE_DIR=self.temp_dir.name)
+        command = [sys.executable, "-X", "importtime", "-m", "modmaker"] + list(args)
+        # The first run fills the plugin cache, as after installation
+        subprocess.run(command, cwd=PROJECT_ROOT, env=env, capture_output=True, check=False)
+        result = subprocess.run(
+            command, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=False
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return parse_importtime(result.stderr)
+
+    def _assert_budget(self, *args):
+        entries = self._importtime(*args)
+        imported = {name for name, _, _ in entries}
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, imported, f"{module} imported by 'modmaker {' '.join(args)}'")
+        total = modmaker_import_ms(entries)
+        self.assertLess(
+            total,
+            IMPORT_BUDGET_MS,
+            f"'modmaker {' '.join(args)}' spent {total:.1f}ms importing modules",
+        )
+
+    def test_version(self):
+        """Test the import budget of modmaker --version"""
+        self._assert_budget("--version")
+
+    def test_help(self):
+        """Test the import budget of modmaker -h"""
+        self._assert_budget("-h")
+
+    def test_parse_importtime(self):
+        """Test parsing of -X importtime output"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 | site\n"
+            "import time:        50 |         50 |   modmaker._version\n"
+            "import time:       200 |        250 | modmaker\n"
+            "import time:        30 |         30 | json\n"
+        )
+        entries = parse_importtime(stderr)
+        self.assertEqual(entries[1], ("modmaker._version", 1, 50))
+        self.assertEqual(modmaker_import_ms(entries), 0.28)
+
+
+if __name__ == "__main__":
+    unittest.main()
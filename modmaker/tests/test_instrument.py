@@ -0,0 +1,107 @@
+"""
+Unit tests for _instrument.py
+"""
+
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._instrument import (
+    Observer,
+    add_observer,
+    file_done,
+    observing,
+    phase,
+    remove_observer,
+)
+
+
+class Recorder(Observer):
+    """Observer keeping everything it is told"""
+
+    def __init__(self):
+        self.started = []
+        self.phases = []
+        self.files = []
+
+    def phase_started(self, name, attrs):
+        self.started.append((name, attrs))
+
+    def phase_finished(self, record):
+        self.phases.append(record)
+
+    def file_finished(self, record):
+        self.files.append(record)
+
+
+class TestInstrument(unittest.TestCase):
+    """Test cases for phase and file instrumentation"""
+
+    def setUp(self):
+        self.recorder = Recorder()
+        add_observer(self.recorder)
+        self.addCleanup(remove_observer, self.recorder)
+
+    def test_no_observers(self):
+        """Test that nothing is recorded once the observer is removed"""
+        remove_observer(self.recorder)
+        self.assertFalse(observing())
+        self.assertIs(phase("copy"), phase("render"))
+        with phase("copy"):
+            file_done("a.py", time.perf_counter(), written=3)
+        self.assertEqual(self.recorder.phases, [])
+        self.assertEqual(self.recorder.files, [])
+
+    def test_phase_and_files(self):
+        """Test that phases are timed and files attributed to their phase"""
+        self.assertTrue(observing())
+        with phase("copy", project="demo"):
+            started = time.perf_counter()
+            file_done("a.py", started, read=1, written=2)
+        file_done("b.py", time.perf_counter())
+        self.assertEqual(self.recorder.started, [("copy", {"project": "demo"})])
+        record = self.recorder.phases[0]
+        self.assertEqual(record.name, "copy")
+        self.assertEqual(record.attrs, {"project": "demo"})
+        self.assertGreaterEqual(record.wall, 0)
+        self.assertGreaterEqual(record.cpu, 0)
+        self.assertEqual([(f.path, f.phase, f.read, f.written) for f in self.recorder.files],
+                         [("a.py", "copy", 1, 2), ("b.py", None, 0, 0)])
+
+    def test_nested_phases_per_thread(self):
+        """Test that the current phase is restored and kept per thread"""
+        seen = []
+
+        def worker():
+            file_done("thread.py", time.perf_counter())
+            seen.append(self.recorder.files[-1].phase)
+
+        with phase("outer"):
+            with phase("inner"):
+                thread = threading.Thread(target=worker)
+                thread.start()
+                thread.join()
+            file_done("outer.py", time.perf_counter())
+        self.assertEqual(seen, [None])
+        self.assertEqual(self.recorder.files[-1].phase, "outer")
+        self.assertEqual([p.name for p in self.recorder.phases], ["inner", "outer"])
+
+    def test_phase_recorded_on_error(self):
+        """Test that a failing phase is still recorded, with its error"""
+        with self.assertRaises(ValueError):
+            with phase("render"):
+                raise ValueError("boom")
+        with phase("copy"):
+            pass
+        self.assertEqual(self.recorder.phases[0].name, "render")
+        self.assertEqual(self.recorder.phases[0].error, "ValueError")
+        self.assertIsNone(self.recorder.phases[1].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,11 @@ Unit tests for _logger.py
 
 import unittest
 from unittest.mock import patch, MagicMock
+import io
+import json
 import logging
+import threading
+from logging.handlers import QueueHandler
 
 # Add the parent directory to the path so Python can find the modules
 import os
@@ -12,9 +16,20 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import module directly using relative imports
-from _logger import (
+from modmaker._logger import (
     init_modmaker_cli_logger,
+    buffered_records,
+    log_event,
+    progress_level,
+    set_log_format,
+    start_log_buffer,
+    start_queued_logging,
+    stop_log_buffer,
+    stop_queued_logging,
     AppFilter,
+    CliFormatter,
+    JsonFormatter,
+    PrintMsg,
 )
 
 
@@ -44,6 +59,35 @@ class TestLogger(unittest.TestCase):
         # Check that record is modified with color_loglevel attribute
         self.assertTrue(hasattr(record, 'color_loglevel'))
 
+    def test_app_filter_nametag(self):
+        """Test that a nametag attribute replaces the level prefix"""
+        record = logging.makeLogRecord({"levelno": logging.INFO, "levelname": "INFO", "nametag": "tag"})
+        AppFilter().filter(record)
+        self.assertEqual(record.color_loglevel, "tag")
+
+    def test_cli_formatter(self):
+        """Test that CliFormatter matches the filter and %-style formatter output"""
+        legacy = logging.Formatter("%(color_loglevel)s%(message)s")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+        records = [
+            logging.makeLogRecord({"levelno": level, "levelname": logging.getLevelName(level),
+                                   "msg": "Wrote %s", "args": ("a.py",)})
+            for level in (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+        ]
+        records.append(logging.makeLogRecord({"levelno": logging.INFO, "levelname": "INFO",
+                                              "msg": "tagged", "nametag": PrintMsg.NAMETAG}))
+        records.append(logging.makeLogRecord({"levelno": logging.ERROR, "levelname": "ERROR",
+                                              "msg": "failed\n", "exc_info": exc_info}))
+        for record in records:
+            fast = CliFormatter().format(record)
+            record.exc_text = None
+            AppFilter().filter(record)
+            self.assertEqual(fast, legacy.format(record))
+        self.assertEqual(CliFormatter().format(records[1]), PrintMsg.INFO + "Wrote a.py")
+
     def test_init_modmaker_cli_logger_default(self):
         """Test logger initialization with default settings"""
         # Create new logger with default settings
@@ -81,5 +125,223 @@ class TestLogger(unittest.TestCase):
         self.assertEqual(logger.level, logging.INFO)
 
 
+class TestQueuedLogging(unittest.TestCase):
+    """Test cases for queue-based logging"""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.log = logging.getLogger("modmaker_test_queued")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(CliFormatter())
+        self.log.addHandler(self.handler)
+        self.addCleanup(self.log.removeHandler, self.handler)
+        self.addCleanup(stop_queued_logging, self.log)
+
+    def test_start_and_stop(self):
+        """Test that handlers move behind the queue and back"""
+        self.assertTrue(start_queued_logging(self.log))
+        self.assertFalse(start_queued_logging(self.log))
+        self.assertNotIn(self.handler, self.log.handlers)
+        self.assertTrue(stop_queued_logging(self.log))
+        self.assertFalse(stop_queued_logging(self.log))
+        self.assertIn(self.handler, self.log.handlers)
+        self.assertFalse([h for h in self.log.handlers if isinstance(h, QueueHandler)])
+
+    def test_records_from_threads_flushed(self):
+        """Test that every record from worker threads is written on stop"""
+        start_queued_logging(self.log)
+
+        def worker(name):
+            for index in range(200):
+                self.log.info("%s %d", name, index)
+
+        threads = [threading.Thread(target=worker, args=(f"w{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stop_queued_logging(self.log)
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 800)
+        for n in range(4):
+            ordered = [line for line in lines if f" w{n} " in line]
+            self.assertEqual(ordered, [f"{PrintMsg.INFO}w{n} {i}" for i in range(200)])
+
+    def test_arguments_and_exceptions(self):
+        """Test that arguments are merged when enqueued and tracebacks formatted"""
+        start_queued_logging(self.log)
+        value = ["before"]
+        self.log.info("value %s", value)
+        value[0] = "after"
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.log.error("failed", exc_info=True)
+        stop_queued_logging(self.log)
+        output = self.stream.getvalue()
+        self.assertIn("value ['before']", output)
+        self.assertIn(PrintMsg.ERROR + "failed\nTraceback", output)
+        self.assertIn("ValueError: boom", output)
+
+    def test_handler_level_respected(self):
+        """Test that handler levels still apply behind the queue"""
+        self.handler.setLevel(logging.WARNING)
+        start_queued_logging(self.log)
+        self.log.info("hidden")
+        self.log.warning("shown")
+        stop_queued_logging(self.log)
+        self.assertEqual(self.stream.getvalue(), PrintMsg.WARNING + "shown\n")
+
+
+class TestLogBuffer(unittest.TestCase):
+    """Test cases for the per-project log ring buffer"""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.log = logging.getLogger("modmaker_test_buffer")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self.log.addHandler(self.handler)
+        self.addCleanup(self.log.removeHandler, self.handler)
+        self.addCleanup(stop_log_buffer, self.log)
+
+    def test_success_discards(self):
+        """Test that a successful project writes nothing"""
+        start_log_buffer(self.log, 10)
+        with buffered_records("good"):
+            self.log.info("file 1")
+        self.log.info("summary")
+        self.assertEqual(self.stream.getvalue(), "summary\n")
+
+    def test_failure_flushes_last_records(self):
+        """Test that a failing project writes its last N records"""
+        start_log_buffer(self.log, 3)
+        with self.assertRaises(ValueError):
+            with buffered_records("bad"):
+                for index in range(5):
+                    self.log.info("file %d", index)
+                raise ValueError("boom")
+        self.assertEqual(self.stream.getvalue(), "file 2\nfile 3\nfile 4\n")
+
+    def test_exit_codes(self):
+        """Test that only non-zero exits count as failures"""
+        start_log_buffer(self.log, 10)
+        with self.assertRaises(SystemExit):
+            with buffered_records("ok"):
+                self.log.info("ok")
+                sys.exit(0)
+        with self.assertRaises(SystemExit):
+            with buffered_records("failed"):
+                self.log.info("failed")
+                sys.exit(1)
+        self.assertEqual(self.stream.getvalue(), "failed\n")
+
+    def test_projects_in_threads(self):
+        """Test that concurrent projects keep separate buffers"""
+        start_log_buffer(self.log, 100)
+
+        def generate(name):
+            try:
+                with buffered_records(name):
+                    for index in range(50):
+                        self.log.info("%s %d", name, index)
+                    if name == "p3":
+                        raise RuntimeError(name)
+            except RuntimeError:
+                pass
+
+        threads = [threading.Thread(target=generate, args=(f"p{n}",)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.stream.getvalue().splitlines(), [f"p3 {i}" for i in range(50)])
+
+    def test_behind_queue(self):
+        """Test that the buffer works in front of queued logging"""
+        start_queued_logging(self.log)
+        self.addCleanup(stop_queued_logging, self.log)
+        start_log_buffer(self.log, 10)
+        with self.assertRaises(SystemExit):
+            with buffered_records("bad"):
+                self.log.info("context")
+                sys.exit(2)
+        stop_log_buffer(self.log)
+        stop_queued_logging(self.log)
+        self.assertEqual(self.stream.getvalue(), "context\n")
+        self.assertIn(self.handler, self.log.handlers)
+
+    def test_without_buffer(self):
+        """Test that records are written as usual without start_log_buffer"""
+        with buffered_records("any"):
+            self.log.info("direct")
+        self.assertEqual(self.stream.getvalue(), "direct\n")
+
+
+class TestJsonFormat(unittest.TestCase):
+    """Test cases for JSON event output"""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.log = logging.getLogger("modmaker_test_json")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        self.handler = logging.StreamHandler(self.stream)
+        self.log.addHandler(self.handler)
+        self.addCleanup(self.log.removeHandler, self.handler)
+        self.addCleanup(set_log_format, self.log, "text")
+        set_log_format(self.log, "json")
+
+    def events(self):
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_events_one_per_line(self):
+        """Test that events and plain records are written as JSON objects"""
+        log_event(self.log, logging.INFO, "project_started", "Creating %s", "demo", path="/x/demo")
+        self.log.warning("plain %d", 1)
+        events = self.events()
+        self.assertEqual(events[0]["event"], "project_started")
+        self.assertEqual(events[0]["msg"], "Creating demo")
+        self.assertEqual(events[0]["path"], "/x/demo")
+        self.assertEqual(events[0]["level"], "info")
+        self.assertEqual(events[1]["event"], "log")
+        self.assertEqual(events[1]["msg"], "plain 1")
+        self.assertEqual(events[1]["level"], "warning")
+
+    def test_project_field_and_exception(self):
+        """Test that events carry their project and records their traceback"""
+        with buffered_records("demo"):
+            log_event(self.log, logging.INFO, "project_done", "done")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.log.error("failed", exc_info=True)
+        done, failed = self.events()
+        self.assertEqual(done["project"], "demo")
+        self.assertIn("ValueError: boom", failed["exc"])
+
+    def test_progress_level(self):
+        """Test that per-file progress is an INFO event only with JSON output"""
+        self.assertEqual(progress_level(), logging.INFO)
+        set_log_format(self.log, "text")
+        self.assertEqual(progress_level(), logging.DEBUG)
+        self.assertIsInstance(self.handler.formatter, CliFormatter)
+
+    def test_disabled_events_skipped(self):
+        """Test that events below the logger level are not built"""
+        log_event(self.log, logging.DEBUG, "file_rendered", "Rendered %s", "a.py", path="a.py")
+        self.assertEqual(self.stream.getvalue(), "")
+
+    def test_unknown_format(self):
+        """Test that an unknown format is rejected"""
+        with self.assertRaises(ValueError):
+            set_log_format(self.log, "xml")
+        self.assertIsInstance(self.handler.formatter, JsonFormatter)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
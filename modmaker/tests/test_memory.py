@@ -0,0 +1,107 @@
+"""
+Unit tests for _memory.py
+"""
+
+import unittest
+import io
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from unittest.mock import patch
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._instrument import add_observer, phase, remove_observer
+from modmaker._memory import MemoryProfiler, peak_rss, write_report
+
+KEPT = []
+
+
+def allocate(size):
+    KEPT.append(bytearray(size))
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    """Test cases for the --memory-report report"""
+
+    def setUp(self):
+        self.assertFalse(tracemalloc.is_tracing())
+        self.profiler = MemoryProfiler(top=3)
+        add_observer(self.profiler)
+        self.addCleanup(self.profiler.stop)
+        self.addCleanup(remove_observer, self.profiler)
+        self.addCleanup(KEPT.clear)
+
+    def test_phases_and_sites(self):
+        """Test that allocations are attributed to phases, projects and lines"""
+        with phase("create_project", project="demo"):
+            with phase("render", project="demo"):
+                allocate(200000)
+        report = self.profiler.report()
+        phases = {entry["name"]: entry for entry in report["phases"]}
+        self.assertGreaterEqual(phases["render"]["allocated"], 200000)
+        self.assertGreaterEqual(phases["create_project"]["allocated"], 200000)
+        project = report["projects"][0]
+        self.assertEqual(project["name"], "demo")
+        self.assertGreaterEqual(project["peak_growth"], 200000)
+        self.assertIn(__file__.rstrip("c"), report["top_sites"][0]["site"])
+        self.assertLessEqual(len(report["top_sites"]), 3)
+        json.dumps(report)
+
+    def test_peaks_per_project(self):
+        """Test that each project's peak is measured from its own start"""
+        with phase("fan_out", targets=2):
+            with phase("create_project", project="large"):
+                with phase("render", project="large"):
+                    bytearray(5000000)
+            with phase("create_project", project="small"):
+                with phase("render", project="small"):
+                    allocate(1000)
+        projects = {entry["name"]: entry for entry in self.profiler.report()["projects"]}
+        self.assertGreaterEqual(projects["large"]["peak_growth"], 5000000)
+        self.assertLess(projects["small"]["peak_growth"], 1000000)
+        self.assertLess(projects["small"]["traced_peak"], projects["large"]["traced_peak"])
+
+    def test_concurrent_projects(self):
+        """Test that peaks of projects generated in parallel are unavailable"""
+        started = threading.Barrier(2)
+
+        def work(name):
+            with phase("create_project", project=name):
+                started.wait()
+                allocate(1000)
+
+        workers = [threading.Thread(target=work, args=(name,)) for name in ("a", "b")]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        for project in self.profiler.report()["projects"]:
+            self.assertIsNone(project["traced_peak"])
+            self.assertIsNone(project["peak_growth"])
+
+    def test_stop(self):
+        """Test that tracing stops with the profiler that started it"""
+        self.assertTrue(tracemalloc.is_tracing())
+        self.profiler.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(self.profiler.report()["traced_peak"], 0)
+
+    def test_peak_rss(self):
+        """Test that the peak RSS is reported in bytes"""
+        if sys.platform == "win32":
+            self.skipTest("resource is not available")
+        self.assertGreater(peak_rss(), 1024 * 1024)
+
+    def test_write_report(self):
+        """Test writing the report to standard output"""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            write_report(self.profiler.report(), "-")
+        self.assertIn("top_sites", json.loads(stdout.getvalue()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for _metrics.py
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import urllib.request
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._fanout import dispatch
+from modmaker._instrument import add_observer, file_done, phase, remove_observer
+from modmaker._metrics import MetricsCollector, serve, write_textfile
+
+
+def create(name):
+    with phase("create_project", project=name):
+        if name == "bad":
+            raise ValueError("bad project")
+        with phase("copy", project=name):
+            file_done(f"{name}/setup.py", 0.0, written=100)
+        with phase("replace_variables", project=name):
+            file_done(f"{name}/setup.py", 0.0, read=100, written=120)
+            file_done(f"{name}/README.md", 0.0, read=50)
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the Prometheus metrics"""
+
+    def setUp(self):
+        self.collector = MetricsCollector()
+        add_observer(self.collector)
+        self.addCleanup(remove_observer, self.collector)
+
+    def test_counters_and_histograms(self):
+        """Test project, file and byte counters and the latency histograms"""
+        results = dispatch(create, ["a", "b", "bad"], jobs=2)
+        self.assertEqual([result.exit_code for result in results], [0, 0, 1])
+        text = self.collector.render()
+        self.assertIn('modmaker_projects_total{result="created"} 2\n', text)
+        self.assertIn('modmaker_projects_total{result="failed"} 1\n', text)
+        self.assertIn('modmaker_files_rendered_total{phase="copy"} 2\n', text)
+        self.assertIn('modmaker_files_rendered_total{phase="replace_variables"} 2\n', text)
+        self.assertIn('modmaker_bytes_total{direction="read"} 300\n', text)
+        self.assertIn('modmaker_bytes_total{direction="written"} 440\n', text)
+        self.assertIn("# TYPE modmaker_phase_duration_seconds histogram\n", text)
+        self.assertIn('modmaker_phase_duration_seconds_bucket{phase="create_project",le="+Inf"} 3\n', text)
+        self.assertIn('modmaker_phase_duration_seconds_count{phase="create_project"} 3\n', text)
+        self.assertIn('modmaker_file_duration_seconds_count{phase="copy"} 2\n', text)
+        self.assertIn("modmaker_queue_depth 0\n", text)
+        self.assertIn("modmaker_projects_in_progress 0\n", text)
+
+    def test_buckets_are_cumulative(self):
+        """Test that bucket counts never decrease"""
+        for _ in range(3):
+            create("a")
+        counts = [
+            int(line.rsplit(" ", 1)[1])
+            for line in self.collector.render().splitlines()
+            if line.startswith('modmaker_phase_duration_seconds_bucket{phase="copy"')
+        ]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(counts[-1], 3)
+
+    def test_queue_depth(self):
+        """Test that targets leave the queue when they start"""
+        seen = []
+
+        def call(target):
+            seen.append(self.collector.render().split("\nmodmaker_queue_depth ")[1].strip())
+
+        dispatch(call, ["a", "b", "c"])
+        self.assertEqual(seen, ["2", "1", "0"])
+
+    def test_write_textfile(self):
+        """Test writing the metrics to a textfile"""
+        create("a")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "modmaker.prom")
+            write_textfile(self.collector, path)
+            with open(path) as f:
+                self.assertEqual(f.read(), self.collector.render())
+            self.assertEqual(os.listdir(temp_dir), ["modmaker.prom"])
+
+    def test_serve(self):
+        """Test scraping the metrics over HTTP"""
+        server = serve(self.collector, 0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        create("a")
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics") as response:
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+            self.assertIn('modmaker_projects_total{result="created"} 1', response.read().decode())
+        with self.assertRaises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/other")
+
+
+if __name__ == "__main__":
+    unittest.main()
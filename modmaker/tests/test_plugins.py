@@ -0,0 +1,148 @@
+"""
+Unit tests for _plugins.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import types
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._cli_core import CliCore
+from modmaker._plugins import (
+    PluginEntry,
+    discover_plugins,
+    load_plugin_index,
+    site_packages_dirs,
+    site_packages_key,
+)
+
+PLUGIN_SOURCE = '''
+class Deploy:
+    """
+    Deploy a project
+    """
+
+    def __init__(self, target: str):
+        """
+        :param target: Where to deploy
+        """
+        self.target = target
+'''
+
+DIST_METADATA = "Metadata-Version: 2.1\nName: mm-test-plugin\nVersion: 1.0\n"
+ENTRY_POINTS = "[mm.test.commands]\ndeploy = mm_test_plugin:Deploy\n"
+
+
+class TestPlugins(unittest.TestCase):
+    """Test cases for entry-point plugin discovery"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.site = os.path.join(self.temp_dir.name, "site")
+        dist_info = os.path.join(self.site, "mm_test_plugin-1.0.dist-info")
+        os.makedirs(dist_info)
+        with open(os.path.join(self.site, "mm_test_plugin.py"), "w") as f:
+            f.write(PLUGIN_SOURCE)
+        with open(os.path.join(dist_info, "METADATA"), "w") as f:
+            f.write(DIST_METADATA)
+        with open(os.path.join(dist_info, "entry_points.txt"), "w") as f:
+            f.write(ENTRY_POINTS)
+        sys.path.insert(0, self.site)
+        self.addCleanup(sys.path.remove, self.site)
+        self.addCleanup(sys.modules.pop, "mm_test_plugin", None)
+        patcher = patch.dict(os.environ, {"MODMAKER_CACHE_DIR": os.path.join(self.temp_dir.name, "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_discover_plugins(self):
+        """Test that entry points of installed distributions are found"""
+        self.assertEqual(
+            discover_plugins("mm.test.commands"),
+            [PluginEntry("deploy", "mm_test_plugin:Deploy", "mm-test-plugin")],
+        )
+
+    def test_site_packages_key(self):
+        """Test that the key follows directory mtimes"""
+        key = site_packages_key([self.site])
+        self.assertEqual(key, site_packages_key([self.site]))
+        os.utime(self.site, ns=(0, 0))
+        self.assertNotEqual(key, site_packages_key([self.site]))
+
+    def test_site_packages_dirs(self):
+        """Test that only installation directories key the index"""
+        site_dir = os.path.join(self.temp_dir.name, "lib", "site-packages")
+        with patch.object(sys, "path", ["", self.site, site_dir, site_dir]):
+            dirs = site_packages_dirs()
+        self.assertEqual(dirs.count(site_dir), 1)
+        self.assertNotIn("", dirs)
+        self.assertNotIn(self.site, dirs)
+
+    def test_index_is_cached(self):
+        """Test that entry points are scanned only when the key changes"""
+        with patch("modmaker._plugins.discover_plugins", wraps=discover_plugins) as mock_discover:
+            first = load_plugin_index("mm.test.commands", [self.site])
+            second = load_plugin_index("mm.test.commands", [self.site])
+            self.assertEqual(mock_discover.call_count, 1)
+            os.utime(self.site, ns=(0, 0))
+            load_plugin_index("mm.test.commands", [self.site])
+            self.assertEqual(mock_discover.call_count, 2)
+        self.assertEqual(first, second)
+
+    def test_plugin_imported_on_use(self):
+        """Test that a plugin is imported only when its command is invoked"""
+        cli = CliCore("mm", types.ModuleType("commands"), "Test CLI", "1.0", [], plugin_group="mm.test.commands")
+        self.assertNotIn("mm_test_plugin", sys.modules)
+        self.assertIn("deploy", cli.parser.format_help())
+        cli.parse(["deploy", "prod"])
+        self.assertIn("mm_test_plugin", sys.modules)
+        self.assertEqual(cli.run().target, "prod")
+
+    def test_plugin_resolved_in_command_position_only(self):
+        """Test that a plugin name used as an argument value is not imported"""
+
+        class Create:
+            """Create things"""
+
+            def __init__(self, name: str):
+                self.name = name
+
+        commands = types.ModuleType("commands")
+        commands.Create = Create
+        global_args = [
+            [["--profile"], {"dest": "_profile"}],
+            [["-q", "--quiet"], {"action": "store_true", "dest": "_quiet"}],
+        ]
+        cli = CliCore("mm", commands, "Test CLI", "1.0", global_args, plugin_group="mm.test.commands")
+        cli.parse(["create", "deploy"])
+        self.assertNotIn("mm_test_plugin", sys.modules)
+        self.assertEqual(cli.run().name, "deploy")
+        cli.parse(["--profile", "deploy", "-q", "create", "deploy"])
+        self.assertNotIn("mm_test_plugin", sys.modules)
+        cli.parse(["-q", "--profile", "out.json", "deploy", "prod"])
+        self.assertIn("mm_test_plugin", sys.modules)
+
+    def test_builtin_commands_win(self):
+        """Test that plugins cannot shadow built-in commands"""
+
+        class Deploy:
+            """Built-in deploy"""
+
+            def __init__(self):
+                pass
+
+        commands = types.ModuleType("commands")
+        commands.Deploy = Deploy
+        cli = CliCore("mm", commands, "Test CLI", "1.0", [], plugin_group="mm.test.commands")
+        cli.parse(["deploy"])
+        self.assertIsInstance(cli.run(), Deploy)
+        self.assertNotIn("mm_test_plugin", sys.modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Unit tests for _profile.py
+"""
+
+import unittest
+from unittest.mock import patch
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._instrument import FileRecord, PhaseRecord
+from modmaker._profile import Profiler, slowest_files_table, write_report
+
+
+class TestProfiler(unittest.TestCase):
+    """Test cases for the --profile report"""
+
+    def setUp(self):
+        self.profiler = Profiler()
+        for wall in (0.5, 0.25):
+            self.profiler.phase_finished(PhaseRecord("copy", 0.0, wall, wall / 2, 1, {}))
+        self.profiler.phase_finished(PhaseRecord("render", 0.0, 0.1, 0.1, 1, {}))
+        self.profiler.file_finished(FileRecord("fast.py", "copy", 0.0, 0.001, 0, 10))
+        self.profiler.file_finished(FileRecord("slow.py", "render", 0.0, 0.02, 30, 40))
+
+    def test_report(self):
+        """Test that phases are summed and bytes totalled"""
+        report = self.profiler.report()
+        self.assertEqual(report["phases"], [
+            {"name": "copy", "calls": 2, "wall": 0.75, "cpu": 0.375},
+            {"name": "render", "calls": 1, "wall": 0.1, "cpu": 0.1},
+        ])
+        self.assertEqual(report["bytes_read"], 30)
+        self.assertEqual(report["bytes_written"], 50)
+        self.assertEqual([f["path"] for f in report["files"]], ["fast.py", "slow.py"])
+        self.assertGreaterEqual(report["wall"], 0)
+        json.dumps(report)
+
+    def test_slowest_files_table(self):
+        """Test that the table lists the slowest files first"""
+        lines = slowest_files_table(self.profiler.report(), 1).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("slow.py", lines[1])
+        self.assertIn("20.000", lines[1])
+
+    def test_write_report(self):
+        """Test writing the JSON report to a file and the table to stderr"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "profile.json")
+            with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                write_report(self.profiler.report(), path, top=5)
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)["files"]), 2)
+        self.assertIn("fast.py", stderr.getvalue())
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            write_report(self.profiler.report(), "-")
+        self.assertEqual(json.loads(stdout.getvalue())["bytes_written"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
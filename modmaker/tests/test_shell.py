@@ -0,0 +1,101 @@
+"""
+Unit tests for _cli_modules/shell.py
+"""
+
+import unittest
+from unittest.mock import patch
+import io
+import os
+import sys
+import types
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._cli_core import CliCore
+from modmaker._cli_modules.shell import ModmakerShell, complete_line
+
+
+class Greet:
+    """
+    Greet someone
+    """
+
+    calls = []
+
+    def hello(self, name: str, loud: bool = False):
+        """
+        Say hello
+
+        :param name: Who to greet
+        :param loud: Shout the greeting
+        """
+        Greet.calls.append((name, loud))
+        return name
+
+
+class Shell:
+    """
+    Placeholder for the shell command
+    """
+
+    CLINAME = "shell"
+
+    def __init__(self):
+        pass
+
+
+# Command package used by the tests
+COMMANDS = types.ModuleType("commands")
+COMMANDS.Greet = Greet
+COMMANDS.Shell = Shell
+
+
+GLOBAL_ARGS = [[["-q", "--quiet"], {"action": "store_true", "dest": "_quiet"}]]
+
+
+class TestShell(unittest.TestCase):
+    """Test cases for the interactive shell"""
+
+    def setUp(self):
+        Greet.calls = []
+        self.cli = CliCore("modmaker", COMMANDS, "Test CLI", "1.0", GLOBAL_ARGS)
+
+    def _run(self, script):
+        stdout = io.StringIO()
+        shell = ModmakerShell(self.cli, history_file=None, stdin=io.StringIO(script), stdout=stdout)
+        shell.use_rawinput = False
+        shell.cmdloop(intro="")
+        return stdout.getvalue()
+
+    def test_runs_commands_on_one_parser(self):
+        """Test that several commands reuse the same CliCore"""
+        with patch.object(CliCore, "_build_parser") as mock_build:
+            self._run("greet hello alice\ngreet hello bob --loud\nexit\n")
+        mock_build.assert_not_called()
+        self.assertEqual(Greet.calls, [("alice", False), ("bob", True)])
+
+    def test_errors_do_not_exit(self):
+        """Test that argparse errors keep the shell running"""
+        with patch("sys.stderr", new_callable=io.StringIO):
+            self._run("greet unknown\ngreet hello carol\n")
+        self.assertEqual(Greet.calls, [("carol", False)])
+
+    def test_nested_shell_refused(self):
+        """Test that the shell command is not run from inside the shell"""
+        shell = ModmakerShell(self.cli, history_file=None)
+        self.assertIsNone(shell.execute(["shell"]))
+
+    def test_complete_commands(self):
+        """Test completion of command names and global flags"""
+        self.assertEqual(complete_line(self.cli.args, "", ""), ["--quiet", "-q", "greet"])
+        self.assertEqual(complete_line(self.cli.args, "", "g"), ["greet"])
+
+    def test_complete_subcommands_and_flags(self):
+        """Test completion of subcommands and their flags"""
+        self.assertEqual(complete_line(self.cli.args, "greet ", "h"), ["hello"])
+        self.assertEqual(complete_line(self.cli.args, "greet hello bob ", "--"), ["--loud"])
+
+
+if __name__ == "__main__":
+    unittest.main()
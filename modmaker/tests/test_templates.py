@@ -0,0 +1,96 @@
+"""
+Unit tests for _templates.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._templates import TemplateCache
+
+
+class TestTemplateCache(unittest.TestCase):
+    """Test cases for the in-memory template cache"""
+
+    def setUp(self):
+        """Create a small template tree"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        os.makedirs(os.path.join(self.root, "{{PROJECT_NAME}}"))
+        os.makedirs(os.path.join(self.root, "empty"))
+        self._write("README.md", "# {{PROJECT_NAME}}")
+        self._write(os.path.join("{{PROJECT_NAME}}", "cli.py"), "print('hi')")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relpath, content):
+        with open(os.path.join(self.root, relpath), "w") as f:
+            f.write(content)
+
+    def test_load(self):
+        """Test that all files and directories are loaded"""
+        tree = TemplateCache().load(self.root)
+        self.assertEqual(tree.dirs, ["empty", "{{PROJECT_NAME}}"])
+        self.assertEqual(
+            [f.relpath for f in tree.files],
+            ["README.md", os.path.join("{{PROJECT_NAME}}", "cli.py")],
+        )
+        self.assertEqual(tree.files[0].data, b"# {{PROJECT_NAME}}")
+
+    def test_reload_only_changed_files(self):
+        """Test that unchanged files are served from memory"""
+        cache = TemplateCache()
+        first = cache.load(self.root)
+        self._write("README.md", "# changed and longer")
+        with patch("builtins.open", wraps=open) as mock_open:
+            second = cache.load(self.root)
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertIs(first.files[1], second.files[1])
+        self.assertEqual(second.files[0].data, b"# changed and longer")
+
+    def test_removed_files_are_dropped(self):
+        """Test that deleted template files disappear from the tree"""
+        cache = TemplateCache()
+        cache.load(self.root)
+        os.remove(os.path.join(self.root, "README.md"))
+        tree = cache.load(self.root)
+        self.assertEqual([f.relpath for f in tree.files], [os.path.join("{{PROJECT_NAME}}", "cli.py")])
+
+    def test_ignored_paths_are_pruned(self):
+        """Test that ignored files are skipped and ignored directories never walked"""
+        scratch = os.path.join(self.root, "scratch")
+        os.makedirs(os.path.join(scratch, "deep"))
+        os.makedirs(os.path.join(self.root, "{{PROJECT_NAME}}", "__pycache__"))
+        self._write(os.path.join("scratch", "deep", "big.bin"), "x" * 100)
+        self._write(os.path.join("{{PROJECT_NAME}}", "__pycache__", "cli.cpython-311.pyc"), "")
+        self._write(".DS_Store", "")
+        self._write("notes.tmp", "")
+        self._write(".modmakerignore", "/scratch/\n*.tmp\n")
+        scanned = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            scanned.append(os.path.normpath(path))
+            return real_scandir(path)
+
+        with patch("os.scandir", scandir), \
+                patch.object(TemplateCache, "_load_file", wraps=TemplateCache._load_file) as load_file:
+            tree = TemplateCache().load(self.root)
+        self.assertEqual(tree.dirs, ["empty", "{{PROJECT_NAME}}"])
+        self.assertEqual(
+            [f.relpath for f in tree.files],
+            ["README.md", os.path.join("{{PROJECT_NAME}}", "cli.py")],
+        )
+        self.assertEqual(load_file.call_count, 2)
+        self.assertIn(os.path.normpath(self.root), scanned)
+        self.assertNotIn(scratch, scanned)
+
+
+if __name__ == "__main__":
+    unittest.main()
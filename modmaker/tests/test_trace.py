@@ -0,0 +1,81 @@
+"""
+Unit tests for _trace.py
+"""
+
+import unittest
+from unittest.mock import patch
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modmaker._instrument import add_observer, file_done, phase, remove_observer
+from modmaker._trace import TraceRecorder, write_trace
+
+
+class TestTraceRecorder(unittest.TestCase):
+    """Test cases for the --trace timeline"""
+
+    def setUp(self):
+        self.recorder = TraceRecorder()
+        add_observer(self.recorder)
+        self.addCleanup(remove_observer, self.recorder)
+
+    def _spans(self):
+        return [event for event in self.recorder.trace()["traceEvents"] if event["ph"] == "X"]
+
+    def test_phases_and_files(self):
+        """Test that phases and files become nested complete events"""
+        with phase("create_project", project="demo"):
+            with phase("copy", project="demo"):
+                file_done("demo/setup.py", time.perf_counter(), written=12)
+        spans = self._spans()
+        self.assertEqual([span["name"] for span in spans], ["create_project", "copy", "setup.py"])
+        project, copy, setup = spans
+        self.assertEqual(project["args"], {"project": "demo"})
+        self.assertEqual(setup["cat"], "file")
+        self.assertEqual(setup["args"], {"path": "demo/setup.py", "read": 0, "written": 12})
+        self.assertLessEqual(project["ts"], copy["ts"])
+        self.assertGreaterEqual(project["dur"], copy["dur"])
+        self.assertEqual({span["tid"] for span in spans}, {threading.get_ident()})
+
+    def test_threads_and_errors(self):
+        """Test that each worker thread is named and failed phases carry the error"""
+
+        def work():
+            with self.assertRaises(ValueError):
+                with phase("render", project="bad"):
+                    raise ValueError("boom")
+
+        worker = threading.Thread(target=work, name="worker-1")
+        worker.start()
+        worker.join()
+        events = self.recorder.trace()["traceEvents"]
+        names = {event["args"]["name"] for event in events if event["name"] == "thread_name"}
+        self.assertEqual(names, {"worker-1"})
+        self.assertEqual(self._spans()[0]["args"], {"project": "bad", "error": "ValueError"})
+
+    def test_write_trace(self):
+        """Test writing the trace to a file and to stdout"""
+        with phase("copy", target=object()):
+            pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "trace.json")
+            write_trace(self.recorder.trace(), path)
+            with open(path) as f:
+                trace = json.load(f)
+        self.assertEqual(trace["displayTimeUnit"], "ms")
+        self.assertEqual(trace["traceEvents"][-1]["name"], "copy")
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            write_trace(self.recorder.trace(), "-")
+        self.assertEqual(json.loads(stdout.getvalue()), trace)
+
+
+if __name__ == "__main__":
+    unittest.main()
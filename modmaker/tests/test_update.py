@@ -0,0 +1,182 @@
+"""
+Unit tests for _update.py
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import http.server
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Add the project root to the path so Python can find the modmaker package
+sys.path.insert(0, PROJECT_ROOT)
+
+from modmaker._cache import cache_path, read_json
+from modmaker._cli import get_pip_version
+from modmaker._update import (
+    DISABLE_ENV_VAR,
+    INDEX_URL_ENV_VAR,
+    check_for_update,
+    index_url,
+    is_newer,
+    update_check_enabled,
+)
+
+
+class StubIndexHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a PyPI-like JSON document for every package"""
+
+    version = "9.9.9"
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        StubIndexHandler.requests.append(self.path)
+        body = json.dumps({"info": {"version": self.version}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class TestUpdateCheck(unittest.TestCase):
+    """Test cases for the background update check"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.HTTPServer(("127.0.0.1", 0), StubIndexHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/pypi/{{name}}/json"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubIndexHandler.requests = []
+        self.cache = tempfile.TemporaryDirectory()
+        patcher = patch.dict(
+            os.environ, {"MODMAKER_CACHE_DIR": self.cache.name, INDEX_URL_ENV_VAR: self.url}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.cache.cleanup)
+
+    def test_index_url(self):
+        """Test that the index URL is configurable"""
+        self.assertEqual(index_url("mm"), self.url.format(name="mm"))
+        with patch.dict(os.environ):
+            del os.environ[INDEX_URL_ENV_VAR]
+            self.assertEqual(index_url("mm"), "https://pypi.org/pypi/mm/json")
+
+    def test_is_newer(self):
+        """Test version comparison"""
+        self.assertTrue(is_newer("0.1.10", "0.1.9"))
+        self.assertTrue(is_newer("1.0", "0.9.9"))
+        self.assertFalse(is_newer("0.1.9", "0.1.10"))
+        self.assertFalse(is_newer("0.1.10", "0.1.10"))
+        self.assertFalse(is_newer("garbage", "0.1.0"))
+
+    def test_enabled(self):
+        """Test that quiet and batch mode skip the check"""
+        tty = MagicMock()
+        tty.isatty.return_value = True
+        pipe = MagicMock()
+        pipe.isatty.return_value = False
+        with patch.dict(os.environ):
+            os.environ.pop(DISABLE_ENV_VAR, None)
+            self.assertTrue(update_check_enabled(stream=tty))
+            self.assertFalse(update_check_enabled(quiet=True, stream=tty))
+            self.assertFalse(update_check_enabled(stream=pipe))
+            os.environ[DISABLE_ENV_VAR] = "1"
+            self.assertFalse(update_check_enabled(stream=tty))
+
+    def test_check_in_background(self):
+        """Test that the latest version is fetched once per TTL"""
+        thread = check_for_update("mm", "1.0.0", get_pip_version, now=1000)
+        thread.join(5)
+        self.assertEqual(StubIndexHandler.requests, ["/pypi/mm/json"])
+        cached = read_json(cache_path("update", "mm.json"))
+        self.assertEqual((cached["checked"], cached["latest"]), (1000, "9.9.9"))
+
+        with self.assertLogs("modmaker._update", "WARNING") as logs:
+            self.assertIsNone(check_for_update("mm", "1.0.0", get_pip_version, now=2000))
+        self.assertIn("9.9.9", logs.output[0])
+        self.assertEqual(len(StubIndexHandler.requests), 1)
+
+        thread = check_for_update("mm", "1.0.0", get_pip_version, ttl=500, now=2000)
+        thread.join(5)
+        self.assertEqual(len(StubIndexHandler.requests), 2)
+
+    def test_check_does_not_block(self):
+        """Test that a slow index does not delay the caller"""
+        release = threading.Event()
+
+        def slow_fetch(url):
+            release.wait(5)
+            return "2.0.0"
+
+        thread = check_for_update("mm", "1.0.0", slow_fetch, now=1000)
+        self.assertTrue(thread.is_alive())
+        self.assertTrue(thread.daemon)
+        # Nothing is recorded until the fetch completes
+        self.assertIsNone(read_json(cache_path("update", "mm.json")))
+        release.set()
+        thread.join(5)
+        self.assertEqual(read_json(cache_path("update", "mm.json"))["latest"], "2.0.0")
+
+    def test_check_failure(self):
+        """Test that index errors are swallowed and retried after the TTL"""
+        fetch = MagicMock(side_effect=OSError("offline"))
+        check_for_update("mm", "1.0.0", fetch, now=1000).join(5)
+        cached = read_json(cache_path("update", "mm.json"))
+        self.assertEqual((cached["checked"], cached["latest"]), (1000, None))
+        self.assertIsNone(check_for_update("mm", "1.0.0", fetch, now=1001))
+
+    def _run_check(self, delay):
+        """Run a check in a fresh interpreter that exits right after starting it"""
+        code = (
+            "import sys, time\n"
+            f"sys.path.insert(0, {PROJECT_ROOT!r})\n"
+            "from modmaker._update import check_for_update\n"
+            "def fetch(url):\n"
+            f"    time.sleep({delay})\n"
+            "    return '2.0.0'\n"
+            "check_for_update('mm', '1.0.0', fetch)\n"
+        )
+        started = time.monotonic()
+        subprocess.run([sys.executable, "-c", code], check=True, timeout=30)
+        return time.monotonic() - started
+
+    def test_check_completes_at_exit(self):
+        """Test that a short run waits for the check instead of killing it"""
+        self._run_check(0.2)
+        self.assertEqual(read_json(cache_path("update", "mm.json"))["latest"], "2.0.0")
+
+    def test_slow_check_not_recorded(self):
+        """Test that a check cut short at exit is retried by the next run"""
+        elapsed = self._run_check(20)
+        self.assertLess(elapsed, 10)
+        self.assertIsNone(read_json(cache_path("update", "mm.json")))
+
+    def test_no_notice_when_current(self):
+        """Test that nothing is reported when the installed version is the latest"""
+        check_for_update("mm", "9.9.9", get_pip_version, now=1000).join(5)
+        with patch("modmaker._update.LOG") as log:
+            check_for_update("mm", "9.9.9", get_pip_version, now=1001)
+        log.warning.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the zipapp build (scripts/build_zipapp.py) and packed templates
+"""
+
+import unittest
+from unittest.mock import patch
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+# Add the project root to the path so Python can find the modmaker package
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT)
+
+from modmaker._templates import PACKAGE_DIR, TemplateCache, pack_templates, packed_templates
+
+
+def load_build_script():
+    """Import scripts/build_zipapp.py"""
+    spec = importlib.util.spec_from_file_location(
+        "build_zipapp", os.path.join(ROOT, "scripts", "build_zipapp.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestPackedTemplates(unittest.TestCase):
+    """Test cases for templates packed into one blob"""
+
+    def tearDown(self):
+        packed_templates.cache_clear()
+
+    def test_round_trip(self):
+        """Test that packed templates load like the template directory"""
+        template_dir = os.path.join(PACKAGE_DIR, "templates", "cli")
+        with patch("pkgutil.get_data", return_value=pack_templates()):
+            packed_templates.cache_clear()
+            packed = packed_templates()[template_dir]
+        on_disk = TemplateCache().load(template_dir)
+        self.assertEqual(packed.dirs, on_disk.dirs)
+        self.assertEqual(
+            [(f.relpath, f.data, f.mode) for f in packed.files],
+            [(f.relpath, f.data, f.mode) for f in on_disk.files],
+        )
+
+    def test_no_blob(self):
+        """Test that a regular installation has no packed templates"""
+        packed_templates.cache_clear()
+        self.assertEqual(packed_templates(), {})
+
+
+class TestBuildZipapp(unittest.TestCase):
+    """Test cases for the single-file zipapp"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.pyz = os.path.join(cls.temp_dir.name, "modmaker.pyz")
+        with patch("sys.stdout"):
+            load_build_script().build(cls.pyz)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def _run(self, *args):
+        env = dict(
+            os.environ,
+            MODMAKER_CACHE_DIR=os.path.join(self.temp_dir.name, "cache"),
+            MODMAKER_NO_UPDATE_CHECK="1",
+            PYTHONPATH="",
+        )
+        return subprocess.run(
+            [sys.executable, self.pyz] + list(args),
+            cwd=self.temp_dir.name,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def test_content(self):
+        """Test that the archive holds bytecode and one template blob only"""
+        with zipfile.ZipFile(self.pyz) as archive:
+            names = archive.namelist()
+        self.assertIn("__main__.py", names)
+        self.assertIn("modmaker/_cli.pyc", names)
+        self.assertIn("modmaker/templates.blob", names)
+        self.assertFalse([n for n in names if n.startswith("modmaker/") and n.endswith(".py")])
+        self.assertFalse([n for n in names if "/tests/" in n or "/templates/" in n])
+
+    def test_version(self):
+        """Test running the archive"""
+        from modmaker._version import __version__
+        result = self._run("--version")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), __version__)
+
+    def test_create_project(self):
+        """Test that projects are generated from the packed templates"""
+        result = self._run("-q", "create", "project", "zipdemo")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        project = os.path.join(self.temp_dir.name, "zipdemo")
+        self.assertTrue(os.path.isfile(os.path.join(project, "pyproject.toml")))
+        self.assertTrue(os.path.isfile(os.path.join(project, "zipdemo", "cli.py")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Script to build modmaker as a single self-contained zipapp.
+
+The archive holds the modmaker package as precompiled bytecode and the
+project templates packed into one blob, so starting it imports everything
+from a single file:
+
+    python scripts/build_zipapp.py
+    python dist/modmaker.pyz create project demo
+"""
+
+import argparse
+import os
+import py_compile
+import shutil
+import sys
+import tempfile
+import zipapp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "modmaker"
+DEFAULT_OUTPUT = os.path.join(ROOT, "dist", "modmaker.pyz")
+# Parts of the source package that are not needed at runtime
+EXCLUDED_DIRS = {"__pycache__", "tests", "benchmarks", "bin", "templates", PACKAGE}
+EXCLUDED_FILES = {"setup.py"}
+
+# Bytecode only runs on the Python version that compiled it
+DEFAULT_INTERPRETER = "/usr/bin/env python{}.{}".format(*sys.version_info[:2])
+
+MAIN = """from modmaker._cli import main
+
+main()
+"""
+
+
+def iter_sources(package_dir):
+    """Yield the runtime Python sources of the package, relative to it."""
+    for root, dirnames, filenames in os.walk(package_dir):
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if not (root == package_dir and d in EXCLUDED_DIRS) and d != "__pycache__"
+        )
+        for filename in sorted(filenames):
+            if root == package_dir and filename in EXCLUDED_FILES:
+                continue
+            if filename.endswith(".py"):
+                yield os.path.relpath(os.path.join(root, filename), package_dir)
+
+
+def stage(package_dir, staging_dir, with_source=False):
+    """Write the archive content (bytecode, packed templates, __main__) to a directory."""
+    sys.path.insert(0, os.path.dirname(package_dir))
+    try:
+        from modmaker._templates import PACKED_TEMPLATES, pack_templates
+    finally:
+        sys.path.pop(0)
+
+    target_dir = os.path.join(staging_dir, PACKAGE)
+    count = 0
+    for relpath in iter_sources(package_dir):
+        source = os.path.join(package_dir, relpath)
+        target = os.path.join(target_dir, relpath)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Sourceless .pyc files next to the module are imported by zipimport;
+        # unchecked hashes skip the timestamp validation against the source
+        py_compile.compile(
+            source,
+            cfile=target + "c",
+            dfile=os.path.join(PACKAGE, relpath),
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        if with_source:
+            shutil.copy2(source, target)
+        count += 1
+
+    with open(os.path.join(target_dir, PACKED_TEMPLATES), "wb") as f:
+        f.write(pack_templates(package_dir))
+    with open(os.path.join(staging_dir, "__main__.py"), "w") as f:
+        f.write(MAIN)
+    return count
+
+
+def build(output=DEFAULT_OUTPUT, interpreter=DEFAULT_INTERPRETER, with_source=False,
+          compressed=False):
+    """Build the zipapp and return its path."""
+    package_dir = os.path.join(ROOT, PACKAGE)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with tempfile.TemporaryDirectory() as staging_dir:
+        count = stage(package_dir, staging_dir, with_source)
+        zipapp.create_archive(
+            staging_dir, target=output, interpreter=interpreter, compressed=compressed
+        )
+    print(f"Built {output} ({count} modules, {os.path.getsize(output)} bytes)")
+    return output
+
+
+def main():
+    """Main function to build the zipapp."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="archive to write")
+    parser.add_argument("-p", "--python", default=DEFAULT_INTERPRETER,
+                        help="interpreter for the shebang line")
+    parser.add_argument("--with-source", action="store_true",
+                        help="also include the .py sources, for readable tracebacks")
+    parser.add_argument("--compress", action="store_true",
+                        help="deflate the archive members (smaller, slower to start)")
+    args = parser.parse_args()
+    build(args.output, args.python, args.with_source, args.compress)
+
+
+if __name__ == "__main__":
+    main()
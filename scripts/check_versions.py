@@ -62,6 +62,11 @@ def main():
             'file': 'modmaker/__init__.py',
             'pattern': r'__version__ = "([0-9.]+)"',
         },
+        {
+            'name': 'modmaker/_version.py',
+            'file': 'modmaker/_version.py',
+            'pattern': r'__version__ = "([0-9.]+)"',
+        },
         {
             'name': '.bumpversion.cfg',
             'file': '.bumpversion.cfg',
@@ -83,6 +83,12 @@ def main():
             'pattern': r'__version__ = "([0-9.]+)"',
             'replacement': f'__version__ = "{target_version}"'
         },
+        # modmaker/_version.py
+        {
+            'file': 'modmaker/_version.py',
+            'pattern': r'__version__ = "([0-9.]+)"',
+            'replacement': f'__version__ = "{target_version}"'
+        },
         # .bumpversion.cfg
         {
             'file': '.bumpversion.cfg',
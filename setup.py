@@ -2,7 +2,35 @@
 Setup script for modmaker package.
 """
 
+import os
+
 import setuptools
+from setuptools.command.build_py import build_py
+
+VERSION_FILE = os.path.join("modmaker", "_version.py")
+VERSION_TEMPLATE = '''"""
+Version of the modmaker package
+
+Generated by setup.py when the package was built.
+"""
+
+__version__ = "{version}"
+'''
+
+
+class BuildPyWithVersion(build_py):
+    """
+    build_py that bakes the distribution version into modmaker/_version.py,
+    so the CLI never scans installed distributions to report its version
+    """
+
+    def run(self):
+        super().run()
+        target = os.path.join(self.build_lib, VERSION_FILE)
+        if os.path.isdir(os.path.dirname(target)):
+            with open(target, "w") as f:
+                f.write(VERSION_TEMPLATE.format(version=self.distribution.get_version()))
+
 
 if __name__ == "__main__":
-    setuptools.setup()
\ No newline at end of file
+    setuptools.setup(cmdclass={"build_py": BuildPyWithVersion})